@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+pytest.importorskip("pytest_benchmark")
+
+# Путь к записанной сессии GSI: файл GsiRecorder или по одному телу POST на строку.
+PAYLOADS_ENV = "GSI_BENCH_PAYLOADS"
+
+# Базовые прогоны хранятся рядом с бенчмарками, по каталогу на платформу/интерпретатор.
+BASELINE_STORAGE = Path(__file__).resolve().parent / "baselines"
+BASELINE_NAME = "baseline"
+DEFAULT_STORAGE = "file://./.benchmarks"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("d2hub benchmarks")
+    group.addoption(
+        "--bench-save-baseline",
+        action="store_true",
+        help="Save this run as the baseline in benchmarks/baselines.",
+    )
+    group.addoption(
+        "--bench-check",
+        action="store_true",
+        help="Compare with the latest stored baseline and fail on regression.",
+    )
+    group.addoption(
+        "--bench-threshold",
+        default="15%",
+        help=(
+            "Allowed slowdown of the mean for --bench-check (e.g. 15%% or 0.002 s). "
+            "Default: 15%%."
+        ),
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Переводит --bench-* в опции pytest-benchmark (его хук выполняется последним)."""
+    from pytest_benchmark.utils import parse_compare_fail
+
+    option = config.option
+    if getattr(option, "benchmark_storage", DEFAULT_STORAGE) == DEFAULT_STORAGE:
+        option.benchmark_storage = BASELINE_STORAGE.as_uri()
+    if config.getoption("bench_save_baseline"):
+        option.benchmark_save = BASELINE_NAME
+    if config.getoption("bench_check"):
+        threshold = str(config.getoption("bench_threshold")).strip()
+        option.benchmark_compare = option.benchmark_compare or True
+        option.benchmark_compare_fail = [parse_compare_fail(f"mean:{threshold}")]
+
+
+def _item(name: str) -> dict:
+    return {"name": name, "purchaser": 0, "can_cast": True, "cooldown": 0, "passive": False}
+
+
+def synthetic_session(posts: int = 600) -> list[bytes]:
+    """Сессия в формате Dota GSI: 60 секунд матча при throttle 0.1 с."""
+    bodies: list[bytes] = []
+    for index in range(posts):
+        clock = 600 + index // 10
+        items = {f"slot{slot}": _item(f"item_{slot}") for slot in range(6)}
+        items.update({f"stash{slot}": {"name": "empty"} for slot in range(6)})
+        if index >= posts // 2:
+            items["slot5"] = _item("item_blink")
+        payload = {
+            "provider": {
+                "name": "Dota 2",
+                "appid": 570,
+                "version": 47,
+                "timestamp": 1700000000 + clock,
+            },
+            "map": {
+                "name": "start",
+                "matchid": "7400000000",
+                "game_time": clock + 90,
+                "clock_time": clock,
+                "daytime": (clock // 300) % 2 == 0,
+                "nightstalker_night": False,
+                "game_state": "DOTA_GAMERULES_STATE_GAME_IN_PROGRESS",
+                "paused": False,
+                "win_team": "none",
+                "customgamename": "",
+                "ward_purchase_cooldown": 0,
+            },
+            "player": {
+                "steamid": "76561198000000000",
+                "name": "player",
+                "activity": "playing",
+                "kills": 2,
+                "deaths": 1,
+                "assists": 7,
+                "last_hits": 31 + index // 50,
+                "denies": 4,
+                "kill_streak": 0,
+                "commands_issued": 4000 + index,
+                "team_name": "radiant",
+                "gold": 900 + index,
+                "gold_reliable": 300,
+                "gold_unreliable": 600 + index,
+                "gpm": 310,
+                "xpm": 420,
+                "wards_placed": 6,
+            },
+            "hero": {
+                "xpos": -5000 + index,
+                "ypos": -4000,
+                "id": 26,
+                "name": "npc_dota_hero_lion",
+                "level": 9,
+                "alive": True,
+                "health": 700,
+                "max_health": 880,
+                "mana": 400 - index % 50,
+                "max_mana": 600,
+            },
+            "abilities": {
+                f"ability{slot}": {"name": f"lion_ability_{slot}", "level": 2, "can_cast": True,
+                                   "passive": False, "ability_active": True, "cooldown": 0,
+                                   "ultimate": slot == 5}
+                for slot in range(6)
+            },
+            "items": items,
+            "previously": {"player": {"commands_issued": 4000 + index - 1}},
+        }
+        bodies.append(json.dumps(payload).encode())
+    return bodies
+
+
+def large_config_data(
+    timeline: int = 10_000,
+    rules: int = 50,
+    windows: int = 1_000,
+) -> dict:
+    """Сырой конфиг (как после YAML) с тысячами событий, правил и окон."""
+    roles = ["carry", "mid", "offlane", "soft_support", "hard_support"]
+
+    def mmss(seconds: int) -> str:
+        return f"{seconds // 60}:{seconds % 60:02d}"
+
+    return {
+        "timeline": [
+            {
+                "at": mmss(index),
+                "items": [f"event {index}"],
+                "roles": [roles[index % len(roles)]] if index % 3 else [],
+            }
+            for index in range(timeline)
+        ],
+        "rules": [
+            {
+                "start": "0:00",
+                "until": "90:00",
+                "every_seconds": 30 + index * 7,
+                "items": [f"rule {index}"],
+            }
+            for index in range(rules)
+        ],
+        "windows": [
+            {
+                "from": mmss(index * 5 % 5400),
+                "to": mmss(index * 5 % 5400 + 20 + index % 90),
+                "text": f"window {index}",
+                "level": ("info", "warn", "danger")[index % 3],
+                "priority": index % 7,
+            }
+            for index in range(windows)
+        ],
+        "macro_timings": [
+            {
+                "name": "Power",
+                "first_spawn": "6:00",
+                "interval": "2:00",
+                "up_window": 30,
+                "color": "#3b82f6",
+            },
+            {
+                "name": "Bounty",
+                "first_spawn": "0:00",
+                "interval": "3:00",
+                "up_window": 30,
+                "color": "#f59e0b",
+            },
+            {
+                "name": "Wisdom",
+                "first_spawn": "7:00",
+                "interval": "7:00",
+                "up_window": 60,
+                "color": "#a855f7",
+            },
+        ],
+    }
+
+
+@pytest.fixture(scope="session")
+def large_config() -> dict:
+    """Большой сырой конфиг для бенчмарков маппера, планировщика и окон."""
+    return large_config_data()
+
+
+@pytest.fixture(scope="session")
+def gsi_payloads() -> list[bytes]:
+    """Тела POST из записанной сессии (GSI_BENCH_PAYLOADS) или синтетической."""
+    path = os.environ.get(PAYLOADS_ENV)
+    if path:
+        from dota_hud.infrastructure.gsi_recorder import MAGIC, read_recording
+
+        with Path(path).open("rb") as handle:
+            if handle.read(len(MAGIC)) == MAGIC:
+                return [record.raw for record in read_recording(Path(path))]
+        lines = Path(path).read_bytes().splitlines()
+        return [line for line in lines if line.strip()]
+    return synthetic_session()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from dota_hud.application.frame_table import compile_frame_table, render_frame
+from dota_hud.application.hud_presenter import HudPresenter, PresenterConfig
+from dota_hud.config.mapper import map_config
+from dota_hud.config.models import AppConfig
+from dota_hud.domain.scheduler import Scheduler
+from dota_hud.domain.warning_windows import WarningWindowService
+
+MATCH_SECONDS = range(3600)
+
+
+@pytest.fixture(scope="module")
+def config(large_config: dict) -> AppConfig:
+    return map_config(large_config)
+
+
+@pytest.fixture(scope="module")
+def presenter(config: AppConfig) -> HudPresenter:
+    return HudPresenter(
+        PresenterConfig(
+            max_lines=config.presenter.max_lines,
+            macro_max_lines=config.presenter.macro_max_lines,
+            macro_timings=tuple(config.macro_timings),
+        )
+    )
+
+
+def test_presenter_build_view_model(benchmark, config: AppConfig, presenter: HudPresenter) -> None:
+    """HudPresenter.build_view_model на заранее снятых TickState матча."""
+    scheduler = Scheduler(config.buckets, config.rules)
+    ticks = []
+    for second in MATCH_SECONDS:
+        scheduler.set_external_elapsed(second)
+        ticks.append(scheduler.tick())
+
+    def match() -> None:
+        for tick in ticks:
+            presenter.build_view_model(tick, warning_text="window", warning_level="warn")
+
+    benchmark(match)
+    if benchmark.stats:
+        benchmark.extra_info["us_per_frame"] = benchmark.stats.stats.mean / len(ticks) * 1e6
+
+
+def test_render_frame(benchmark, config: AppConfig, presenter: HudPresenter) -> None:
+    """Полный кадр без таблицы: tick + окна + presenter."""
+    scheduler = Scheduler(config.buckets, config.rules)
+    service = WarningWindowService()
+    index = service.build_index(config.windows)
+
+    def match() -> None:
+        for second in MATCH_SECONDS:
+            scheduler.set_external_elapsed(second)
+            render_frame(scheduler.tick(), index, service, presenter)
+
+    benchmark(match)
+
+
+def test_frame_table_lookup(benchmark, config: AppConfig, presenter: HudPresenter) -> None:
+    """Тот же матч через предкомпилированную таблицу кадров."""
+    table = compile_frame_table(config, presenter)
+    assert table is not None
+    for second in MATCH_SECONDS:
+        table.lookup(second)
+
+    def match() -> None:
+        for second in MATCH_SECONDS:
+            table.lookup(second)
+
+    benchmark(match)
+
+
+def test_map_config_large(benchmark, large_config: dict) -> None:
+    """config.mapper.map_config на конфиге с 10k событий, правилами и 1k окон."""
+    # map_config не меняет вход, но копия защищает общий fixture от будущих правок.
+    data = copy.deepcopy(large_config)
+    benchmark(map_config, data)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+
+from dota_hud.config.mapper import map_config
+from dota_hud.config.models import AppConfig
+from dota_hud.domain.scheduler import Scheduler
+from dota_hud.domain.warning_windows import WarningWindowService
+
+# Секунды матча, которые проходит каждый бенчмарк: час игры по секунде.
+MATCH_SECONDS = range(3600)
+
+
+@pytest.fixture(scope="module")
+def config(large_config: dict) -> AppConfig:
+    return map_config(large_config)
+
+
+@pytest.mark.parametrize("role", [None, "mid"])
+def test_scheduler_tick_match(benchmark, config: AppConfig, role: str | None) -> None:
+    """Scheduler.tick на каждой секунде матча при 10k bucket'ов."""
+    assert len(config.buckets) >= 10_000
+    scheduler = Scheduler(config.buckets, config.rules)
+
+    def match() -> None:
+        for second in MATCH_SECONDS:
+            scheduler.set_external_elapsed(second)
+            scheduler.tick(role=role)
+
+    benchmark(match)
+    if benchmark.stats:
+        benchmark.extra_info["us_per_tick"] = (
+            benchmark.stats.stats.mean / len(MATCH_SECONDS) * 1e6
+        )
+
+
+def test_scheduler_seek_backwards(benchmark, config: AppConfig) -> None:
+    """Перемотка назад (resync по GSI) — бинарный поиск, без копирования."""
+    scheduler = Scheduler(config.buckets, config.rules)
+
+    def rewind() -> None:
+        for second in reversed(MATCH_SECONDS):
+            scheduler.set_external_elapsed(second)
+            scheduler.tick()
+
+    benchmark(rewind)
+
+
+def test_warning_active_windows_scan(benchmark, config: AppConfig) -> None:
+    """WarningWindowService.active_windows: линейный проход по 1k окон."""
+    assert len(config.windows) >= 1_000
+    service = WarningWindowService()
+    windows = list(config.windows)
+
+    def match() -> None:
+        for second in MATCH_SECONDS[::10]:
+            service.active_windows(second, windows)
+
+    benchmark(match)
+
+
+def test_warning_window_index(benchmark, config: AppConfig) -> None:
+    """WarningWindowIndex.active — путь, которым окна считаются на тике."""
+    index = WarningWindowService().build_index(config.windows)
+
+    def match() -> None:
+        for second in MATCH_SECONDS[::10]:
+            index.active(second)
+
+    benchmark(match)
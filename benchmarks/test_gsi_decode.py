@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+from typing import Callable
+
+import pytest
+
+from dota_hud.infrastructure.gsi_json import JSON_BACKENDS, backend_available
+from dota_hud.infrastructure.gsi_parser import GsiPayloadParser
+from dota_hud.infrastructure.gsi_state import parse_payload
+
+BACKENDS = [name for name in JSON_BACKENDS if backend_available(name)]
+
+
+def _run(benchmark, payloads: list[bytes], decode: Callable[[bytes], object]) -> None:
+    def session() -> None:
+        for body in payloads:
+            decode(body)
+
+    benchmark(session)
+    # pytest-benchmark меряет всю сессию; в отчёт добавляется цена одного POST.
+    benchmark.extra_info["posts"] = len(payloads)
+    if benchmark.stats:  # None при --benchmark-disable
+        benchmark.extra_info["us_per_post"] = benchmark.stats.stats.mean / len(payloads) * 1e6
+
+
+def test_full_decode_baseline(benchmark, gsi_payloads: list[bytes]) -> None:
+    """Прежний путь: json.loads всего тела и полная сборка GSIState."""
+    _run(benchmark, gsi_payloads, lambda body: parse_payload(json.loads(body)))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_incremental_parser(benchmark, gsi_payloads: list[bytes], backend: str) -> None:
+    parser = GsiPayloadParser(decoder=backend)
+    _run(benchmark, gsi_payloads, parser.parse)
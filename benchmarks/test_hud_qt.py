@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6")
+pytest.importorskip("pytestqt")
+
+from dota_hud.application.models import HudState, MacroLine, WarningState
+from dota_hud.ui.hud_style import HudStyle
+
+FRAMES = 600
+# Число прогонов фиксировано: калибровка по времени на Qt слишком шумная.
+ROUNDS = 20
+
+
+def _style() -> HudStyle:
+    return HudStyle(
+        title="bench",
+        width=549,
+        height=400,
+        x=0,
+        y=0,
+        alpha=0.6,
+        font_family="sans-serif",
+        font_size=18,
+        font_weight="normal",
+        margin_horizontal=8,
+        margin_vertical=8,
+        spacing=4,
+        block_padding=6,
+        text_fade_duration_ms=0,
+        text_fade_start_opacity=1.0,
+        macro_line_spacing=2,
+        macro_bar_height=16,
+        macro_show_title=False,
+    )
+
+
+@pytest.fixture
+def hud(qapp):
+    from dota_hud.ui.qt.hud_window import HudQt
+
+    widget = HudQt(_style())
+    widget.show()
+    qapp.processEvents()
+    yield widget
+    widget.close()
+
+
+@pytest.fixture
+def canvas(qapp):
+    from dota_hud.ui.qt.hud_canvas import HudCanvas
+
+    widget = HudCanvas(_style())
+    widget.show()
+    qapp.processEvents()
+    yield widget
+    widget.close()
+
+
+def _frames(count: int) -> list[tuple[str, str, str, list[MacroLine]]]:
+    frames = []
+    for index in range(count):
+        second = 600 + index
+        frames.append(
+            (
+                f"{second // 60}:{second % 60:02d}",
+                f"СЕЙЧАС\nevent {index // 30}",
+                f"ДАЛЕЕ ({30 - index % 30}с)\nevent {index // 30 + 1}",
+                [
+                    MacroLine(text=f"Power {120 - index % 120}s", progress=(index % 120) / 120,
+                              color="#3b82f6"),
+                    MacroLine(text=f"Bounty {180 - index % 180}s", progress=(index % 180) / 180,
+                              color="#f59e0b"),
+                ],
+            )
+        )
+    return frames
+
+
+def test_hud_timer_only_updates(benchmark, hud, qapp) -> None:
+    """Типичный тик: меняется только таймер, остальные set_* отсекаются."""
+    frames = _frames(FRAMES)
+
+    def session() -> None:
+        for timer, *_ in frames:
+            hud.set_timer(timer)
+            hud.set_now("СЕЙЧАС\nevent")
+            hud.set_next("ДАЛЕЕ\nevent")
+            hud.set_warning(None, None)
+        qapp.processEvents()
+
+    benchmark.pedantic(session, rounds=ROUNDS, warmup_rounds=1)
+
+
+def test_hud_full_updates(benchmark, hud, qapp) -> None:
+    """Худший случай: каждый кадр меняет все блоки и макро-полосы."""
+    frames = _frames(FRAMES)
+
+    def session() -> None:
+        for timer, now, next_text, lines in frames:
+            hud.set_timer(timer)
+            hud.set_now(now, "warn")
+            hud.set_next(next_text)
+            hud.set_macro("MACRO", None, lines)
+            hud.set_warning("window", "danger")
+            qapp.processEvents()
+
+    benchmark.pedantic(session, rounds=ROUNDS, warmup_rounds=1)
+    if benchmark.stats:
+        benchmark.extra_info["us_per_frame"] = benchmark.stats.stats.mean / FRAMES * 1e6
+
+
+def _states(count: int) -> list[HudState]:
+    return [
+        HudState(
+            timer_text=timer,
+            now_text=now,
+            now_level="warn",
+            next_text=next_text,
+            next_level=None,
+            macro_text="MACRO",
+            macro_level=None,
+            macro_lines=tuple(lines),
+            warning=WarningState(text="window", level="danger"),
+        )
+        for timer, now, next_text, lines in _frames(count)
+    ]
+
+
+def test_hud_apply_full_updates(benchmark, hud, qapp) -> None:
+    """Тот же худший случай через apply(): одна раскладка и перерисовка на кадр."""
+    states = _states(FRAMES)
+
+    def session() -> None:
+        for state in states:
+            hud.apply(state)
+            qapp.processEvents()
+
+    benchmark.pedantic(session, rounds=ROUNDS, warmup_rounds=1)
+    if benchmark.stats:
+        benchmark.extra_info["us_per_frame"] = benchmark.stats.stats.mean / FRAMES * 1e6
+
+
+def test_canvas_apply_full_updates(benchmark, canvas, qapp) -> None:
+    """Худший случай на HudCanvas: QStaticText и отрисовка без таблиц стилей."""
+    states = _states(FRAMES)
+
+    def session() -> None:
+        for state in states:
+            canvas.apply(state)
+            qapp.processEvents()
+
+    benchmark.pedantic(session, rounds=ROUNDS, warmup_rounds=1)
+    if benchmark.stats:
+        benchmark.extra_info["us_per_frame"] = benchmark.stats.stats.mean / FRAMES * 1e6
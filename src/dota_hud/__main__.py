@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import argparse
 import logging
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .startup_profile import StartupProfile
+    from .ui.qt.admin_window import AdminWindow
 
 logging.basicConfig(
     level=logging.INFO,
@@ -11,42 +17,112 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    project_root = Path(__file__).resolve().parents[2]
+    parser = argparse.ArgumentParser(prog="dota-hud", description="Dota 2 timings HUD")
+    parser.add_argument(
+        "config",
+        nargs="?",
+        type=Path,
+        default=project_root / "configs" / "timings.yaml",
+        help="путь к timings.yaml",
+    )
+    parser.add_argument("--headless", action="store_true", help="запуск без окна (без Qt)")
+    parser.add_argument("--replay", type=Path, help="проиграть запись GSI (headless)")
+    parser.add_argument(
+        "--speed",
+        default="max",
+        help="скорость --replay: max (бенчмарк), real или множитель (4, 4x)",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        metavar="SECONDS",
+        help="прогнать синтетический матч длиной SECONDS игровых секунд (headless)",
+    )
+    parser.add_argument("--role", help="роль для фильтрации подсказок в headless-прогоне")
+    parser.add_argument(
+        "--dump",
+        type=int,
+        default=0,
+        metavar="N",
+        help="вывести последние N вызовов HUD после headless-прогона",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="вывести время импортов и фаз запуска, память процесса",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    config_path = args.config.resolve()
+    if args.headless or args.replay or args.synthetic:
+        _run_headless(config_path, args)
+    else:
+        profile = None
+        if args.startup_profile:
+            from .startup_profile import StartupProfile
+
+            profile = StartupProfile()
+        _run_qt(config_path, profile)
+
+
+def _run_headless(config_path: Path, args: argparse.Namespace) -> None:
+    from .config.loader import load_config
+    from .headless import (
+        recorded_states,
+        run_benchmark,
+        run_live,
+        run_replay_realtime,
+        synthetic_states,
+    )
+    from .infrastructure.gsi_replay import parse_speed
+    from .ui.headless import HeadlessHud
+
+    config = load_config(config_path)
+    if not (args.replay or args.synthetic):
+        run_live(config)
+        return
+
+    speed = parse_speed(args.speed)
+    if args.replay and speed is not None:
+        hud = HeadlessHud(capacity=max(args.dump, 1024))
+        frames, seconds = run_replay_realtime(config, args.replay, speed, hud=hud)
+        print(f"frames: {frames}, {seconds:.3f} s")
+    else:
+        hud = HeadlessHud(capacity=max(args.dump, 1024), virtual_clock=True)
+        if args.replay:
+            source = recorded_states(args.replay, config.general.gsi_json)
+        else:
+            source = synthetic_states(args.synthetic)
+        print(run_benchmark(config, source, role=args.role, hud=hud).format())
+    for call in list(hud.calls)[-args.dump:] if args.dump else ():
+        print(f"{call.at_ms:10.1f} ms  {call.name}{call.args}")
+
+
+def _run_qt(config_path: Path, profile: "StartupProfile | None" = None) -> None:
     from PySide6 import QtCore, QtWidgets
     from .application.app_controller import AppController
-    from .config.loader import load_config
-    from .config.reader import read_config
+    from .config.loader import load_config_bundle
     from .config.validator import validate_yaml_configs
-    from .config.gsi_config_writer import write_gsi_config
     from .infrastructure.dota_detector import DotaDetector
     from .ui.qt.tray import TrayIcon, TrayState
-    from .ui.qt.admin_window import AdminWindow
 
-    project_root = Path(__file__).resolve().parents[2]
-    default_config = project_root / "configs" / "timings.yaml"
-    config_path = Path(sys.argv[1]).resolve() if len(sys.argv) > 1 else default_config
+    mark = profile.mark if profile is not None else (lambda phase: None)
+    mark("imports")
 
     yaml_result = validate_yaml_configs(config_path)
     if not yaml_result.ok:
         logger.error("Config errors: %s", yaml_result.errors)
 
-    config = load_config(config_path)
-
-    # Читаем raw YAML для заполнения админки
-    raw_config = read_config(config_path)
-    # Мерж модулей для raw данных
-    config_dir = config_path.parent
-    for module_path in raw_config.get("modules", []):
-        module_data = read_config(config_dir / module_path)
-        for key in ("timeline", "rules", "windows", "danger_windows"):
-            if key in module_data:
-                raw_config.setdefault(key, []).extend(module_data[key])
-    # Мерж macro
-    macro_path = raw_config.get("macro_config")
-    if macro_path:
-        macro_data = read_config(config_dir / macro_path)
-        if "macro_timings" in macro_data:
-            raw_config["macro_timings"] = macro_data["macro_timings"]
+    # Конфиг и raw YAML для админки собираются за одно чтение файлов (или из кэша)
+    loaded = load_config_bundle(config_path)
+    config = loaded.config
+    raw_config = loaded.raw
+    mark("config")
 
     app = QtWidgets.QApplication.instance()
     if app is None:
@@ -54,17 +130,39 @@ def main() -> None:
 
     # Не завершать приложение при закрытии окон — живём в трее
     app.setQuitOnLastWindowClosed(False)
+    mark("QApplication")
 
     tray = TrayIcon()
     if not QtWidgets.QSystemTrayIcon.isSystemTrayAvailable():
         logger.warning("System tray is not available on this system")
     tray.setVisible(True)
     tray.show()
-    admin = AdminWindow()
-    admin.load_from_raw_config(raw_config)
+    mark("tray")
+
+    controller = AppController(config)
+    controller.start_hotkeys_and_loop()
+    mark("controller")
+
+    # Админка создаётся при первом открытии (general.startup: lazy) —
+    # до этого её виджеты и таблицы не нужны.
+    admin_holder: list[AdminWindow] = []
+
+    def _admin() -> AdminWindow:
+        if admin_holder:
+            return admin_holder[0]
+        from .ui.qt.admin_window import AdminWindow
+
+        admin = AdminWindow()
+        admin.load_from_raw_config(raw_config)
+        admin.set_on_recreate_gsi(lambda: _recreate_gsi(admin))
+        admin.set_on_refresh_latency(controller.latency_report)
+        admin_holder.append(admin)
+        return admin
 
     # Кнопка пересоздания GSI конфига
-    def _recreate_gsi() -> None:
+    def _recreate_gsi(admin: AdminWindow) -> None:
+        from .config.gsi_config_writer import write_gsi_config
+
         dota_path = admin.settings_dota_path.text().strip()
         if not dota_path:
             QtWidgets.QMessageBox.warning(admin, "Ошибка", "Укажите путь к Dota 2 во вкладке Настройки")
@@ -75,10 +173,12 @@ def main() -> None:
         except Exception as e:
             QtWidgets.QMessageBox.critical(admin, "Ошибка", f"Не удалось создать GSI конфиг:\n{e}")
 
-    admin.set_on_recreate_gsi(_recreate_gsi)
+    def _show_admin() -> None:
+        _admin().show()
 
-    controller = AppController(config)
-    controller.start_hotkeys_and_loop()
+    if config.general.startup != "lazy":
+        _admin()
+        mark("admin")
 
     # Thread-safe bridge: DotaDetector callbacks run in a worker thread,
     # but Qt widgets must be updated from the main thread.
@@ -101,15 +201,39 @@ def main() -> None:
     )
     detector.start()
 
-    controller.set_on_admin(admin.show)
+    controller.set_on_admin(_show_admin)
+
+    def _show_latency() -> None:
+        report = controller.latency_report()
+        logger.info("HUD latency:\n%s", report)
+        admin = _admin()
+        admin.set_latency_report(report)
+        admin.show_status_tab()
+
+    def _on_profiler(active: bool, path: Path | None) -> None:
+        tray.set_profiling(active)
+        if path is not None:
+            tray.showMessage("D2Hub", f"Профиль сохранён:\n{path}")
+
+    controller.set_on_profiler(_on_profiler)
 
     tray.set_callbacks(
-        on_open_settings=admin.show,
+        on_open_settings=_show_admin,
         on_toggle_hud=controller.toggle_hud_visibility,
         on_role_changed=controller.set_role,
         on_quit=lambda: (detector.stop(), controller.shutdown(), app.quit()),
+        on_show_latency=_show_latency,
+        on_toggle_profiler=controller.toggle_profiler,
     )
 
+    if profile is not None:
+        # Отчёт — когда цикл событий впервые простаивает: трей уже на экране.
+        def _report() -> None:
+            profile.mark("event loop idle")
+            print(profile.report(), flush=True)
+
+        QtCore.QTimer.singleShot(0, _report)
+
     sys.exit(app.exec())
 
 
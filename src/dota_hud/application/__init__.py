@@ -2,7 +2,7 @@
 
 from .app_controller import AppController
 from .commands import HudAction
-from .infra_provider import GsiStateStore, InfraProvider, InfraServices
+from .infra_provider import GsiSnapshot, GsiStateStore, InfraProvider, InfraServices
 from .models import GameStateSnapshot, HudState, WarningState
 from .ports import GsiServerPort, HotkeysPort, LogWatcherPort
 from .use_cases import HudCycleResult, HudCycleUseCase
@@ -14,6 +14,7 @@ __all__ = [
     "HudCycleResult",
     "HudCycleUseCase",
     "HudAction",
+    "GsiSnapshot",
     "GsiStateStore",
     "GsiServerPort",
     "HotkeysPort",
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import math
+import time
+from dataclasses import replace
 from pathlib import Path
 from typing import Callable
 
@@ -7,11 +10,15 @@ from ..config.loader import load_config
 from ..config.models import AppConfig
 from ..domain.scheduler import Scheduler
 from ..domain.warning_windows import WarningWindowService
+from ..infrastructure.gsi_state import GSIState
+from ..infrastructure.sampling_profiler import PROFILE_FORMATS, SamplingProfiler
 from ..ui.factory import UiFactory
 from .commands import HudAction
+from .frame_table import compile_frame_table
 from .hud_port import HudPort
 from .hud_presenter import HudPresenter, PresenterConfig
-from .infra_provider import InfraProvider
+from .infra_provider import GsiSnapshot, InfraProvider
+from .latency import LatencyRecorder
 from .infra_provider import InfraServices
 from .models import GameStateSnapshot
 from .use_cases import HudCycleUseCase
@@ -30,7 +37,7 @@ class AppController:
         self._config = config
         self._ui_factory = UiFactory()
         self._hud = hud or self._build_hud(config)
-        self._scheduler = Scheduler(config.buckets)
+        self._scheduler = Scheduler(config.buckets, config.rules)
         self._warning_service = WarningWindowService()
         self._presenter = HudPresenter(
             PresenterConfig(
@@ -40,17 +47,30 @@ class AppController:
                 macro_hints=tuple(self._config.presenter.macro_hints),
             )
         )
-        self._cycle = HudCycleUseCase(
-            scheduler=self._scheduler,
-            warning_service=self._warning_service,
-            presenter=self._presenter,
-            windows=self._config.windows,
-            resync_threshold_seconds=self._config.log_integration.resync_threshold_seconds,
-            gsi_timeout_seconds=self._config.log_integration.gsi_timeout_seconds,
-        )
+        self._cycle = self._build_cycle(config)
 
         self._current_role: str | None = None
         self._on_admin: Callable[[], None] | None = None
+        self._profiler = self._build_profiler(config)
+        self._on_profiler: Callable[[bool, Path | None], None] | None = None
+
+        self._event_driven = config.general.loop_mode == "event"
+        self._loop_interval_ms = max(1, config.general.loop_interval_ms)
+        self._loop_max_sleep_ms = max(1, config.general.loop_max_sleep_ms)
+        self._wake_token = 0
+        self._refresh_requested = True
+        self._last_seq = -1
+        self._last_game_key: tuple[int | None, str | None] | None = None
+        self._next_change_at: float | None = None
+
+        self._latency = LatencyRecorder()
+        self._measured_state: GSIState | None = None
+        self._pending_received_at = 0.0
+        self._paint_wait: tuple[float, float] | None = None
+        # Отрисовку умеет отмечать только Qt HUD; остальные реализации её не знают.
+        set_paint_probe = getattr(self._hud, "set_paint_probe", None)
+        if set_paint_probe is not None:
+            set_paint_probe(self._on_paint)
 
         provider = infra_provider or InfraProvider()
         services = provider.build(config)
@@ -65,7 +85,7 @@ class AppController:
         if self._log_watcher:
             self._log_watcher.start()
 
-        self._hud.every(200, self._loop)
+        self._start_loop()
 
         try:
             self._hud.run()
@@ -75,7 +95,7 @@ class AppController:
     def start_hotkeys_and_loop(self) -> None:
         """Запускает хоткеи и основной loop (вызывать сразу при старте)."""
         self._hotkeys.start()
-        self._hud.every(200, self._loop)
+        self._start_loop()
 
     def start_services(self) -> None:
         """Запускает GSI сервер и показывает HUD (при обнаружении Dota)."""
@@ -101,13 +121,40 @@ class AppController:
     def set_role(self, role: str) -> None:
         """Устанавливает текущую роль."""
         self._current_role = role
+        self._request_refresh()
+
+    @property
+    def latency(self) -> LatencyRecorder:
+        """Возвращает гистограммы задержек пути GSI → пиксели."""
+        return self._latency
+
+    def latency_report(self) -> str:
+        """Возвращает текстовый отчёт p50/p99 по этапам."""
+        return self._latency.report()
 
     def set_on_admin(self, callback: Callable[[], None]) -> None:
         """Устанавливает callback для открытия админки."""
         self._on_admin = callback
 
+    @property
+    def profiling(self) -> bool:
+        """Возвращает признак идущей записи профиля."""
+        return self._profiler.is_running
+
+    def toggle_profiler(self) -> None:
+        """Запускает или останавливает профилировщик.
+
+        Путь к сохранённому профилю получает callback set_on_profiler.
+        """
+        self._notify_profiler(self._profiler.toggle())
+
+    def set_on_profiler(self, callback: Callable[[bool, Path | None], None]) -> None:
+        """Устанавливает callback смены состояния профилировщика."""
+        self._on_profiler = callback
+
     def shutdown(self) -> None:
         """Полное завершение."""
+        self._profiler.stop()
         self._hotkeys.stop()
         if self._log_watcher:
             self._log_watcher.stop()
@@ -119,23 +166,49 @@ class AppController:
         from ..config.loader import load_config
         config = load_config(config_path)
         self._config = config
-        self._scheduler = Scheduler(config.buckets)
-        self._cycle = HudCycleUseCase(
+        self._scheduler = Scheduler(config.buckets, config.rules)
+        self._cycle = self._build_cycle(config)
+        self._request_refresh()
+
+    @staticmethod
+    def from_config_file(config_path: Path) -> "AppController":
+        """Создаёт контроллер из конфигурационного файла."""
+        return AppController(load_config(config_path))
+
+    def _build_cycle(self, config: AppConfig) -> HudCycleUseCase:
+        return HudCycleUseCase(
             scheduler=self._scheduler,
             warning_service=self._warning_service,
             presenter=self._presenter,
             windows=config.windows,
             resync_threshold_seconds=config.log_integration.resync_threshold_seconds,
             gsi_timeout_seconds=config.log_integration.gsi_timeout_seconds,
+            frame_table=compile_frame_table(config, self._presenter),
         )
 
-    @staticmethod
-    def from_config_file(config_path: Path) -> "AppController":
-        """Создаёт контроллер из конфигурационного файла."""
-        return AppController(load_config(config_path))
+    def _notify_profiler(self, path: Path | None) -> None:
+        if self._on_profiler:
+            self._on_profiler(self._profiler.is_running, path)
+
+    def _on_profiler_auto_stop(self, path: Path | None) -> None:
+        # Вызывается в потоке профилировщика: сообщаем UI из его потока.
+        self._hud.post(lambda: self._notify_profiler(path))
+
+    def _build_profiler(self, config: AppConfig) -> SamplingProfiler:
+        general = config.general
+        output_format = general.profile_format
+        if output_format not in PROFILE_FORMATS:
+            output_format = "speedscope"
+        return SamplingProfiler(
+            hz=general.profile_hz,
+            output_dir=Path(general.profile_dir),
+            output_format=output_format,
+            max_seconds=general.profile_max_seconds,
+            on_auto_stop=self._on_profiler_auto_stop,
+        )
 
     def _build_hud(self, config: AppConfig) -> HudPort:
-        return self._ui_factory.build(config.hud)
+        return self._ui_factory.build(config.hud, lazy=config.general.startup == "lazy")
 
     def _apply_infra(self, services: InfraServices) -> None:
         self._gsi_state_store = services.gsi_state_store
@@ -155,49 +228,159 @@ class AppController:
             self._log_watcher.stop()
         self._gsi_server.stop()
 
+    def _start_loop(self) -> None:
+        if self._event_driven:
+            self._gsi_state_store.subscribe(self._on_gsi_update)
+            self._hud.every(0, self._event_loop_wake)
+        else:
+            self._hud.every(self._loop_interval_ms, self._loop)
+
     def _loop(self) -> None:
-        self._hud.every(200, self._loop)
+        self._hud.every(self._loop_interval_ms, self._loop)
+        self._step()
+
+    def _on_gsi_update(self) -> None:
+        # Вызывается в потоке GSI-сервера: переносим пробуждение в поток UI.
+        self._hud.post(self._event_loop_wake)
+
+    def _request_refresh(self) -> None:
+        self._refresh_requested = True
+        if self._event_driven and self._wake_token:
+            self._event_loop_wake()
 
+    def _schedule_wake(self, delay_ms: int) -> None:
+        self._wake_token += 1
+        token = self._wake_token
+        self._hud.every(delay_ms, lambda: self._on_wake_timer(token))
+
+    def _on_wake_timer(self, token: int) -> None:
+        if token != self._wake_token:
+            return  # таймер вытеснен более ранним пробуждением
+        self._event_loop_wake()
+
+    def _event_loop_wake(self) -> None:
         try:
-            gsi_state = self._gsi_state_store.get()
-            game_state = (
-                GameStateSnapshot(
-                    clock_time=gsi_state.clock_time,
-                    paused=gsi_state.paused,
-                    updated_at=gsi_state.updated_at,
-                )
-                if gsi_state
-                else None
-            )
+            self._step()
+        finally:
+            delay_ms = self._loop_max_sleep_ms
+            if self._next_change_at is not None:
+                until_change = math.ceil((self._next_change_at - time.time()) * 1000) + 1
+                delay_ms = max(1, min(delay_ms, until_change))
+            self._schedule_wake(delay_ms)
+
+    def _step(self) -> None:
+        """Шаг цикла: пересчёт HUD только при видимых изменениях.
+
+        Снимок GSI читается один раз. Если его seq не изменился, команд нет,
+        обновление не запрошено и не наступил ближайший момент, когда
+        картинка меняется сама (секунда ручного таймера, порог GSI
+        STALE/OFFLINE), тик пропускается целиком. Новый снимок, в котором не
+        изменились время и статус GSI, тоже не пересчитывает HUD.
+        """
+        now = time.time()
+        actions = self._hotkeys.drain()
+        snapshot = self._gsi_state_store.snapshot()
+        deadline_passed = self._next_change_at is not None and now >= self._next_change_at
+        if (
+            not actions
+            and not self._refresh_requested
+            and not deadline_passed
+            and snapshot.seq == self._last_seq
+        ):
+            return
+        self._last_seq = snapshot.seq
+        gsi_state = snapshot.state
+        if gsi_state is not None and gsi_state is not self._measured_state:
+            self._measure_pickup(gsi_state, snapshot.published_at)
+        # Статус GSI (пауза, STALE, OFFLINE) зависит от updated_at и heartbeat,
+        # а не только от времени матча: свежий снимок с той же секундой
+        # должен снять STALE.
+        game_snapshot = self._game_snapshot(gsi_state)
+        game_key = (
+            gsi_state.clock_time if gsi_state else None,
+            self._cycle.gsi_status(game_snapshot, snapshot.last_heartbeat_ts, now=now),
+        )
+        if (
+            actions
+            or self._refresh_requested
+            or deadline_passed
+            or game_key != self._last_game_key
+        ):
+            self._refresh_requested = False
+            self._last_game_key = game_key
+            self._run_cycle(actions, snapshot)
+        self._next_change_at = self._cycle.next_change_at(
+            game_snapshot,
+            snapshot.last_heartbeat_ts,
+            now=time.time(),
+        )
+
+    def _measure_pickup(self, gsi_state: GSIState, published_at: float) -> None:
+        self._measured_state = gsi_state
+        if not gsi_state.received_at:
+            return
+        latency = self._latency
+        latency.record("parse", gsi_state.parsed_at - gsi_state.received_at)
+        latency.record("store", published_at - gsi_state.parsed_at)
+        latency.record("pickup", time.perf_counter() - published_at)
+        self._pending_received_at = gsi_state.received_at
+
+    def _on_paint(self, painted_at: float) -> None:
+        if self._paint_wait is None:
+            return
+        set_done, received_at = self._paint_wait
+        self._paint_wait = None
+        self._latency.record("paint", painted_at - set_done)
+        if received_at:
+            self._latency.record("to_paint", painted_at - received_at)
+
+    @staticmethod
+    def _game_snapshot(gsi_state: GSIState | None) -> GameStateSnapshot | None:
+        if gsi_state is None:
+            return None
+        return GameStateSnapshot(
+            clock_time=gsi_state.clock_time,
+            paused=gsi_state.paused,
+            updated_at=gsi_state.updated_at,
+        )
+
+    def _run_cycle(self, actions: list[HudAction], snapshot: GsiSnapshot) -> None:
+        received_at, self._pending_received_at = self._pending_received_at, 0.0
+        try:
+            cycle_started = time.perf_counter()
+            game_state = self._game_snapshot(snapshot.state)
 
-            actions = self._hotkeys.drain()
             if HudAction.LOCK in actions:
                 self._hud.toggle_lock()
             if HudAction.ADMIN in actions and self._on_admin:
                 self._on_admin()
+            if HudAction.PROFILE in actions:
+                self.toggle_profiler()
             cycle_actions = [
-                a for a in actions if a not in (HudAction.LOCK, HudAction.ADMIN)
+                a
+                for a in actions
+                if a not in (HudAction.LOCK, HudAction.ADMIN, HudAction.PROFILE)
             ]
             cycle = self._cycle.run(
                 game_state,
                 cycle_actions,
-                last_heartbeat=self._gsi_state_store.last_heartbeat(),
+                last_heartbeat=snapshot.last_heartbeat_ts,
                 role=self._current_role,
             )
             view_model = cycle.hud_state
+            set_started = time.perf_counter()
 
-            self._hud.set_timer(view_model.timer_text)
-            self._hud.set_warning(view_model.warning.text, view_model.warning.level)
-            self._hud.set_now(
-                cycle.paused_status or view_model.now_text,
-                view_model.now_level,
-            )
+            if cycle.paused_status:
+                view_model = replace(view_model, now_text=cycle.paused_status)
+            self._hud.apply(view_model)
 
-            self._hud.set_next(view_model.next_text, view_model.next_level)
-            self._hud.set_macro(
-                view_model.macro_text,
-                view_model.macro_level,
-                list(view_model.macro_lines),
-            )
+            set_done = time.perf_counter()
+            latency = self._latency
+            latency.record("cycle", set_started - cycle_started)
+            latency.record("presenter", cycle.presenter_seconds)
+            latency.record("ui_set", set_done - set_started)
+            if received_at:
+                latency.record("total", set_done - received_at)
+            self._paint_wait = (set_done, received_at)
         except Exception as exc:
             self._hud.set_now(f"HUD error: {exc}")
@@ -11,6 +11,7 @@ class HudAction(str, Enum):
     RESET = "reset"
     LOCK = "lock"
     ADMIN = "admin"
+    PROFILE = "profile"
 
 
 __all__ = ["HudAction"]
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Sequence
+
+from ..config.models import AppConfig
+from ..domain.events import Bucket, RecurringRule
+from ..domain.scheduler import Scheduler, TickState
+from ..domain.warning_windows import WarningWindow, WarningWindowIndex, WarningWindowService
+from .hud_presenter import HudPresenter
+from .models import HudState, MacroLine, WarningState
+
+__all__ = ["DEFAULT_HORIZON_SECONDS", "FrameTable", "compile_frame_table", "render_frame"]
+
+DEFAULT_HORIZON_SECONDS = 90 * 60
+_CHUNK_BITS = 6
+
+
+def render_frame(
+    tick_state: TickState,
+    window_index: WarningWindowIndex,
+    warning_service: WarningWindowService,
+    presenter: HudPresenter,
+) -> HudState:
+    """Собирает состояние HUD для одного тика планировщика."""
+    active_windows = window_index.active(tick_state.elapsed)
+    warning_level = warning_service.warning_level(active_windows)
+    warning_text = active_windows[0].text if active_windows else None
+    return presenter.build_view_model(
+        tick_state,
+        warning_text=warning_text,
+        warning_level=warning_level,
+    )
+
+
+class _Pool:
+    """Пул уникальных значений с доступом по индексу."""
+
+    def __init__(self) -> None:
+        self.values: list[Any] = []
+        self._index: dict[Any, int] = {}
+
+    def intern(self, value: Any) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.values)
+            self._index[value] = index
+            self.values.append(value)
+        return index
+
+
+class _RoleTable:
+    """Колонки кадров одной роли: по строке на каждую секунду."""
+
+    __slots__ = (
+        "ready",
+        "timer",
+        "now",
+        "next",
+        "macro_text",
+        "macro_lines",
+        "warning_text",
+        "warning_level",
+    )
+
+    def __init__(self, rows: int) -> None:
+        self.ready = bytearray((rows >> _CHUNK_BITS) + 1)
+        empty = array("I", [0]) * rows
+        self.timer = array("I", empty)
+        self.now = array("I", empty)
+        self.next = array("I", empty)
+        self.macro_text = array("I", empty)
+        self.macro_lines = array("I", empty)
+        self.warning_text = array("I", empty)
+        self.warning_level = array("I", empty)
+
+
+class FrameTable:
+    """Предвычисленная посекундная таблица состояний HUD на весь матч.
+
+    Всё, что HUD показывает при работающем таймере, зависит только от
+    (elapsed, role), поэтому кадры считаются один раз и хранятся колонками
+    индексов в общий пул строк. Таблица роли заполняется блоками по 64
+    секунды при первом обращении, чтобы не останавливать UI на полный
+    расчёт; за пределами горизонта lookup возвращает None и вызывающий код
+    переходит на живой расчёт.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[Bucket],
+        windows: Sequence[WarningWindow],
+        presenter: HudPresenter,
+        horizon_seconds: int = DEFAULT_HORIZON_SECONDS,
+        warning_service: WarningWindowService | None = None,
+        rules: Sequence[RecurringRule] = (),
+    ) -> None:
+        """Создаёт таблицу кадров; сами кадры считаются лениво по ролям."""
+        self._warning_service = warning_service or WarningWindowService()
+        self._window_index = self._warning_service.build_index(windows)
+        self._scheduler = Scheduler(list(buckets), rules)
+        self._presenter = presenter
+        self._horizon = max(0, int(horizon_seconds))
+        self._pool = _Pool()
+        self._tables: dict[str | None, _RoleTable] = {}
+        self._last_key: tuple[str | None, int] | None = None
+        self._last_state: HudState | None = None
+
+    @property
+    def horizon_seconds(self) -> int:
+        """Возвращает последнюю секунду, покрытую таблицей."""
+        return self._horizon
+
+    def lookup(self, elapsed: int, role: str | None = None) -> HudState | None:
+        """Возвращает кадр для секунды матча или None за пределами горизонта."""
+        if elapsed < 0 or elapsed > self._horizon:
+            return None
+        key = (role, elapsed)
+        if key == self._last_key:
+            return self._last_state
+        table = self._tables.get(role)
+        if table is None:
+            table = self._tables[role] = _RoleTable(self._horizon + 1)
+        chunk = elapsed >> _CHUNK_BITS
+        if not table.ready[chunk]:
+            self._compile_chunk(table, role, chunk)
+        values = self._pool.values
+        state = HudState(
+            timer_text=values[table.timer[elapsed]],
+            now_text=values[table.now[elapsed]],
+            now_level=None,
+            next_text=values[table.next[elapsed]],
+            next_level=None,
+            macro_text=values[table.macro_text[elapsed]],
+            macro_level=None,
+            macro_lines=values[table.macro_lines[elapsed]],
+            warning=WarningState(
+                text=values[table.warning_text[elapsed]],
+                level=values[table.warning_level[elapsed]],
+            ),
+        )
+        self._last_key = key
+        self._last_state = state
+        return state
+
+    def compile_role(self, role: str | None = None) -> None:
+        """Заранее заполняет всю таблицу роли (для бенчмарков и реплеев)."""
+        table = self._tables.get(role)
+        if table is None:
+            table = self._tables[role] = _RoleTable(self._horizon + 1)
+        for chunk in range(len(table.ready)):
+            if not table.ready[chunk]:
+                self._compile_chunk(table, role, chunk)
+
+    def _compile_chunk(self, table: _RoleTable, role: str | None, chunk: int) -> None:
+        pool = self._pool
+        scheduler = self._scheduler
+        first = chunk << _CHUNK_BITS
+        last = min(self._horizon, first + (1 << _CHUNK_BITS) - 1)
+        for second in range(first, last + 1):
+            scheduler.set_external_elapsed(second)
+            state = render_frame(
+                scheduler.tick(role=role),
+                self._window_index,
+                self._warning_service,
+                self._presenter,
+            )
+            table.timer[second] = pool.intern(state.timer_text)
+            table.now[second] = pool.intern(state.now_text)
+            table.next[second] = pool.intern(state.next_text)
+            table.macro_text[second] = pool.intern(state.macro_text)
+            table.macro_lines[second] = pool.intern(self._intern_lines(state.macro_lines))
+            table.warning_text[second] = pool.intern(state.warning.text)
+            table.warning_level[second] = pool.intern(state.warning.level)
+        table.ready[chunk] = 1
+
+    def _intern_lines(self, lines: tuple[MacroLine, ...]) -> tuple[MacroLine, ...]:
+        pool = self._pool
+        return tuple(pool.values[pool.intern(line)] for line in lines)
+
+
+def compile_frame_table(
+    config: AppConfig,
+    presenter: HudPresenter,
+    horizon_seconds: int | None = None,
+) -> FrameTable | None:
+    """Строит таблицу кадров по конфигурации; None, если она отключена."""
+    horizon = (
+        config.presenter.frame_table_horizon_seconds
+        if horizon_seconds is None
+        else horizon_seconds
+    )
+    if horizon <= 0:
+        return None
+    return FrameTable(
+        config.buckets,
+        config.windows,
+        presenter,
+        horizon_seconds=horizon,
+        rules=config.rules,
+    )
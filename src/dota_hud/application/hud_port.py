@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from typing import Callable, Protocol
 
-from .models import MacroLine
+from .models import HudState, MacroLine
 
 
 class HudViewPort(Protocol):
     """Интерфейс UI HUD для слоя приложения."""
 
+    def apply(self, state: HudState) -> None:
+        """Применяет состояние HUD за кадр (только изменившиеся блоки)."""
+
     def set_warning(self, text: str | None, level: str | None = None) -> None:
         """Устанавливает уровень предупреждения."""
 
@@ -38,6 +41,9 @@ class HudSchedulePort(Protocol):
     def every(self, ms: int, fn: Callable[[], None]) -> None:
         """Планирует вызов функции в цикле UI."""
 
+    def post(self, fn: Callable[[], None]) -> None:
+        """Потокобезопасно ставит вызов функции в цикл UI."""
+
 
 class HudControlPort(Protocol):
     """Порт управления окном HUD."""
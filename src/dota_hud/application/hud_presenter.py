@@ -2,11 +2,24 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from ..domain.events import format_mmss
+from ..domain.events import Bucket, format_mmss
 from ..domain.macro_info import DEFAULT_MACRO_TIMINGS, MacroTiming
 from ..domain.scheduler import TickState
 from .models import HudState, MacroLine, WarningState
 
+# Готовые строки MM:SS для первых двух часов матча.
+_MMSS_TABLE = tuple(format_mmss(second) for second in range(2 * 60 * 60))
+# Сколько bucket'ов держит кэш отформатированных блоков.
+_BLOCK_CACHE_SIZE = 256
+# Ключ кадра: секунда матча, id bucket'ов NOW/NEXT, текст и уровень предупреждения.
+_FrameKey = tuple[int, int, int, str | None, str | None]
+
+
+def _mmss(seconds: int) -> str:
+    if 0 <= seconds < len(_MMSS_TABLE):
+        return _MMSS_TABLE[seconds]
+    return format_mmss(seconds)
+
 
 @dataclass(frozen=True)
 class PresenterConfig:
@@ -19,11 +32,24 @@ class PresenterConfig:
 
 
 class HudPresenter:
-    """Формирует текстовые блоки для HUD."""
+    """Формирует текстовые блоки для HUD.
+
+    Результаты запоминаются: блоки NOW/NEXT — по объекту Bucket, строки
+    MACRO — по секунде матча, а для того же тика (секунда, bucket'ы,
+    предупреждение) возвращается тот же объект HudState, так что
+    сравнение кадров ниже по цепочке сводится к проверке `is`.
+    """
 
     def __init__(self, config: PresenterConfig | None = None) -> None:
         """Создаёт форматтер текста HUD."""
         self._config = config or PresenterConfig()
+        self._hint_lines = tuple(MacroLine(text=hint) for hint in self._config.macro_hints)
+        self._blocks: dict[int, tuple[Bucket, str, str, str]] = {}
+        self._macro_key: int | None = None
+        self._macro: tuple[tuple[MacroLine, ...], str] = ((), "MACRO: —")
+        self._last_key: _FrameKey | None = None
+        self._last_state: HudState | None = None
+        self._last_buckets: tuple[Bucket | None, Bucket | None] = (None, None)
 
     def build_view_model(
         self,
@@ -32,39 +58,62 @@ class HudPresenter:
         warning_level: str | None = None,
     ) -> HudState:
         """Собирает модель отображения для текущего состояния."""
-        event_text = None
-        if tick_state.now:
-            event_text = (
-                f"СЕЙЧАС {format_mmss(tick_state.now.t)}\n"
-                f"{self._format_items(tick_state.now.items)}"
-            )
-        if event_text is None:
-            event_text = "СЕЙЧАС: —"
+        now = tick_state.now
+        next_event = tick_state.next_event
+        elapsed = tick_state.elapsed
+        key: _FrameKey = (elapsed, id(now), id(next_event), warning_text, warning_level)
+        previous = self._last_state
+        if key == self._last_key and previous is not None:
+            return previous
+
+        event_text = self._block(now)[1] if now else "СЕЙЧАС: —"
 
         next_text = "ДАЛЕЕ: —"
-        if tick_state.next_event:
-            left = tick_state.next_event.t - tick_state.elapsed
-            next_text = (
-                f"ДАЛЕЕ {format_mmss(tick_state.next_event.t)} ({left}с)\n"
-                f"{self._format_items(tick_state.next_event.items)}"
-            )
+        if next_event:
+            _, _, head, tail = self._block(next_event)
+            next_text = f"{head}{next_event.t - elapsed}{tail}"
 
-        macro_lines = self._build_macro_lines(tick_state)
-        macro_text = "MACRO: —"
-        if macro_lines:
-            macro_text = "\n".join(["MACRO:", *[line.text for line in macro_lines]])
+        macro_lines, macro_text = self._macro_for(elapsed)
 
-        return HudState(
-            timer_text=format_mmss(tick_state.elapsed),
+        state = HudState(
+            timer_text=_mmss(elapsed),
             now_text=event_text,
             now_level=None,
             next_text=next_text,
             next_level=None,
             macro_text=macro_text,
             macro_level=None,
-            macro_lines=tuple(macro_lines),
+            macro_lines=macro_lines,
             warning=WarningState(text=warning_text, level=warning_level),
         )
+        # Bucket'ы в ключе — по id: держим ссылки, чтобы id не переиспользовался.
+        self._last_key = key
+        self._last_state = state
+        self._last_buckets = (now, next_event)
+        return state
+
+    def _block(self, bucket: Bucket) -> tuple[Bucket, str, str, str]:
+        """Возвращает (bucket, текст NOW, начало и конец текста NEXT)."""
+        cached = self._blocks.get(id(bucket))
+        if cached is not None and cached[0] is bucket:
+            return cached
+        if len(self._blocks) >= _BLOCK_CACHE_SIZE:
+            self._blocks.clear()
+        items = self._format_items(bucket.items)
+        mmss = _mmss(bucket.t)
+        cached = (bucket, f"СЕЙЧАС {mmss}\n{items}", f"ДАЛЕЕ {mmss} (", f"с)\n{items}")
+        self._blocks[id(bucket)] = cached
+        return cached
+
+    def _macro_for(self, elapsed: int) -> tuple[tuple[MacroLine, ...], str]:
+        if elapsed != self._macro_key:
+            macro_lines = tuple(self._build_macro_lines(elapsed))
+            macro_text = "MACRO: —"
+            if macro_lines:
+                macro_text = "\n".join(["MACRO:", *[line.text for line in macro_lines]])
+            self._macro_key = elapsed
+            self._macro = (macro_lines, macro_text)
+        return self._macro
 
     def _format_items(self, items: list[str]) -> str:
         lines = [f"• {item}" for item in items]
@@ -80,19 +129,18 @@ class HudPresenter:
             return lines
         return lines[:max_lines] + [f"+{len(lines) - max_lines} ещё"]
 
-    def _build_macro_lines(self, tick_state: TickState) -> list[MacroLine]:
+    def _build_macro_lines(self, elapsed: int) -> list[MacroLine]:
         timing_lines: list[MacroLine] = []
         for timing in self._config.macro_timings:
-            text = f"{timing.name}: {timing.status(tick_state.elapsed)}"
+            text = f"{timing.name}: {timing.status(elapsed)}"
             timing_lines.append(
                 MacroLine(
                     text=text,
-                    progress=timing.progress(tick_state.elapsed),
+                    progress=timing.progress(elapsed),
                     color=timing.color,
                 )
             )
-        hint_lines = [MacroLine(text=hint) for hint in self._config.macro_hints]
-        combined = [*timing_lines, *hint_lines]
+        combined = [*timing_lines, *self._hint_lines]
         if self._config.macro_max_lines <= 0 or len(combined) <= self._config.macro_max_lines:
             return combined
         trimmed = combined[: self._config.macro_max_lines]
@@ -1,51 +1,95 @@
 from __future__ import annotations
 
 import sys
-import threading
 import time
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Optional
 
 from ..config.models import AppConfig
-from ..infrastructure.gsi_server import GSIServer, GSIState
+from ..infrastructure.gsi_backend import build_gsi_server
+from ..infrastructure.gsi_state import GSIState
+from .commands import HudAction
 from .ports import GsiServerPort, HotkeysPort, LogWatcherPort
 
 
+@dataclass(frozen=True)
+class GsiSnapshot:
+    """Неизменяемый снимок хранилища GSI с порядковым номером."""
+
+    seq: int = 0
+    state: Optional[GSIState] = None
+    last_update_ts: float | None = None
+    last_heartbeat_ts: float | None = None
+    # Момент time.perf_counter() публикации state (для замеров задержки).
+    published_at: float = 0.0
+
+
 class GsiStateStore:
-    """Хранилище последнего состояния GSI с блокировкой."""
+    """Хранилище последнего состояния GSI без блокировок.
+
+    Писатель (поток GSI-сервера) каждый раз собирает новый неизменяемый
+    GsiSnapshot со следующим seq и публикует его одной заменой ссылки,
+    которая атомарна в CPython. Читатели получают согласованный снимок
+    одним чтением и по seq понимают, изменилось ли что-то с прошлого тика.
+    Писатель должен быть один: запись из нескольких потоков может
+    потерять обновление.
+    """
 
     def __init__(self) -> None:
         """Создаёт хранилище состояния."""
-        self._lock = threading.Lock()
-        self._state: Optional[GSIState] = None
-        self._last_update_ts: float | None = None
-        self._last_heartbeat_ts: float | None = None
+        self._snapshot = GsiSnapshot()
+        self._listeners: list[Callable[[], None]] = []
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Добавляет обработчик, вызываемый после каждого обновления.
+
+        Обработчик вызывается в потоке GSI-сервера.
+        """
+        self._listeners.append(callback)
+
+    def snapshot(self) -> GsiSnapshot:
+        """Возвращает текущий снимок целиком."""
+        return self._snapshot
+
+    @property
+    def seq(self) -> int:
+        """Возвращает номер последнего опубликованного снимка."""
+        return self._snapshot.seq
 
     def update(self, state: GSIState) -> None:
         """Обновляет сохранённое состояние GSI."""
-        with self._lock:
-            self._state = state
-            self._last_update_ts = state.updated_at or time.time()
+        current = self._snapshot
+        self._snapshot = replace(
+            current,
+            seq=current.seq + 1,
+            state=state,
+            last_update_ts=state.updated_at or time.time(),
+            published_at=time.perf_counter(),
+        )
+        for callback in self._listeners:
+            callback()
 
     def get(self) -> Optional[GSIState]:
         """Возвращает текущее состояние GSI."""
-        with self._lock:
-            return self._state
+        return self._snapshot.state
 
     def mark_heartbeat(self) -> None:
         """Фиксирует получение heartbeat от GSI."""
-        with self._lock:
-            self._last_heartbeat_ts = time.time()
+        current = self._snapshot
+        self._snapshot = replace(
+            current,
+            seq=current.seq + 1,
+            last_heartbeat_ts=time.time(),
+        )
 
     def last_heartbeat(self) -> Optional[float]:
         """Возвращает время последнего heartbeat."""
-        with self._lock:
-            return self._last_heartbeat_ts
+        return self._snapshot.last_heartbeat_ts
 
     def last_update(self) -> Optional[float]:
         """Возвращает время последнего обновления состояния."""
-        with self._lock:
-            return self._last_update_ts
+        return self._snapshot.last_update_ts
 
 
 @dataclass(frozen=True)
@@ -64,18 +108,16 @@ class InfraProvider:
     def build(self, config: AppConfig) -> InfraServices:
         """Собирает инфраструктурные сервисы."""
         gsi_state_store = GsiStateStore()
-        gsi_server = GSIServer(
+        gsi_server: GsiServerPort = build_gsi_server(
+            config.general.gsi_backend,
+            port=config.general.gsi_port,
             on_update=gsi_state_store.update,
             on_heartbeat=gsi_state_store.mark_heartbeat,
+            on_raw=self._build_recorder(config),
+            json_backend=config.general.gsi_json,
         )
 
-        if sys.platform == "win32":
-            from ..infrastructure.hotkeys_winapi import WinApiHotkeys
-            hotkeys: HotkeysPort = WinApiHotkeys(config.hotkeys)
-        else:
-            from ..infrastructure.hotkeys import Hotkeys
-            hotkeys = Hotkeys(config.hotkeys)
-
+        hotkeys = self._build_hotkeys(config)
         log_watcher = self._build_log_watcher(config)
 
         return InfraServices(
@@ -85,6 +127,20 @@ class InfraProvider:
             log_watcher=log_watcher,
         )
 
+    def _build_hotkeys(self, config: AppConfig) -> HotkeysPort:
+        if sys.platform == "win32":
+            from ..infrastructure.hotkeys_winapi import WinApiHotkeys
+            return WinApiHotkeys(config.hotkeys)
+        from ..infrastructure.hotkeys import Hotkeys
+        return Hotkeys(config.hotkeys)
+
+    @staticmethod
+    def _build_recorder(config: AppConfig) -> Callable[[bytes], None] | None:
+        if not config.general.gsi_record_path:
+            return None
+        from ..infrastructure.gsi_recorder import GsiRecorder
+        return GsiRecorder(Path(config.general.gsi_record_path)).record
+
     @staticmethod
     def _build_log_watcher(config: AppConfig) -> "LogWatcherPort | None":
         if not config.log_integration.enabled:
@@ -96,7 +152,36 @@ class InfraProvider:
             on_start=lambda: None,
             poll_interval=config.log_integration.poll_interval_ms / 1000.0,
             debounce_seconds=config.log_integration.debounce_seconds,
+            watch_backend=config.log_integration.watch_backend,
         )
 
 
-__all__ = ["GsiStateStore", "InfraProvider", "InfraServices"]
+class NullHotkeys:
+    """Источник hotkeys без клавиатуры (headless-режим)."""
+
+    def start(self) -> None:
+        """Ничего не делает."""
+
+    def stop(self) -> None:
+        """Ничего не делает."""
+
+    def drain(self, max_items: int = 30) -> list[HudAction]:
+        """Команд никогда нет."""
+        return []
+
+
+class HeadlessInfraProvider(InfraProvider):
+    """Инфраструктура без клавиатурных хуков: GSI и лог как обычно."""
+
+    def _build_hotkeys(self, config: AppConfig) -> HotkeysPort:
+        return NullHotkeys()
+
+
+__all__ = [
+    "GsiSnapshot",
+    "GsiStateStore",
+    "HeadlessInfraProvider",
+    "InfraProvider",
+    "InfraServices",
+    "NullHotkeys",
+]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from array import array
+
+__all__ = ["LATENCY_STAGES", "LatencyHistogram", "LatencyRecorder"]
+
+# Этапы пути GSI POST → пиксели, в порядке прохождения.
+LATENCY_STAGES = (
+    "parse",  # тело получено → разобрано (поток GSI)
+    "store",  # разобрано → опубликовано в GsiStateStore
+    "pickup",  # опубликовано → забрано циклом HUD (ожидание poll/wake)
+    "cycle",  # расчёт цикла HUD целиком
+    "presenter",  # построение HudState (таблица кадров или presenter)
+    "ui_set",  # вызовы set_* HUD
+    "paint",  # set_* завершены → отрисовка окна
+    "total",  # тело получено → set_* завершены
+    "to_paint",  # тело получено → отрисовка окна
+)
+
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_HALF = _SUB_BUCKETS >> 1
+
+
+class LatencyHistogram:
+    """Гистограмма задержек в стиле HDR с логарифмически-линейными корзинами.
+
+    Значения хранятся в микросекундах: до 32 мкс — по корзине на микросекунду,
+    дальше каждая степень двойки делится на 16 корзин (точность ~3%).
+    Счётчики лежат в массиве фиксированного размера, запись — одно
+    вычисление индекса и инкремент без блокировок; писатель у гистограммы
+    должен быть один, читатели видят согласованный с точностью до
+    последних записей снимок.
+    """
+
+    def __init__(self, max_seconds: float = 60.0) -> None:
+        """Создаёт гистограмму для задержек до max_seconds."""
+        self._max_us = max(_SUB_BUCKETS, int(max_seconds * 1_000_000))
+        self._counts = array("Q", [0]) * (self._index(self._max_us) + 1)
+        self._total = 0
+        self._sum_us = 0
+        self._max_seen = 0
+
+    @staticmethod
+    def _index(value_us: int) -> int:
+        if value_us < _SUB_BUCKETS:
+            return value_us
+        shift = value_us.bit_length() - _SUB_BUCKET_BITS
+        return _SUB_BUCKETS + (shift - 1) * _HALF + ((value_us >> shift) - _HALF)
+
+    @staticmethod
+    def _lower_bound(index: int) -> int:
+        if index < _SUB_BUCKETS:
+            return index
+        shift = (index - _SUB_BUCKETS) // _HALF + 1
+        return ((index - _SUB_BUCKETS) % _HALF + _HALF) << shift
+
+    @property
+    def count(self) -> int:
+        """Возвращает число записанных значений."""
+        return self._total
+
+    def record(self, seconds: float) -> None:
+        """Записывает задержку в секундах (отрицательные считаются нулём)."""
+        value = min(self._max_us, max(0, round(seconds * 1_000_000)))
+        self._counts[self._index(value)] += 1
+        self._total += 1
+        self._sum_us += value
+        self._max_seen = max(self._max_seen, value)
+
+    def percentile(self, percent: float) -> float:
+        """Возвращает перцентиль в секундах (верхнюю границу корзины)."""
+        if self._total == 0:
+            return 0.0
+        rank = max(1, int(self._total * percent / 100.0 + 0.999999))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                upper = self._lower_bound(index + 1) - 1
+                return min(upper, self._max_seen) / 1_000_000
+        return self._max_seen / 1_000_000
+
+    def mean(self) -> float:
+        """Возвращает среднее в секундах."""
+        return self._sum_us / self._total / 1_000_000 if self._total else 0.0
+
+    def max(self) -> float:
+        """Возвращает максимум в секундах."""
+        return self._max_seen / 1_000_000
+
+    def reset(self) -> None:
+        """Обнуляет гистограмму."""
+        for index in range(len(self._counts)):
+            self._counts[index] = 0
+        self._total = 0
+        self._sum_us = 0
+        self._max_seen = 0
+
+
+class LatencyRecorder:
+    """Набор гистограмм по этапам LATENCY_STAGES."""
+
+    def __init__(self) -> None:
+        """Создаёт пустые гистограммы для всех этапов."""
+        self._histograms = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Записывает задержку этапа."""
+        self._histograms[stage].record(seconds)
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        """Возвращает гистограмму этапа."""
+        return self._histograms[stage]
+
+    def reset(self) -> None:
+        """Обнуляет все гистограммы."""
+        for histogram in self._histograms.values():
+            histogram.reset()
+
+    def report(self) -> str:
+        """Возвращает таблицу p50/p99/max по этапам (в миллисекундах)."""
+        lines = [f"{'stage':<10}{'count':>8}{'p50':>9}{'p99':>9}{'max':>9}  ms"]
+        for stage, histogram in self._histograms.items():
+            if histogram.count == 0:
+                continue
+            lines.append(
+                f"{stage:<10}{histogram.count:>8}"
+                f"{histogram.percentile(50) * 1000:>9.2f}"
+                f"{histogram.percentile(99) * 1000:>9.2f}"
+                f"{histogram.max() * 1000:>9.2f}"
+            )
+        if len(lines) == 1:
+            lines.append("нет данных")
+        return "\n".join(lines)
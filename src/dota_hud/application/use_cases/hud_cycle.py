@@ -9,6 +9,7 @@ __all__ = ["HudCycleResult", "HudCycleUseCase"]
 from ...domain.scheduler import Scheduler
 from ...domain.warning_windows import WarningWindow, WarningWindowService
 from ..commands import HudAction
+from ..frame_table import FrameTable, render_frame
 from ..hud_presenter import HudPresenter
 from ..models import HudState
 from ..models import GameStateSnapshot
@@ -20,6 +21,7 @@ class HudCycleResult:
 
     hud_state: HudState
     paused_status: str | None
+    presenter_seconds: float = 0.0
 
 
 class HudCycleUseCase:
@@ -33,14 +35,17 @@ class HudCycleUseCase:
         windows: list[WarningWindow],
         resync_threshold_seconds: int = 6,
         gsi_timeout_seconds: int = 6,
+        frame_table: FrameTable | None = None,
     ) -> None:
         """Создаёт use-case обновления HUD."""
         self._scheduler = scheduler
         self._warning_service = warning_service
         self._presenter = presenter
         self._windows = windows
+        self._window_index = warning_service.build_index(windows)
         self._resync_threshold_seconds = resync_threshold_seconds
         self._gsi_timeout_seconds = gsi_timeout_seconds
+        self._frame_table = frame_table
 
     def run(
         self,
@@ -50,21 +55,9 @@ class HudCycleUseCase:
         role: str | None = None,
     ) -> HudCycleResult:
         """Обновляет тайминги и возвращает состояние HUD."""
-        paused_status = None
-
         if gsi_state and gsi_state.clock_time is not None:
             self._scheduler.set_external_elapsed(gsi_state.clock_time)
-
-            if gsi_state.paused:
-                paused_status = "PAUSED (DOTA)"
-            if gsi_state.updated_at is not None:
-                drift = time.time() - gsi_state.updated_at
-                if drift > self._resync_threshold_seconds:
-                    paused_status = "GSI STALE"
-        if last_heartbeat is not None:
-            since_heartbeat = time.time() - last_heartbeat
-            if since_heartbeat > self._gsi_timeout_seconds:
-                paused_status = "GSI OFFLINE"
+        paused_status = self.gsi_status(gsi_state, last_heartbeat)
         if paused_status in {"GSI STALE", "GSI OFFLINE"}:
             self._scheduler.clear_external()
 
@@ -76,17 +69,71 @@ class HudCycleUseCase:
             elif action is HudAction.START:
                 self._scheduler.start()
 
-        tick_state = self._scheduler.tick(role=role)
-        active_windows = self._warning_service.active_windows(
-            tick_state.elapsed,
-            self._windows,
-        )
-        warning_level = self._warning_service.warning_level(active_windows)
-        warning_text = active_windows[0].text if active_windows else None
-        hud_state = self._presenter.build_view_model(
-            tick_state,
-            warning_text=warning_text,
-            warning_level=warning_level,
+        presenter_started = time.perf_counter()
+        hud_state = None
+        if self._frame_table is not None and self._scheduler.is_running:
+            hud_state = self._frame_table.lookup(self._scheduler.elapsed(), role)
+        if hud_state is None:
+            hud_state = render_frame(
+                self._scheduler.tick(role=role),
+                self._window_index,
+                self._warning_service,
+                self._presenter,
+            )
+
+        return HudCycleResult(
+            hud_state=hud_state,
+            paused_status=paused_status,
+            presenter_seconds=time.perf_counter() - presenter_started,
         )
 
-        return HudCycleResult(hud_state=hud_state, paused_status=paused_status)
+    def gsi_status(
+        self,
+        gsi_state: GameStateSnapshot | None,
+        last_heartbeat: float | None = None,
+        now: float | None = None,
+    ) -> str | None:
+        """Возвращает статус GSI для HUD: пауза, STALE, OFFLINE или None."""
+        now = time.time() if now is None else now
+        status = None
+        if gsi_state and gsi_state.clock_time is not None:
+            if gsi_state.paused:
+                status = "PAUSED (DOTA)"
+            if (
+                gsi_state.updated_at is not None
+                and now - gsi_state.updated_at > self._resync_threshold_seconds
+            ):
+                status = "GSI STALE"
+        if last_heartbeat is not None and now - last_heartbeat > self._gsi_timeout_seconds:
+            status = "GSI OFFLINE"
+        return status
+
+    def next_change_at(
+        self,
+        gsi_state: GameStateSnapshot | None,
+        last_heartbeat: float | None = None,
+        now: float | None = None,
+    ) -> float | None:
+        """Возвращает момент (time.time()), когда HUD изменится без новых данных.
+
+        Учитывает смену секунды ручного таймера и пороги GSI STALE/OFFLINE;
+        всё остальное (bucket'ы, окна, макро) зависит только от секунды матча.
+        """
+        now = time.time() if now is None else now
+        candidates: list[float] = []
+        tick_at = self._scheduler.next_tick_at()
+        if tick_at is not None:
+            candidates.append(tick_at)
+        if (
+            gsi_state
+            and gsi_state.clock_time is not None
+            and gsi_state.updated_at is not None
+        ):
+            stale_at = gsi_state.updated_at + self._resync_threshold_seconds
+            if stale_at > now:
+                candidates.append(stale_at)
+        if last_heartbeat is not None:
+            offline_at = last_heartbeat + self._gsi_timeout_seconds
+            if offline_at > now:
+                candidates.append(offline_at)
+        return min(candidates, default=None)
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, TypeGuard
+
+logger = logging.getLogger(__name__)
+
+# Меняется при любом изменении формата кэша или разбора конфигов.
+CACHE_VERSION = 1
+CACHE_DIR_ENV = "D2HUB_CACHE_DIR"
+CACHE_DISABLE_ENV = "D2HUB_NO_CONFIG_CACHE"
+
+# Файл, изменённый позже (записи кэша − окно), проверяется по хэшу даже при
+# совпавших mtime/size: так правка в пределах точности mtime не теряется.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def code_stamp() -> tuple[object, ...]:
+    """Отпечаток кода, от которого зависит скомпилированный конфиг.
+
+    Складывается из CACHE_VERSION, версии пакета и Python, а также
+    mtime/размеров модулей config/ и domain/. В сборке PyInstaller
+    исходников нет (модули лежат в архиве внутри exe), поэтому вместо них
+    берётся mtime/размер исполняемого файла: после обновления приложения
+    кэш пересобирается сам.
+    """
+    from .. import __version__
+
+    stamp: list[object] = [CACHE_VERSION, __version__, *sys.version_info[:2]]
+    if getattr(sys, "frozen", False):
+        files = [Path(sys.executable)]
+    else:
+        package = Path(__file__).resolve().parent.parent
+        files = [
+            module
+            for directory in (package / "config", package / "domain")
+            for module in sorted(directory.glob("*.py"))
+        ]
+    for path in files:
+        stat = path.stat()
+        stamp.extend((stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
+def default_cache_dir() -> Path:
+    """Возвращает каталог кэша: D2HUB_CACHE_DIR или пользовательский кэш ОС."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / "d2hub" / "cache"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "d2hub"
+
+
+def cache_enabled() -> bool:
+    """Возвращает признак включённого кэша конфигов."""
+    return os.environ.get(CACHE_DISABLE_ENV, "") in ("", "0")
+
+
+@dataclass(frozen=True)
+class FileStamp:
+    """Отпечаток исходного файла и его разобранное содержимое."""
+
+    mtime_ns: int
+    size: int
+    digest: str
+    data: Any
+
+
+@dataclass
+class CacheEntry:
+    """Скомпилированный конфиг вместе с отпечатками всех исходных файлов."""
+
+    version: tuple[object, ...]
+    written_ns: int
+    files: dict[str, FileStamp] = field(default_factory=dict)
+    result: Any = None
+
+
+class SourceReader:
+    """Читает исходные файлы конфига, переиспользуя неизменённые из кэша.
+
+    Каждый файл читается не больше одного раза: если mtime и размер
+    совпадают с кэшем (и файл не «свежий»), содержимое берётся из кэша
+    без чтения; иначе файл читается, хэшируется и разбирается parse
+    только если хэш изменился.
+    """
+
+    def __init__(self, entry: CacheEntry | None, parse: Callable[[bytes], Any]) -> None:
+        """Создаёт читатель поверх записи кэша entry (или без кэша)."""
+        self._entry = entry
+        self._parse = parse
+        self.files: dict[str, FileStamp] = {}
+        self.changed: list[str] = []
+        self._seen: dict[str, FileStamp] = {}
+
+    def restart(self) -> None:
+        """Начинает новый проход: прочитанные файлы остаются в памяти, списки пустеют."""
+        self.files = {}
+        self.changed = []
+
+    def read(self, path: Path) -> Any:
+        """Возвращает разобранное содержимое файла path."""
+        key = str(path.resolve())
+        stamp = self._seen.get(key)
+        if stamp is not None:
+            self.files[key] = stamp
+            return stamp.data
+        stat = path.stat()
+        entry = self._entry
+        cached = entry.files.get(key) if entry else None
+        if (
+            entry is not None
+            and cached is not None
+            and cached.mtime_ns == stat.st_mtime_ns
+            and cached.size == stat.st_size
+            and stat.st_mtime_ns < entry.written_ns - _RACY_WINDOW_NS
+        ):
+            self.files[key] = self._seen[key] = cached
+            return cached.data
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached is not None and cached.digest == digest:
+            data = cached.data
+        else:
+            data = self._parse(raw)
+            self.changed.append(key)
+        stamp = FileStamp(stat.st_mtime_ns, stat.st_size, digest, data)
+        self.files[key] = self._seen[key] = stamp
+        return data
+
+
+class ConfigCache:
+    """Кэш скомпилированного конфига на диске (pickle, по файлу на конфиг)."""
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        """Создаёт кэш в каталоге cache_dir (по умолчанию — default_cache_dir())."""
+        self._dir = cache_dir or default_cache_dir()
+        self._code_stamp = code_stamp()
+
+    def path_for(self, config_path: Path) -> Path:
+        """Возвращает файл кэша для основного конфига config_path."""
+        name = hashlib.sha1(str(config_path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return self._dir / f"config-{name}.pickle"
+
+    def load(self, config_path: Path) -> CacheEntry | None:
+        """Читает запись кэша; повреждённый или устаревший кэш игнорируется."""
+        path = self.path_for(config_path)
+        try:
+            with path.open("rb") as handle:
+                entry = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as exc:
+            logger.debug("Ignoring config cache %s: %s", path, exc)
+            return None
+        if not _is_entry(entry) or entry.version != self._code_stamp:
+            return None
+        return entry
+
+    def store(self, config_path: Path, files: dict[str, FileStamp], result: Any) -> None:
+        """Атомарно записывает запись кэша; ошибки записи только логируются."""
+        path = self.path_for(config_path)
+        entry = CacheEntry(self._code_stamp, time.time_ns(), files, result)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("wb") as handle:
+                pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError, AttributeError, TypeError) as exc:
+            logger.warning("Failed to write config cache %s: %s", path, exc)
+            tmp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def is_fresh(entry: CacheEntry, reader: SourceReader) -> bool:
+        """Проверяет, что все файлы записи не изменились (читая каждый не более раза)."""
+        for key in entry.files:
+            try:
+                reader.read(Path(key))
+            except OSError:
+                return False
+        return not reader.changed
+
+
+def _is_entry(entry: object) -> TypeGuard[CacheEntry]:
+    # Pickle восстанавливает объект без __init__: запись старого формата
+    # (или чужой объект) может не иметь нужных полей — это промах кэша.
+    if not isinstance(entry, CacheEntry):
+        return False
+    attrs = vars(entry)
+    files = attrs.get("files")
+    return (
+        isinstance(attrs.get("version"), tuple)
+        and isinstance(attrs.get("written_ns"), int)
+        and isinstance(files, dict)
+        and all(
+            isinstance(stamp, FileStamp)
+            and {"mtime_ns", "size", "digest", "data"} <= vars(stamp).keys()
+            for stamp in files.values()
+        )
+    )
+
+
+__all__ = [
+    "CACHE_VERSION",
+    "CacheEntry",
+    "ConfigCache",
+    "FileStamp",
+    "SourceReader",
+    "cache_enabled",
+    "code_stamp",
+    "default_cache_dir",
+]
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import copy
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
+import yaml
+
+from .cache import ConfigCache, SourceReader, cache_enabled
 from .mapper import map_config
 from .models import AppConfig
-from .reader import read_config
 
 
 _MERGE_KEYS = {
@@ -17,6 +22,21 @@ _MERGE_KEYS = {
     "macro_hints",
 }
 
+# Ключи модулей, которые админка показывает вместе с основным файлом.
+_ADMIN_MERGE_KEYS = ("timeline", "rules", "windows", "danger_windows")
+
+
+@dataclass(frozen=True)
+class LoadedConfig:
+    """Конфигурация приложения и сырой YAML для админки."""
+
+    config: AppConfig
+    raw: dict[str, Any]
+
+
+def _parse_yaml(raw: bytes) -> Any:
+    return yaml.safe_load(raw.decode("utf-8")) or {}
+
 
 def _merge_module_data(base: dict, module: dict) -> dict:
     merged = dict(base)
@@ -28,22 +48,64 @@ def _merge_module_data(base: dict, module: dict) -> dict:
     return merged
 
 
-def load_config(path: Path) -> AppConfig:
-    """Загружает конфигурацию из YAML файла."""
-    data = read_config(path)
+def _build(path: Path, reader: SourceReader) -> LoadedConfig:
+    main = reader.read(path)
+    data = copy.deepcopy(main)
+    raw = copy.deepcopy(main)
     for module_path in data.get("modules", []) or []:
         module_full_path = (path.parent / str(module_path)).resolve()
-        module_data = read_config(module_full_path)
+        module_data = reader.read(module_full_path)
         if isinstance(module_data, dict):
-            data = _merge_module_data(data, module_data)
+            data = _merge_module_data(data, copy.deepcopy(module_data))
+            for key in _ADMIN_MERGE_KEYS:
+                if key in module_data:
+                    raw.setdefault(key, []).extend(copy.deepcopy(module_data[key]))
     macro_config = data.get("macro_config")
-    if macro_config and not data.get("macro_timings"):
+    if macro_config:
         macro_path = (path.parent / str(macro_config)).resolve()
-        macro_data = read_config(macro_path)
-        if isinstance(macro_data, list):
-            data["macro_timings"] = macro_data
-        elif isinstance(macro_data, dict):
-            data["macro_timings"] = macro_data.get("macro_timings", [])
-            if "macro_hints" in macro_data and not data.get("macro_hints"):
-                data["macro_hints"] = macro_data.get("macro_hints", [])
-    return map_config(data)
+        try:
+            macro_data = reader.read(macro_path)
+        except FileNotFoundError:
+            if not data.get("macro_timings"):
+                raise
+            macro_data = None
+        if not data.get("macro_timings"):
+            if isinstance(macro_data, list):
+                data["macro_timings"] = copy.deepcopy(macro_data)
+            elif isinstance(macro_data, dict):
+                data["macro_timings"] = copy.deepcopy(macro_data.get("macro_timings", []))
+                if "macro_hints" in macro_data and not data.get("macro_hints"):
+                    data["macro_hints"] = copy.deepcopy(macro_data.get("macro_hints", []))
+        if isinstance(macro_data, dict) and "macro_timings" in macro_data:
+            raw["macro_timings"] = copy.deepcopy(macro_data["macro_timings"])
+    return LoadedConfig(config=map_config(data), raw=raw)
+
+
+def load_config_bundle(path: Path, use_cache: bool = True) -> LoadedConfig:
+    """Загружает конфигурацию и сырой YAML, читая каждый файл один раз.
+
+    Результат кэшируется на диске вместе с mtime, размером и SHA-256 всех
+    исходных файлов (основной, модули, macro). Если ни один файл не
+    изменился, YAML не разбирается и правила не разворачиваются — конфиг
+    берётся из кэша целиком; иначе заново разбираются только изменённые
+    файлы.
+    """
+    if not (use_cache and cache_enabled()):
+        return _build(path, SourceReader(None, _parse_yaml))
+    cache = ConfigCache()
+    entry = cache.load(path)
+    reader = SourceReader(entry, _parse_yaml)
+    if entry is not None and isinstance(entry.result, LoadedConfig):
+        if cache.is_fresh(entry, reader):
+            if reader.files != entry.files:
+                cache.store(path, reader.files, entry.result)
+            return entry.result
+        reader.restart()
+    result = _build(path, reader)
+    cache.store(path, reader.files, result)
+    return result
+
+
+def load_config(path: Path, use_cache: bool = True) -> AppConfig:
+    """Загружает конфигурацию из YAML файла."""
+    return load_config_bundle(path, use_cache=use_cache).config
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Dict
 
-from ..domain.events import Bucket, mmss_to_seconds
+from ..domain.events import Bucket, RecurringRule, mmss_to_seconds
 from ..domain.macro_info import DEFAULT_MACRO_TIMINGS, MacroTiming
 from ..domain.warning_windows import WarningWindow
 from .models import (
@@ -41,17 +41,24 @@ def _text_from_obj(obj: dict) -> str:
     return "\n".join(items)
 
 
-def _expand_rules(rules_raw: list[dict], items_map: Dict[int, list[str]]) -> None:
+def _load_rules(rules_raw: list[dict]) -> list[RecurringRule]:
+    rules: list[RecurringRule] = []
     for rule in rules_raw:
-        start = mmss_to_seconds(str(rule["start"]))
-        until = mmss_to_seconds(str(rule["until"]))
-        every = int(rule["every_seconds"])
         items = _items_from_obj(rule)
-
-        timestamp = start
-        while timestamp <= until:
-            _merge_into(items_map, timestamp, items)
-            timestamp += every
+        every = int(rule["every_seconds"])
+        if not items or every <= 0:
+            continue
+        until_raw = rule.get("until")
+        rules.append(
+            RecurringRule(
+                start=mmss_to_seconds(str(rule["start"])),
+                every=every,
+                items=tuple(items),
+                until=None if until_raw in (None, "") else mmss_to_seconds(str(until_raw)),
+                roles=tuple(str(role) for role in (rule.get("roles") or [])),
+            )
+        )
+    return rules
 
 
 def _seconds_from_value(raw: object) -> int:
@@ -108,6 +115,7 @@ def _load_hotkeys(raw: dict | None) -> HotkeysConfig:
     return HotkeysConfig(
         lock=str(raw.get("lock", defaults.lock)),
         admin=str(raw.get("admin", defaults.admin)),
+        profile=str(raw.get("profile", defaults.profile) or ""),
     )
 
 
@@ -133,7 +141,7 @@ def map_config(data: dict) -> AppConfig:
     for event in (data.get("events", []) or []):
         timestamp = mmss_to_seconds(str(event["at"]))
         _merge_into(buckets_map, timestamp, _items_from_obj(event))
-    _expand_rules((data.get("rules", []) or []), buckets_map)
+    rules = _load_rules(data.get("rules", []) or [])
 
     buckets = [
         Bucket(t=timestamp, items=items, roles=roles_map.get(timestamp, []))
@@ -190,6 +198,17 @@ def map_config(data: dict) -> AppConfig:
     general_config = GeneralConfig(
         dota_path=str(general_raw.get("dota_path", "")),
         gsi_port=int(general_raw.get("gsi_port", 4000)),
+        gsi_backend=str(general_raw.get("gsi_backend", "aiohttp")).lower(),
+        gsi_json=str(general_raw.get("gsi_json", "auto")).lower(),
+        gsi_record_path=str(general_raw.get("gsi_record_path", "") or ""),
+        loop_mode=str(general_raw.get("loop_mode", "poll")).lower(),
+        loop_interval_ms=int(general_raw.get("loop_interval_ms", 200)),
+        loop_max_sleep_ms=int(general_raw.get("loop_max_sleep_ms", 500)),
+        profile_hz=int(general_raw.get("profile_hz", 100)),
+        profile_dir=str(general_raw.get("profile_dir", "profiles") or "profiles"),
+        profile_format=str(general_raw.get("profile_format", "speedscope")).lower(),
+        profile_max_seconds=int(general_raw.get("profile_max_seconds", 300)),
+        startup=str(general_raw.get("startup", "lazy")).lower(),
     )
 
     return AppConfig(
@@ -200,6 +219,7 @@ def map_config(data: dict) -> AppConfig:
         windows=windows,
         macro_timings=_load_macro_timings(data.get("macro_timings")),
         presenter=presenter,
+        rules=rules,
         build_integration=build_config,
         general=general_config,
     )
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import List
 
-from ..domain.events import Bucket
+from ..domain.events import Bucket, RecurringRule
 from ..domain.macro_info import MacroTiming
 from ..domain.warning_windows import WarningWindow
 
@@ -31,6 +31,7 @@ class HudConfig:
     macro_line_spacing: int = 4
     macro_bar_height: int = 24
     macro_show_title: bool = True
+    animation_fps: int = 60
 
 
 @dataclass(frozen=True)
@@ -39,6 +40,7 @@ class HotkeysConfig:
 
     lock: str = "F7"
     admin: str = "DELETE"
+    profile: str = ""
 
 
 @dataclass(frozen=True)
@@ -57,6 +59,7 @@ class LogIntegrationConfig:
     debounce_seconds: float = 5.0
     resync_threshold_seconds: int = 6
     gsi_timeout_seconds: int = 6
+    watch_backend: str = "auto"
 
 
 @dataclass(frozen=True)
@@ -74,6 +77,17 @@ class GeneralConfig:
 
     dota_path: str = ""
     gsi_port: int = 4000
+    gsi_backend: str = "aiohttp"
+    gsi_json: str = "auto"
+    gsi_record_path: str = ""
+    loop_mode: str = "poll"
+    loop_interval_ms: int = 200
+    loop_max_sleep_ms: int = 500
+    profile_hz: int = 100
+    profile_dir: str = "profiles"
+    profile_format: str = "speedscope"
+    profile_max_seconds: int = 300
+    startup: str = "lazy"
 
 
 @dataclass(frozen=True)
@@ -87,6 +101,7 @@ class AppConfig:
     windows: List[WarningWindow]
     macro_timings: List[MacroTiming]
     presenter: "PresenterConfig"
+    rules: List[RecurringRule] = field(default_factory=list)
     build_integration: BuildIntegrationConfig = field(default_factory=BuildIntegrationConfig)
     general: GeneralConfig = field(default_factory=GeneralConfig)
 
@@ -98,3 +113,4 @@ class PresenterConfig:
     max_lines: int = 6
     macro_max_lines: int = 6
     macro_hints: List[str] = field(default_factory=list)
+    frame_table_horizon_seconds: int = 90 * 60
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -12,6 +13,49 @@ class Bucket:
     roles: list[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class RecurringRule:
+    """Повторяющееся событие: start, start + every, ... до until включительно.
+
+    Вхождения не разворачиваются в bucket'ы, а вычисляются арифметически,
+    поэтому правило занимает O(1) памяти при любой длине матча; until=None
+    означает правило без конца.
+    """
+
+    start: int
+    every: int
+    items: tuple[str, ...]
+    until: Optional[int] = None
+    roles: tuple[str, ...] = ()
+
+    def applies_to(self, role: Optional[str]) -> bool:
+        """Проверяет, показывается ли правило роли (None — все роли)."""
+        return role is None or not self.roles or role in self.roles
+
+    def occurs_at(self, t: int) -> bool:
+        """Проверяет, срабатывает ли правило ровно в момент t."""
+        if t < self.start or (self.until is not None and t > self.until):
+            return False
+        return (t - self.start) % self.every == 0
+
+    def last_at_or_before(self, t: int) -> Optional[int]:
+        """Возвращает последнее вхождение не позже t."""
+        end = t if self.until is None else min(t, self.until)
+        if end < self.start:
+            return None
+        return end - (end - self.start) % self.every
+
+    def first_after(self, t: int) -> Optional[int]:
+        """Возвращает первое вхождение строго после t."""
+        if t < self.start:
+            candidate = self.start
+        else:
+            candidate = t + self.every - (t - self.start) % self.every
+        if self.until is not None and candidate > self.until:
+            return None
+        return candidate
+
+
 def mmss_to_seconds(value: str) -> int:
     """Преобразует формат MM:SS в секунды."""
     normalized = value.strip()
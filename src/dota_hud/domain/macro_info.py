@@ -1,9 +1,51 @@
 from __future__ import annotations
 
+import importlib
+from array import array
 from dataclasses import dataclass
+from typing import Any, Sequence
 
 from .events import format_mmss
 
+# NumPy необязателен и импортируется при первом пакетном расчёте:
+# на старте приложения он не нужен. False — ещё не загружали, None — нет.
+_np: Any = False
+
+
+def _numpy() -> Any:
+    global _np
+    if _np is False:
+        try:
+            _np = importlib.import_module("numpy")
+        except ImportError:  # pragma: no cover - NumPy необязателен
+            _np = None
+    return _np
+
+
+# Коды статуса макро-тайминга.
+MACRO_WAITING = 0  # первый спавн ещё не наступил
+MACRO_UP = 1  # тайминг активен (окно UP)
+MACRO_COOLDOWN = 2  # ожидание следующего спавна
+
+
+def _evaluate(
+    first_spawn: int,
+    interval: int,
+    up_window: int,
+    elapsed: int,
+) -> tuple[int, int, float]:
+    """Возвращает (код статуса, секунд до спавна, прогресс 0..1)."""
+    if elapsed < first_spawn:
+        progress = max(0.0, min(1.0, elapsed / first_spawn)) if first_spawn else 1.0
+        return MACRO_WAITING, first_spawn - elapsed, progress
+    if interval <= 0:
+        return MACRO_UP, 0, 1.0
+    since_last = (elapsed - first_spawn) % interval
+    progress = max(0.0, min(1.0, since_last / interval))
+    if since_last <= up_window:
+        return MACRO_UP, 0, progress
+    return MACRO_COOLDOWN, interval - since_last, progress
+
 
 @dataclass(frozen=True)
 class MacroTiming:
@@ -17,23 +59,94 @@ class MacroTiming:
 
     def status(self, elapsed: int) -> str:
         """Возвращает строковый статус для HUD."""
-        if elapsed < self.first_spawn:
-            return format_mmss(self.first_spawn - elapsed)
-        if self.interval <= 0:
-            return "UP"
-        since_last = (elapsed - self.first_spawn) % self.interval
-        if since_last <= self.up_window:
-            return "UP"
-        return format_mmss(self.interval - since_last)
+        code, remaining, _ = _evaluate(
+            self.first_spawn, self.interval, self.up_window, elapsed
+        )
+        return "UP" if code == MACRO_UP else format_mmss(remaining)
 
     def progress(self, elapsed: int) -> float:
         """Возвращает прогресс до следующего спавна (0..1)."""
-        if elapsed < self.first_spawn:
-            return max(0.0, min(1.0, elapsed / self.first_spawn)) if self.first_spawn else 1.0
-        if self.interval <= 0:
-            return 1.0
-        since_last = (elapsed - self.first_spawn) % self.interval
-        return max(0.0, min(1.0, since_last / self.interval))
+        return _evaluate(self.first_spawn, self.interval, self.up_window, elapsed)[2]
+
+
+@dataclass(frozen=True)
+class MacroBatch:
+    """Результат пакетного расчёта: строки — тайминги, столбцы — моменты."""
+
+    codes: Any
+    remaining: Any
+    progress: Any
+
+    def status(self, timing_index: int, elapsed_index: int) -> str:
+        """Возвращает строковый статус так же, как MacroTiming.status."""
+        if int(self.codes[timing_index][elapsed_index]) == MACRO_UP:
+            return "UP"
+        return format_mmss(int(self.remaining[timing_index][elapsed_index]))
+
+
+def evaluate_macro_batch(
+    elapsed: Sequence[int],
+    timings: Sequence[MacroTiming],
+) -> MacroBatch:
+    """Считает статусы и прогресс всех таймингов для набора моментов.
+
+    Тайминги раскладываются в колонки (first_spawn, interval, up_window).
+    Если установлен NumPy, расчёт векторизован и возвращает двумерные
+    массивы; иначе возвращаются списки строк array.array с тем же
+    содержимым.
+    """
+    if _numpy() is not None:
+        return _evaluate_numpy(elapsed, timings)
+    codes: list[array[int]] = []
+    remaining: list[array[int]] = []
+    progress: list[array[float]] = []
+    for timing in timings:
+        code_row: array[int] = array("b")
+        remaining_row: array[int] = array("q")
+        progress_row: array[float] = array("d")
+        for value in elapsed:
+            code, left, share = _evaluate(
+                timing.first_spawn, timing.interval, timing.up_window, int(value)
+            )
+            code_row.append(code)
+            remaining_row.append(left)
+            progress_row.append(share)
+        codes.append(code_row)
+        remaining.append(remaining_row)
+        progress.append(progress_row)
+    return MacroBatch(codes=codes, remaining=remaining, progress=progress)
+
+
+def _evaluate_numpy(elapsed: Sequence[int], timings: Sequence[MacroTiming]) -> MacroBatch:
+    np = _np
+    moments = np.asarray(elapsed, dtype=np.int64)[np.newaxis, :]
+    first_spawn = np.array([t.first_spawn for t in timings], dtype=np.int64)[:, np.newaxis]
+    interval = np.array([t.interval for t in timings], dtype=np.int64)[:, np.newaxis]
+    up_window = np.array([t.up_window for t in timings], dtype=np.int64)[:, np.newaxis]
+
+    waiting = moments < first_spawn
+    recurring = interval > 0
+    safe_interval = np.where(recurring, interval, 1)
+    since_last = (moments - first_spawn) % safe_interval
+    up = ~waiting & (~recurring | (since_last <= up_window))
+
+    codes = np.where(waiting, MACRO_WAITING, np.where(up, MACRO_UP, MACRO_COOLDOWN))
+    remaining = np.where(
+        waiting,
+        first_spawn - moments,
+        np.where(up, 0, interval - since_last),
+    )
+    safe_first_spawn = np.where(first_spawn > 0, first_spawn, 1)
+    progress = np.where(
+        waiting,
+        np.where(first_spawn > 0, moments / safe_first_spawn, 1.0),
+        np.where(recurring, since_last / safe_interval, 1.0),
+    )
+    return MacroBatch(
+        codes=codes.astype(np.int8),
+        remaining=remaining,
+        progress=np.clip(progress, 0.0, 1.0),
+    )
 
 
 DEFAULT_MACRO_TIMINGS: tuple[MacroTiming, ...] = (
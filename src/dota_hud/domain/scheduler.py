@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import time
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Optional
 
-from .events import Bucket
+from .events import Bucket, RecurringRule
+from .roles import Role
 
 
 @dataclass
@@ -17,24 +19,124 @@ class TickState:
     after_event: Optional[Bucket]
 
 
-class Scheduler:
-    """Планировщик игровых событий, учитывающий ручной и внешний таймеры."""
+# Сколько объединённых bucket'ов (bucket + правила) держит поток.
+_MERGED_CACHE_SIZE = 64
+
+
+class _BucketStream:
+    """Отсортированный поток bucket'ов одной роли с курсором.
+
+    Повторяющиеся правила роли хранятся символически: ближайшие вхождения
+    считаются арифметикой по каждому правилу и сливаются с bucket'ами
+    потока, а объединённые bucket'ы кэшируются на несколько последних секунд.
+    """
+
+    __slots__ = ("buckets", "times", "cursor", "rules", "_merged")
+
+    def __init__(
+        self,
+        buckets: Iterable[Bucket],
+        rules: Iterable[RecurringRule] = (),
+    ) -> None:
+        self.buckets: tuple[Bucket, ...] = tuple(buckets)
+        self.times: tuple[int, ...] = tuple(bucket.t for bucket in self.buckets)
+        self.cursor = 0
+        self.rules: tuple[RecurringRule, ...] = tuple(rules)
+        self._merged: dict[int, Optional[Bucket]] = {}
+
+    def seek(self, elapsed: int) -> int:
+        cursor = self.cursor
+        times = self.times
+        # Быстрый путь: время не пересекло ни одной границы bucket'ов.
+        if (cursor == 0 or times[cursor - 1] <= elapsed) and (
+            cursor == len(times) or elapsed < times[cursor]
+        ):
+            return cursor
+        self.cursor = bisect_right(times, elapsed)
+        return self.cursor
+
+    def at(self, index: int) -> Optional[Bucket]:
+        if 0 <= index < len(self.buckets):
+            return self.buckets[index]
+        return None
+
+    def last_at_or_before(self, elapsed: int, cursor: int) -> Optional[Bucket]:
+        """Последнее событие не позже elapsed; cursor — результат seek(elapsed)."""
+        best = self.times[cursor - 1] if cursor > 0 else None
+        for rule in self.rules:
+            occurrence = rule.last_at_or_before(elapsed)
+            if occurrence is not None and (best is None or occurrence > best):
+                best = occurrence
+        return None if best is None else self._event_at(best)
+
+    def first_after(self, t: int) -> Optional[Bucket]:
+        """Первое событие строго после t."""
+        index = bisect_right(self.times, t)
+        best = self.times[index] if index < len(self.times) else None
+        for rule in self.rules:
+            occurrence = rule.first_after(t)
+            if occurrence is not None and (best is None or occurrence < best):
+                best = occurrence
+        return None if best is None else self._event_at(best)
+
+    def _event_at(self, t: int) -> Optional[Bucket]:
+        merged = self._merged
+        if t in merged:
+            return merged[t]
+        index = bisect_right(self.times, t) - 1
+        bucket = self.buckets[index] if index >= 0 and self.times[index] == t else None
+        rule_items = [item for rule in self.rules if rule.occurs_at(t) for item in rule.items]
+        if rule_items:
+            if bucket is None:
+                bucket = Bucket(t=t, items=rule_items)
+            else:
+                bucket = Bucket(t=t, items=[*bucket.items, *rule_items], roles=bucket.roles)
+        if len(merged) >= _MERGED_CACHE_SIZE:
+            merged.clear()
+        merged[t] = bucket
+        return bucket
+
 
-    def __init__(self, buckets: list[Bucket]) -> None:
-        """Создаёт планировщик с базовым списком событий."""
-        self._base = list(buckets)
+class Scheduler:
+    """Планировщик игровых событий, учитывающий ручной и внешний таймеры.
+
+    События хранятся в неизменяемых отсортированных потоках: общий поток
+    для режима без роли и по потоку на каждую роль, куда входят bucket'ы
+    этой роли вместе с bucket'ами без ограничения по ролям. Текущая позиция
+    в потоке — курсор, перемотка в любую сторону выполняется бинарным
+    поиском без копирования, а смена роли — выбором другого потока.
+    Повторяющиеся правила не разворачиваются: поток роли хранит свои
+    правила и вычисляет их вхождения на лету, так что память и время тика
+    зависят от числа правил, а не от длины матча.
+    """
+
+    def __init__(
+        self,
+        buckets: list[Bucket],
+        rules: Iterable[RecurringRule] = (),
+    ) -> None:
+        """Создаёт планировщик с базовым списком событий и правилами."""
+        base = sorted(buckets, key=lambda bucket: bucket.t)
+        self._base: tuple[Bucket, ...] = tuple(base)
+        self._rules: tuple[RecurringRule, ...] = tuple(rules)
+        self._streams: dict[Optional[str], _BucketStream] = {
+            None: _BucketStream(base, self._rules)
+        }
+        known_roles = {role.value for role in Role}
+        for bucket in base:
+            known_roles.update(bucket.roles)
+        for rule in self._rules:
+            known_roles.update(rule.roles)
+        for role in known_roles:
+            self._streams[role] = self._build_stream(role)
         self._external_elapsed: Optional[int] = None
-        self._current: Optional[Bucket] = None
-        self._last_elapsed = 0
+        self._start_at: Optional[float] = None
         self.reset()
 
     def start(self) -> None:
         """Запускает ручной таймер."""
         self._external_elapsed = None
         self._start_at = time.time()
-        self._buckets = list(self._base)
-        self._current = None
-        self._last_elapsed = 0
 
     def stop(self) -> None:
         """Останавливает ручной таймер."""
@@ -44,9 +146,6 @@ class Scheduler:
         """Сбрасывает таймер и события."""
         self._start_at = None
         self._external_elapsed = None
-        self._buckets = list(self._base)
-        self._current = None
-        self._last_elapsed = 0
 
     @property
     def is_running(self) -> bool:
@@ -55,12 +154,6 @@ class Scheduler:
 
     def set_external_elapsed(self, seconds: int) -> None:
         """Устанавливает текущее игровое время извне (GSI)."""
-        if seconds < self.elapsed():
-            self._buckets = list(self._base)
-            self._current = None
-        if self._external_elapsed is None:
-            self._buckets = list(self._base)
-            self._current = None
         self._external_elapsed = max(0, int(seconds))
         self._start_at = None
 
@@ -74,43 +167,55 @@ class Scheduler:
             return self._external_elapsed
         return 0 if self._start_at is None else int(time.time() - self._start_at)
 
-    @staticmethod
-    def _filter_bucket(bucket: Optional[Bucket], role: Optional[str]) -> Optional[Bucket]:
-        """Фильтрует bucket по роли."""
-        if bucket is None or role is None or not bucket.roles:
-            return bucket
-        if role in bucket.roles:
-            return bucket
-        return None
+    def next_tick_at(self) -> Optional[float]:
+        """Возвращает момент (time.time()) смены секунды ручного таймера."""
+        if self._external_elapsed is not None or self._start_at is None:
+            return None
+        return self._start_at + self.elapsed() + 1
+
+    def seek(self, elapsed: int, role: Optional[str] = None) -> int:
+        """Перемещает курсор потока роли на момент elapsed и возвращает его."""
+        return self._stream(role).seek(elapsed)
+
+    def _build_stream(self, role: str) -> _BucketStream:
+        return _BucketStream(
+            (bucket for bucket in self._base if not bucket.roles or role in bucket.roles),
+            (rule for rule in self._rules if rule.applies_to(role)),
+        )
+
+    def _stream(self, role: Optional[str]) -> _BucketStream:
+        stream = self._streams.get(role)
+        if stream is None:
+            stream = self._build_stream(str(role))
+            self._streams[role] = stream
+        return stream
 
     def tick(self, role: Optional[str] = None) -> TickState:
         """Вычисляет новое состояние таймингов."""
         elapsed = self.elapsed()
+        stream = self._stream(role)
+
+        if stream.rules:
+            return self._tick_with_rules(elapsed, stream)
 
         if elapsed == 0 and not self.is_running:
-            next_event = self._buckets[0] if self._buckets else None
-            after_event = self._buckets[1] if len(self._buckets) > 1 else None
-            return TickState(
-                0,
-                None,
-                self._filter_bucket(next_event, role),
-                self._filter_bucket(after_event, role),
-            )
-
-        if elapsed < self._last_elapsed:
-            self._buckets = list(self._base)
-            self._current = None
-
-        while self._buckets and self._buckets[0].t <= elapsed:
-            self._current = self._buckets.pop(0)
-
-        next_event = self._buckets[0] if self._buckets else None
-        after_event = self._buckets[1] if len(self._buckets) > 1 else None
-        self._last_elapsed = elapsed
+            return TickState(0, None, stream.at(0), stream.at(1))
 
+        cursor = stream.seek(elapsed)
         return TickState(
             elapsed,
-            self._filter_bucket(self._current, role),
-            self._filter_bucket(next_event, role),
-            self._filter_bucket(after_event, role),
+            stream.at(cursor - 1),
+            stream.at(cursor),
+            stream.at(cursor + 1),
         )
+
+    def _tick_with_rules(self, elapsed: int, stream: _BucketStream) -> TickState:
+        if elapsed == 0 and not self.is_running:
+            first = stream.first_after(-1)
+            after = stream.first_after(first.t) if first else None
+            return TickState(0, None, first, after)
+
+        now = stream.last_at_or_before(elapsed, stream.seek(elapsed))
+        next_event = stream.first_after(elapsed)
+        after = stream.first_after(next_event.t) if next_event else None
+        return TickState(elapsed, now, next_event, after)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
+from typing import Sequence
 
 
 @dataclass(frozen=True)
@@ -14,9 +16,74 @@ class WarningWindow:
     priority: int = 0
 
 
+def _sort_active(
+    active: list[tuple[int, WarningWindow]],
+) -> tuple[WarningWindow, ...]:
+    active.sort(key=lambda item: (-item[1].priority, item[1].from_t, item[0]))
+    return tuple(window for _, window in active)
+
+
+class WarningWindowIndex:
+    """Индекс окон предупреждений по точкам изменения.
+
+    Границы всех окон образуют отсортированный массив точек, между которыми
+    набор активных окон постоянен. Для каждого отрезка набор вычисляется
+    заранее, поэтому поиск стоит O(log n), а повторный запрос внутри того же
+    отрезка возвращает закэшированный результат.
+    """
+
+    def __init__(self, windows: Sequence[WarningWindow]) -> None:
+        """Строит индекс по списку окон."""
+        starts: dict[int, list[int]] = {}
+        ends: dict[int, list[int]] = {}
+        for index, window in enumerate(windows):
+            if window.to_t < window.from_t:
+                continue
+            starts.setdefault(window.from_t, []).append(index)
+            ends.setdefault(window.to_t + 1, []).append(index)
+
+        points = sorted(starts.keys() | ends.keys())
+        segments: list[tuple[WarningWindow, ...]] = []
+        active: dict[int, WarningWindow] = {}
+        for point in points:
+            for index in ends.get(point, ()):
+                active.pop(index, None)
+            for index in starts.get(point, ()):
+                active[index] = windows[index]
+            segments.append(_sort_active(list(active.items())))
+
+        self._points: tuple[int, ...] = tuple(points)
+        self._segments: tuple[tuple[WarningWindow, ...], ...] = tuple(segments)
+        self._cached_from = 0
+        self._cached_to = -1
+        self._cached: tuple[WarningWindow, ...] = ()
+
+    def active(self, elapsed: int) -> tuple[WarningWindow, ...]:
+        """Возвращает активные окна, отсортированные по приоритету."""
+        if self._cached_from <= elapsed < self._cached_to:
+            return self._cached
+        points = self._points
+        position = bisect_right(points, elapsed) - 1
+        if position < 0:
+            self._cached_from = -(1 << 62)
+            self._cached_to = points[0] if points else 1 << 62
+            self._cached = ()
+        else:
+            self._cached_from = points[position]
+            self._cached_to = (
+                points[position + 1] if position + 1 < len(points) else 1 << 62
+            )
+            self._cached = self._segments[position]
+        return self._cached
+
+
 class WarningWindowService:
     """Определяет активные предупреждения по времени."""
 
+    def build_index(self, windows: Sequence[WarningWindow]) -> WarningWindowIndex:
+        """Строит индекс окон для быстрых запросов на каждом тике."""
+        return WarningWindowIndex(windows)
+
     def active_windows(self, elapsed: int, windows: list[WarningWindow]) -> list[WarningWindow]:
         """Возвращает список активных окон предупреждений."""
         active = [
@@ -24,10 +91,9 @@ class WarningWindowService:
             for index, window in enumerate(windows)
             if window.from_t <= elapsed <= window.to_t
         ]
-        active.sort(key=lambda item: (-item[1].priority, item[1].from_t, item[0]))
-        return [window for _, window in active]
+        return list(_sort_active(active))
 
-    def warning_level(self, active_windows: list[WarningWindow]) -> str:
+    def warning_level(self, active_windows: Sequence[WarningWindow]) -> str:
         """Возвращает уровень предупреждения по активным окнам."""
         for level in ("danger", "warn", "info"):
             if any(window.level == level for window in active_windows):
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import gc
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .application.app_controller import AppController
+from .application.infra_provider import (
+    GsiStateStore,
+    HeadlessInfraProvider,
+    InfraProvider,
+    InfraServices,
+    NullHotkeys,
+)
+from .config.models import AppConfig
+from .infrastructure.gsi_state import GSIState
+from .ui.headless import HeadlessHud
+
+logger = logging.getLogger(__name__)
+
+# Состояние GSI с моментом получения (секунды записи).
+TimedState = tuple[float, GSIState]
+
+
+@dataclass(frozen=True)
+class HeadlessReport:
+    """Итог прогона конвейера HUD без окна."""
+
+    inputs: int
+    frames: int
+    seconds: float
+    tick_us_mean: float
+    tick_us_p99: float
+    retained_blocks_per_frame: float
+    gc_gen0_per_1000_frames: float
+
+    @property
+    def frames_per_second(self) -> float:
+        """Возвращает число отрисованных кадров в секунду."""
+        return self.frames / self.seconds if self.seconds > 0 else float("inf")
+
+    def format(self) -> str:
+        """Возвращает отчёт в виде текста."""
+        return (
+            f"inputs: {self.inputs}, frames: {self.frames}, {self.seconds:.3f} s "
+            f"({self.frames_per_second:.0f} frames/s)\n"
+            f"tick: mean {self.tick_us_mean:.1f} us, p99 {self.tick_us_p99:.1f} us\n"
+            f"retained blocks/frame: {self.retained_blocks_per_frame:.2f}, "
+            f"gen0 GC/1000 frames: {self.gc_gen0_per_1000_frames:.2f}"
+        )
+
+
+class _NullGsiServer:
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class _StoreInfraProvider(InfraProvider):
+    """Инфраструктура для прогонов: только хранилище GSI, без сети и клавиатуры."""
+
+    def __init__(self, store: GsiStateStore) -> None:
+        self._store = store
+
+    def build(self, config: AppConfig) -> InfraServices:
+        return InfraServices(
+            gsi_state_store=self._store,
+            gsi_server=_NullGsiServer(),
+            hotkeys=NullHotkeys(),
+            log_watcher=None,
+        )
+
+
+def synthetic_states(seconds: int, start: int = 0) -> Iterator[TimedState]:
+    """Синтетический матч: по одному состоянию GSI на игровую секунду."""
+    for second in range(start, start + seconds):
+        yield float(second), GSIState(
+            clock_time=second,
+            game_state="DOTA_GAMERULES_STATE_GAME_IN_PROGRESS",
+            updated_at=time.time(),
+        )
+
+
+def recorded_states(path: Path, json_backend: str = "auto") -> Iterator[TimedState]:
+    """Состояния из записи GsiRecorder; некорректные тела пропускаются."""
+    from .infrastructure.gsi_parser import GsiPayloadParser
+    from .infrastructure.gsi_recorder import read_recording
+
+    parser = GsiPayloadParser(decoder=json_backend)
+    for record in read_recording(path):
+        try:
+            yield record.timestamp, parser.parse(record.raw)
+        except ValueError:
+            continue
+
+
+def run_benchmark(
+    config: AppConfig,
+    source: Iterable[TimedState],
+    role: str | None = None,
+    hud: HeadlessHud | None = None,
+) -> HeadlessReport:
+    """Прогоняет источник состояний через весь конвейер как можно быстрее.
+
+    Часы HUD виртуальные: между входами они сдвигаются на интервал из
+    источника, поэтому таймеры контроллера (poll/event) срабатывают так же,
+    как вживую, но без ожидания. Тик — подача одного состояния вместе со
+    всеми вызванными им циклами HUD.
+    """
+    hud = hud or HeadlessHud(virtual_clock=True)
+    store = GsiStateStore()
+    controller = AppController(config, hud=hud, infra_provider=_StoreInfraProvider(store))
+    if role:
+        controller.set_role(role)
+    controller.start_hotkeys_and_loop()
+    hud.run_pending()
+
+    frames_before = hud.frames
+    durations: list[float] = []
+    previous_ts: float | None = None
+    gc_before = gc.get_stats()[0]["collections"]
+    blocks_before = sys.getallocatedblocks()
+    started = time.perf_counter()
+    for timestamp, state in source:
+        advance_ms = 0.0 if previous_ts is None else (timestamp - previous_ts) * 1000.0
+        previous_ts = timestamp
+        tick_started = time.perf_counter()
+        store.update(state)
+        store.mark_heartbeat()
+        hud.run_pending(advance_ms)
+        durations.append(time.perf_counter() - tick_started)
+    seconds = time.perf_counter() - started
+    blocks_after = sys.getallocatedblocks()
+    gc_after = gc.get_stats()[0]["collections"]
+
+    frames = hud.frames - frames_before
+    durations.sort()
+    per_frame = max(frames, 1)
+    return HeadlessReport(
+        inputs=len(durations),
+        frames=frames,
+        seconds=seconds,
+        tick_us_mean=sum(durations) / len(durations) * 1e6 if durations else 0.0,
+        tick_us_p99=durations[int(len(durations) * 0.99)] * 1e6 if durations else 0.0,
+        retained_blocks_per_frame=(blocks_after - blocks_before) / per_frame,
+        gc_gen0_per_1000_frames=(gc_after - gc_before) * 1000.0 / per_frame,
+    )
+
+
+def run_replay_realtime(
+    config: AppConfig,
+    path: Path,
+    speed: float,
+    hud: HeadlessHud | None = None,
+) -> tuple[int, float]:
+    """Проигрывает запись в реальном времени (или N×); возвращает (кадры, секунды)."""
+    from .infrastructure.gsi_replay import replay_to_store
+
+    hud = hud or HeadlessHud()
+    store = GsiStateStore()
+    controller = AppController(config, hud=hud, infra_provider=_StoreInfraProvider(store))
+
+    def feed() -> None:
+        try:
+            replay_to_store(path, store, speed, json_backend=config.general.gsi_json)
+        finally:
+            hud.post(hud.close)
+
+    controller.start_hotkeys_and_loop()
+    started = time.perf_counter()
+    threading.Thread(target=feed, daemon=True).start()
+    hud.run()
+    return hud.frames, time.perf_counter() - started
+
+
+def run_live(config: AppConfig) -> None:
+    """Запускает HUD без окна с настоящим GSI-сервером (до Ctrl+C)."""
+    hud = HeadlessHud()
+    controller = AppController(config, hud=hud, infra_provider=HeadlessInfraProvider())
+    logger.info("Headless HUD started, GSI port %s", config.general.gsi_port)
+    try:
+        controller.run()
+    except KeyboardInterrupt:
+        logger.info("Headless HUD stopped")
+
+
+__all__ = [
+    "HeadlessReport",
+    "recorded_states",
+    "run_benchmark",
+    "run_live",
+    "run_replay_realtime",
+    "synthetic_states",
+]
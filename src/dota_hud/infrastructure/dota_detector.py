@@ -1,25 +1,42 @@
 from __future__ import annotations
 
 import logging
-import subprocess
 import threading
 from typing import Callable, Optional
 
+from .process_backends import ProcessBackend, build_process_backend
+
 logger = logging.getLogger(__name__)
 
 PROCESS_NAME = "dota2.exe"
 
+# Шаг ожидания завершения процесса: не дольше этого stop() ждёт поток.
+_EXIT_WAIT_STEP = 0.5
+
 
 class DotaDetector:
+    """Следит за процессом Dota 2 и сообщает о его запуске и закрытии.
+
+    Процессы перечисляются бэкендом без запуска внешних программ
+    (см. build_process_backend); пока Dota запущена, поток ждёт
+    завершения процесса событием ОС (pidfd, хэндл процесса), а не
+    опросом, если бэкенд это умеет.
+    """
+
     def __init__(
         self,
         process_name: str = PROCESS_NAME,
-        poll_interval: float = 5.0,
+        poll_interval: float | None = None,
         on_found: Callable[[], None] | None = None,
         on_lost: Callable[[], None] | None = None,
+        backend: ProcessBackend | None = None,
     ) -> None:
+        """Создаёт детектор; poll_interval по умолчанию берётся у бэкенда."""
+        self._backend = backend or build_process_backend()
         self._process_name = process_name
-        self._poll_interval = poll_interval
+        self._poll_interval = (
+            poll_interval if poll_interval is not None else self._backend.poll_interval
+        )
         self._on_found = on_found
         self._on_lost = on_lost
         self._was_running = False
@@ -27,29 +44,35 @@ class DotaDetector:
         self._thread: Optional[threading.Thread] = None
 
     def is_running(self) -> bool:
-        try:
-            result = subprocess.run(
-                ["tasklist", "/FI", f"IMAGENAME eq {self._process_name}"],
-                capture_output=True, text=True, timeout=5,
-            )
-            return self._process_name.lower() in result.stdout.lower()
-        except Exception:
-            logger.debug("Failed to check process %s", self._process_name, exc_info=True)
-            return False
+        """Возвращает признак запущенного процесса."""
+        return self._find() is not None
 
     def start(self) -> None:
+        """Запускает наблюдение в фоновом потоке."""
         self._stop_event.clear()
-        self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._thread = threading.Thread(
+            target=self._poll_loop, name="DotaDetector", daemon=True
+        )
         self._thread.start()
 
     def stop(self) -> None:
+        """Останавливает наблюдение и освобождает ресурсы бэкенда."""
         self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=10)
+        self._backend.close()
+
+    def _find(self) -> Optional[int]:
+        try:
+            return self._backend.find(self._process_name)
+        except Exception:
+            logger.debug("Failed to check process %s", self._process_name, exc_info=True)
+            return None
 
     def _poll_loop(self) -> None:
         while not self._stop_event.is_set():
-            running = self.is_running()
+            pid = self._find()
+            running = pid is not None
             if running and not self._was_running:
                 logger.info("Dota 2 detected")
                 if self._on_found:
@@ -59,4 +82,22 @@ class DotaDetector:
                 if self._on_lost:
                     self._on_lost()
             self._was_running = running
-            self._stop_event.wait(timeout=self._poll_interval)
+            if not (pid is not None and self._wait_exit(pid)):
+                self._stop_event.wait(timeout=self._poll_interval)
+
+    def _wait_exit(self, pid: int) -> bool:
+        """Ждёт завершения процесса; False если бэкенд не умеет ждать pid."""
+        wait_exit = getattr(self._backend, "wait_exit", None)
+        if wait_exit is None or pid < 0:
+            return False
+        while not self._stop_event.is_set():
+            try:
+                exited = wait_exit(pid, _EXIT_WAIT_STEP)
+            except Exception:
+                logger.debug("Failed to wait for process %s", pid, exc_info=True)
+                return False
+            if exited is None:
+                return False
+            if exited:
+                return True
+        return True
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+WATCH_BACKENDS = ("auto", "inotify", "win32", "poll")
+
+# Страховочный таймаут ожидания события: уведомления о записи в файл,
+# открытый другим процессом, Windows присылает не всегда.
+_INOTIFY_IDLE_TIMEOUT = 30.0
+_WIN32_IDLE_TIMEOUT = 1.0
+
+
+class ChangeWaiter(Protocol):
+    """Ожидание изменений файла."""
+
+    def wait(self) -> bool:
+        """Блокирует до изменения файла, wake() или таймаута; True — было событие."""
+
+    def wake(self) -> None:
+        """Прерывает wait() из другого потока."""
+
+    def close(self) -> None:
+        """Освобождает ресурсы."""
+
+
+class PollingWaiter:
+    """Опрос с фиксированным интервалом (запасной вариант)."""
+
+    def __init__(self, interval: float) -> None:
+        """Создаёт ожидание с интервалом interval секунд."""
+        self._interval = interval
+        self._event = threading.Event()
+
+    def wait(self) -> bool:
+        """Ждёт интервал опроса; событием считается только wake()."""
+        woken = self._event.wait(self._interval)
+        self._event.clear()
+        return woken
+
+    def wake(self) -> None:
+        """Прерывает ожидание."""
+        self._event.set()
+
+    def close(self) -> None:
+        """Ничего не освобождает."""
+
+
+class InotifyWaiter:
+    """Linux: inotify на каталоге файла, без периодических пробуждений.
+
+    Следит за каталогом, а не за файлом, чтобы увидеть пересоздание и
+    переименование лога; события других файлов отбрасываются без
+    возврата из wait(). wake() пишет в self-pipe.
+    """
+
+    _IN_MODIFY = 0x00000002
+    _IN_MOVED_FROM = 0x00000040
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+    _IN_DELETE = 0x00000200
+    _IN_Q_OVERFLOW = 0x00004000
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+
+    def __init__(self, path: Path, idle_timeout: float = _INOTIFY_IDLE_TIMEOUT) -> None:
+        """Ставит inotify на каталог path; OSError если это невозможно."""
+        import ctypes
+        import ctypes.util
+        import select
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._select = select
+        self._name = os.fsencode(path.name)
+        self._idle_timeout = idle_timeout
+        self._fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = (
+            self._IN_MODIFY
+            | self._IN_CREATE
+            | self._IN_DELETE
+            | self._IN_MOVED_FROM
+            | self._IN_MOVED_TO
+        )
+        if libc.inotify_add_watch(self._fd, os.fsencode(path.parent), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path.parent}")
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self._closed = False
+
+    def wait(self) -> bool:
+        """Ждёт событие по файлу лога или wake()."""
+        poller = self._select.poll()
+        poller.register(self._fd, self._select.POLLIN)
+        poller.register(self._wake_r, self._select.POLLIN)
+        timeout_ms = int(self._idle_timeout * 1000)
+        while True:
+            ready = poller.poll(timeout_ms)
+            if not ready:
+                return False
+            for fd, _ in ready:
+                if fd == self._wake_r:
+                    self._drain(self._wake_r)
+                    return True
+            if self._relevant(self._drain(self._fd)):
+                return True
+
+    def _relevant(self, buffer: bytes) -> bool:
+        offset = 0
+        # struct inotify_event: int wd; uint32 mask, cookie, len; char name[len]
+        while offset + 16 <= len(buffer):
+            mask = int.from_bytes(buffer[offset + 4:offset + 8], sys.byteorder)
+            length = int.from_bytes(buffer[offset + 12:offset + 16], sys.byteorder)
+            name = buffer[offset + 16:offset + 16 + length].rstrip(b"\0")
+            if mask & self._IN_Q_OVERFLOW or name == self._name:
+                return True
+            offset += 16 + length
+        return False
+
+    @staticmethod
+    def _drain(fd: int) -> bytes:
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def wake(self) -> None:
+        """Прерывает ожидание."""
+        if self._closed:
+            return
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Закрывает inotify и self-pipe."""
+        if self._closed:
+            return
+        self._closed = True
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class Win32ChangeWaiter:
+    """Windows: FindFirstChangeNotification на каталоге файла.
+
+    Ждёт уведомление вместе с событием wake() через WaitForMultipleObjects.
+    Метаданные файла, открытого игрой на запись, NTFS обновляет с
+    задержкой, поэтому ожидание ограничено страховочным таймаутом.
+    """
+
+    _FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+    _FILE_NOTIFY_CHANGE_SIZE = 0x00000008
+    _FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+    _WAIT_OBJECT_0 = 0x00000000
+    _INVALID_HANDLE_VALUE = -1
+
+    # Хэндлы и функции kernel32 (ctypes) — задаются только в Windows.
+    _kernel32: Any
+    _change: int
+    _wake_event: int
+    _handles: Any
+    _timeout_ms: int
+    _closed: bool
+
+    def __init__(self, path: Path, idle_timeout: float = _WIN32_IDLE_TIMEOUT) -> None:
+        """Ставит уведомление на каталог path; OSError если это невозможно."""
+        if sys.platform != "win32":
+            raise OSError("Change notifications are only available on Windows")
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        kernel32.FindFirstChangeNotificationW.argtypes = [
+            wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD
+        ]
+        kernel32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        kernel32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        kernel32.CreateEventW.restype = wintypes.HANDLE
+        kernel32.SetEvent.argtypes = [wintypes.HANDLE]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        kernel32.WaitForMultipleObjects.argtypes = [
+            wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD
+        ]
+        kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        mask = (
+            self._FILE_NOTIFY_CHANGE_FILE_NAME
+            | self._FILE_NOTIFY_CHANGE_SIZE
+            | self._FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        change = kernel32.FindFirstChangeNotificationW(str(path.parent), False, mask)
+        if not change or change == ctypes.c_void_p(self._INVALID_HANDLE_VALUE).value:
+            raise ctypes.WinError(ctypes.get_last_error())
+        self._kernel32 = kernel32
+        self._change = change
+        self._wake_event = kernel32.CreateEventW(None, False, False, None)
+        self._handles = (wintypes.HANDLE * 2)(change, self._wake_event)
+        self._timeout_ms = int(idle_timeout * 1000)
+        self._closed = False
+
+    def wait(self) -> bool:
+        """Ждёт уведомление по каталогу, wake() или страховочный таймаут."""
+        result: int = self._kernel32.WaitForMultipleObjects(
+            2, self._handles, False, self._timeout_ms
+        )
+        if result == self._WAIT_OBJECT_0:
+            self._kernel32.FindNextChangeNotification(self._change)
+            return True
+        return result == self._WAIT_OBJECT_0 + 1
+
+    def wake(self) -> None:
+        """Прерывает ожидание."""
+        if not self._closed:
+            self._kernel32.SetEvent(self._wake_event)
+
+    def close(self) -> None:
+        """Закрывает хэндлы уведомления и события."""
+        if self._closed:
+            return
+        self._closed = True
+        self._kernel32.FindCloseChangeNotification(self._change)
+        self._kernel32.CloseHandle(self._wake_event)
+
+
+def build_change_waiter(path: Path, poll_interval: float, backend: str = "auto") -> ChangeWaiter:
+    """Создаёт ожидание изменений файла path.
+
+    auto: inotify в Linux, уведомления каталога в Windows, иначе опрос
+    раз в poll_interval. Недоступный бэкенд (нет каталога, лимит
+    inotify) заменяется опросом.
+    """
+    if backend not in WATCH_BACKENDS:
+        logger.warning("Unknown log watch backend %r, using auto", backend)
+        backend = "auto"
+    if backend == "auto":
+        backend = {"linux": "inotify", "win32": "win32"}.get(sys.platform, "poll")
+    try:
+        if backend == "inotify":
+            return InotifyWaiter(path)
+        if backend == "win32":
+            return Win32ChangeWaiter(path)
+    except (OSError, AttributeError) as exc:
+        logger.debug("Log watch backend %s unavailable: %s", backend, exc)
+    return PollingWaiter(poll_interval)
+
+
+__all__ = [
+    "WATCH_BACKENDS",
+    "ChangeWaiter",
+    "InotifyWaiter",
+    "PollingWaiter",
+    "Win32ChangeWaiter",
+    "build_change_waiter",
+]
@@ -4,37 +4,14 @@ import asyncio
 import logging
 import threading
 import time
-from dataclasses import dataclass, field
-from typing import Callable, Optional
+from typing import Callable
 
 from aiohttp import web
 
-logger = logging.getLogger(__name__)
-
-
-@dataclass
-class GSIState:
-    """Снимок состояния GSI с расширенными полями."""
-
-    clock_time: Optional[int] = None
-    game_state: Optional[str] = None
-    paused: bool = False
-    updated_at: float = 0.0
-
-    # Hero
-    hero_name: Optional[str] = None
-    hero_level: int = 0
+from .gsi_parser import GsiPayloadParser
+from .gsi_state import GSIState
 
-    # Player
-    player_kills: int = 0
-    player_deaths: int = 0
-    player_assists: int = 0
-    player_gpm: int = 0
-    player_last_hits: int = 0
-    player_wards_placed: int = 0
-
-    # Items: slot_name -> item_name
-    items: dict[str, str] = field(default_factory=dict)
+logger = logging.getLogger(__name__)
 
 
 class AioGsiServer:
@@ -46,76 +23,48 @@ class AioGsiServer:
         port: int = 4000,
         on_update: Callable[[GSIState], None] | None = None,
         on_heartbeat: Callable[[], None] | None = None,
+        on_raw: Callable[[bytes], None] | None = None,
+        json_backend: str = "stdlib",
+        loop_factory: Callable[[], asyncio.AbstractEventLoop] | None = None,
     ) -> None:
         self._host = host
         self._port = port
         self._on_update = on_update
         self._on_heartbeat = on_heartbeat
+        self._on_raw = on_raw
         self._lock = threading.Lock()
         self.state = GSIState()
+        self._parser = GsiPayloadParser(decoder=json_backend)
         self._runner: web.AppRunner | None = None
         self._site: web.TCPSite | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
         self._thread: threading.Thread | None = None
         self._actual_port: int = port
+        self._loop_factory = loop_factory or asyncio.new_event_loop
+        self._started = threading.Event()
 
     @property
     def port(self) -> int:
         return self._actual_port
 
     async def _handle_post(self, request: web.Request) -> web.Response:
+        received_at = time.perf_counter()
+        raw = await request.read()
         try:
-            payload = await request.json()
-        except Exception:
+            state = self._parser.parse(raw, received_at=received_at)
+        except ValueError:
             return web.Response(status=400)
 
-        map_data = payload.get("map", {})
-        hero_data = payload.get("hero", {})
-        player_data = payload.get("player", {})
-        items_data = payload.get("items", {})
+        with self._lock:
+            self.state = state
 
-        items: dict[str, str] = {}
-        for key, val in items_data.items():
-            if isinstance(val, dict) and "name" in val:
-                name = val["name"]
-                if name and name != "empty":
-                    items[key] = name
+        if self._on_raw:
+            self._on_raw(raw)
 
-        with self._lock:
-            self.state.clock_time = map_data.get("clock_time")
-            self.state.game_state = map_data.get("game_state")
-            self.state.paused = bool(map_data.get("paused", False))
-            self.state.updated_at = time.time()
-            self.state.hero_name = hero_data.get("name")
-            self.state.hero_level = hero_data.get("level", 0)
-            self.state.player_kills = player_data.get("kills", 0)
-            self.state.player_deaths = player_data.get("deaths", 0)
-            self.state.player_assists = player_data.get("assists", 0)
-            self.state.player_gpm = player_data.get("gpm", 0)
-            self.state.player_last_hits = player_data.get("last_hits", 0)
-            self.state.player_wards_placed = player_data.get("wards_placed", 0)
-            self.state.items = items
-
-            state_copy = GSIState(
-                clock_time=self.state.clock_time,
-                game_state=self.state.game_state,
-                paused=self.state.paused,
-                updated_at=self.state.updated_at,
-                hero_name=self.state.hero_name,
-                hero_level=self.state.hero_level,
-                player_kills=self.state.player_kills,
-                player_deaths=self.state.player_deaths,
-                player_assists=self.state.player_assists,
-                player_gpm=self.state.player_gpm,
-                player_last_hits=self.state.player_last_hits,
-                player_wards_placed=self.state.player_wards_placed,
-                items=dict(self.state.items),
-            )
-
-        logger.debug("GSI state: %s", state_copy)
+        logger.debug("GSI state: %s", state)
 
         if self._on_update:
-            self._on_update(state_copy)
+            self._on_update(state)
         if self._on_heartbeat:
             self._on_heartbeat()
 
@@ -142,20 +91,42 @@ class AioGsiServer:
             await self._runner.cleanup()
         logger.info("GSI server stopped")
 
-    def start_in_thread(self) -> None:
-        self._loop = asyncio.new_event_loop()
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+    def start_in_thread(self, timeout: float = 5.0) -> None:
+        """Запускает сервер в фоновом потоке и ждёт открытия сокета."""
+        self._loop = self._loop_factory()
+        self._started.clear()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="GsiAiohttp", daemon=True
+        )
         self._thread.start()
+        self._started.wait(timeout)
 
     def _run_loop(self) -> None:
-        assert self._loop is not None
-        asyncio.set_event_loop(self._loop)
-        self._loop.run_until_complete(self.start())
-        self._loop.run_forever()
+        loop = self._loop
+        assert loop is not None
+        asyncio.set_event_loop(loop)
+        try:
+            try:
+                loop.run_until_complete(self.start())
+            except OSError:
+                logger.exception("GSI server failed to start on %s:%s", self._host, self._port)
+                return
+            finally:
+                self._started.set()
+            loop.run_forever()
+        finally:
+            # Цикл закрывается здесь: перезапуск сервисов при каждом
+            # перезапуске Dota не должен оставлять открытых циклов.
+            asyncio.set_event_loop(None)
+            loop.close()
 
     def stop_from_thread(self) -> None:
         if self._loop and self._loop.is_running():
-            asyncio.run_coroutine_threadsafe(self.stop(), self._loop)
+            future = asyncio.run_coroutine_threadsafe(self.stop(), self._loop)
+            try:
+                future.result(timeout=5.0)
+            except Exception:
+                logger.exception("GSI server cleanup failed")
             self._loop.call_soon_threadsafe(self._loop.stop)
         if self._thread:
             self._thread.join(timeout=5.0)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Callable, cast
+
+from .gsi_state import GSIState
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from .gsi_aiohttp import AioGsiServer
+    from .gsi_server import GSIServer
+
+logger = logging.getLogger(__name__)
+
+GSI_BACKENDS = ("aiohttp", "stdlib", "uvloop")
+
+
+class ThreadedAioGsiServer:
+    """Синхронный адаптер AioGsiServer: event loop в отдельном потоке."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 4000,
+        on_update: Callable[[GSIState], None] | None = None,
+        on_heartbeat: Callable[[], None] | None = None,
+        on_raw: Callable[[bytes], None] | None = None,
+        loop_factory: Callable[[], asyncio.AbstractEventLoop] | None = None,
+        json_backend: str = "stdlib",
+    ) -> None:
+        """Создаёт адаптер; aiohttp импортируется только при первом запуске."""
+        self._host = host
+        self._port = port
+        self._on_update = on_update
+        self._on_heartbeat = on_heartbeat
+        self._on_raw = on_raw
+        self._loop_factory = loop_factory
+        self._json_backend = json_backend
+        self._server: AioGsiServer | None = None
+        self._running = False
+
+    @property
+    def port(self) -> int:
+        """Возвращает фактический порт (после запуска) или заданный."""
+        if self._server is None:
+            return self._port
+        return self._server.port
+
+    def start(self) -> None:
+        """Запускает сервер в фоновом потоке."""
+        if self._running:
+            return
+        if self._server is None:
+            from .gsi_aiohttp import AioGsiServer
+
+            self._server = AioGsiServer(
+                host=self._host,
+                port=self._port,
+                on_update=self._on_update,
+                on_heartbeat=self._on_heartbeat,
+                on_raw=self._on_raw,
+                json_backend=self._json_backend,
+                loop_factory=self._loop_factory,
+            )
+        self._running = True
+        self._server.start_in_thread()
+
+    def stop(self) -> None:
+        """Останавливает сервер и дожидается потока."""
+        if not self._running or self._server is None:
+            return
+        self._running = False
+        self._server.stop_from_thread()
+
+
+def _uvloop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    try:
+        import uvloop  # type: ignore[import-not-found, unused-ignore]
+    except ImportError:
+        logger.warning("uvloop не установлен, GSI использует стандартный asyncio")
+        return None
+    return cast("Callable[[], asyncio.AbstractEventLoop]", uvloop.new_event_loop)
+
+
+def build_gsi_server(
+    backend: str,
+    host: str = "127.0.0.1",
+    port: int = 4000,
+    on_update: Callable[[GSIState], None] | None = None,
+    on_heartbeat: Callable[[], None] | None = None,
+    on_raw: Callable[[bytes], None] | None = None,
+    json_backend: str = "auto",
+) -> GSIServer | ThreadedAioGsiServer:
+    """Создаёт сервер GSI выбранного бэкенда с синхронными start/stop.
+
+    aiohttp — keep-alive соединения и асинхронная обработка, uvloop — то же
+    на цикле uvloop (если пакет не установлен, используется asyncio),
+    stdlib — однопоточный http.server без дополнительных зависимостей.
+    Неизвестное имя бэкенда заменяется на aiohttp. json_backend выбирает
+    декодер тела запроса (см. gsi_json.select_decoder), on_raw получает
+    сырое тело каждого корректного запроса (например, для записи сессии).
+    """
+    if backend == "stdlib":
+        from .gsi_server import GSIServer
+
+        return GSIServer(
+            host=host,
+            port=port,
+            on_update=on_update,
+            on_heartbeat=on_heartbeat,
+            on_raw=on_raw,
+            json_backend=json_backend,
+        )
+    if backend not in GSI_BACKENDS:
+        logger.warning("Неизвестный GSI backend %r, используется aiohttp", backend)
+    loop_factory = _uvloop_factory() if backend == "uvloop" else None
+    return ThreadedAioGsiServer(
+        host=host,
+        port=port,
+        on_update=on_update,
+        on_heartbeat=on_heartbeat,
+        on_raw=on_raw,
+        loop_factory=loop_factory,
+        json_backend=json_backend,
+    )
+
+
+__all__ = ["GSI_BACKENDS", "ThreadedAioGsiServer", "build_gsi_server"]
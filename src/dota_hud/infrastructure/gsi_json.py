@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import logging
+from typing import Any, Callable, Mapping
+
+from .gsi_state import SECTION_PARSERS, parse_items
+
+try:
+    import msgspec as _msgspec
+except ImportError:  # msgspec — необязательная зависимость
+    _msgspec = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKENDS = ("stdlib", "orjson", "msgspec")
+# Порядок предпочтения при json_backend=auto.
+_AUTO_ORDER = ("msgspec", "orjson", "stdlib")
+
+
+def backend_available(name: str) -> bool:
+    """Проверяет, установлен ли пакет JSON-бэкенда."""
+    if name == "stdlib":
+        return True
+    if name == "msgspec":
+        return _msgspec is not None
+    return name in JSON_BACKENDS and importlib.util.find_spec(name) is not None
+
+
+def select_decoder(name: str = "auto") -> str:
+    """Возвращает имя доступного JSON-бэкенда.
+
+    auto выбирает msgspec, затем orjson, затем stdlib. Если запрошенный
+    бэкенд не установлен или неизвестен, используется stdlib.
+    """
+    if name == "auto":
+        return next(backend for backend in _AUTO_ORDER if backend_available(backend))
+    if backend_available(name):
+        return name
+    logger.warning("JSON backend %r недоступен, используется stdlib", name)
+    return "stdlib"
+
+
+if _msgspec is not None:
+
+    class MapSection(_msgspec.Struct, frozen=True):
+        """Секция map: только поля, нужные HUD."""
+
+        clock_time: int | None = None
+        game_state: str | None = None
+        paused: bool = False
+
+    class HeroSection(_msgspec.Struct, frozen=True):
+        """Секция hero."""
+
+        name: str | None = None
+        level: int = 0
+
+    class PlayerSection(_msgspec.Struct, frozen=True):
+        """Секция player."""
+
+        kills: int = 0
+        deaths: int = 0
+        assists: int = 0
+        gpm: int = 0
+        last_hits: int = 0
+        wards_placed: int = 0
+
+    class ItemSlot(_msgspec.Struct, frozen=True):
+        """Слот предмета."""
+
+        name: str | None = None
+
+    class GsiPayload(_msgspec.Struct, frozen=True):
+        """Подписанные секции payload; остальные msgspec пропускает."""
+
+        map: MapSection | None = None
+        hero: HeroSection | None = None
+        player: PlayerSection | None = None
+        items: dict[str, ItemSlot] | None = None
+
+
+class SectionDecoder:
+    """Декодер тела GSI в секции верхнего уровня (stdlib/orjson).
+
+    sections() возвращает значения секций, пригодные для сравнения на
+    равенство с прошлым запросом, fields() — поля GSIState из секции.
+    """
+
+    def __init__(self, name: str, loads: Callable[[bytes], Any]) -> None:
+        """Создаёт декодер поверх функции loads."""
+        self.name = name
+        self._loads = loads
+
+    def sections(self, raw: bytes) -> Mapping[str, Any]:
+        """Декодирует тело; при некорректном JSON — ValueError."""
+        payload = self._loads(raw)
+        if not isinstance(payload, dict):
+            raise ValueError("GSI payload must be a JSON object")
+        return payload
+
+    def fields(self, name: str, value: Any) -> dict[str, Any]:
+        """Строит поля GSIState из значения секции."""
+        return SECTION_PARSERS[name](value if isinstance(value, dict) else {})
+
+
+class MsgspecSectionDecoder(SectionDecoder):
+    """Типизированный декодер msgspec: секции сразу попадают в Struct'ы.
+
+    Схема описывает только map, hero, player и items; остальные секции
+    payload msgspec пропускает без построения объектов.
+    """
+
+    def __init__(self) -> None:
+        """Создаёт декодер по типизированной схеме."""
+        if _msgspec is None:
+            raise RuntimeError("msgspec is not installed")
+        self._typed = _msgspec.json.Decoder(GsiPayload)
+        super().__init__("msgspec", _msgspec.json.decode)
+
+    def sections(self, raw: bytes) -> Mapping[str, Any]:
+        """Декодирует тело в Struct'ы секций; отсутствующие секции пропускаются.
+
+        Если payload не проходит схему (например, у зрителя секция player
+        вложена по командам), он разбирается без схемы, как у stdlib.
+        """
+        try:
+            payload = self._typed.decode(raw)
+        except _msgspec.ValidationError:
+            return super().sections(raw)
+        return {
+            name: value
+            for name in SECTION_PARSERS
+            if (value := getattr(payload, name)) is not None
+        }
+
+    def fields(self, name: str, value: Any) -> dict[str, Any]:
+        """Строит поля GSIState из Struct'а секции.
+
+        Значения без схемы (разбор после ValidationError) идут общим путём
+        stdlib: секция, не являющаяся объектом, считается пустой.
+        """
+        if name == "items" and isinstance(value, dict):
+            return {
+                "items": parse_items(
+                    {
+                        slot: {"name": item.name} if isinstance(item, ItemSlot) else item
+                        for slot, item in value.items()
+                    }
+                )
+            }
+        if isinstance(value, MapSection):
+            return {
+                "clock_time": value.clock_time,
+                "game_state": value.game_state,
+                "paused": value.paused,
+            }
+        if isinstance(value, HeroSection):
+            return {"hero_name": value.name, "hero_level": value.level}
+        if isinstance(value, PlayerSection):
+            return {
+                "player_kills": value.kills,
+                "player_deaths": value.deaths,
+                "player_assists": value.assists,
+                "player_gpm": value.gpm,
+                "player_last_hits": value.last_hits,
+                "player_wards_placed": value.wards_placed,
+            }
+        return super().fields(name, value)
+
+
+def build_section_decoder(name: str) -> SectionDecoder:
+    """Создаёт декодер секций для бэкенда (имя должно быть доступно)."""
+    if name == "msgspec":
+        return MsgspecSectionDecoder()
+    if name == "orjson":
+        import orjson
+
+        return SectionDecoder("orjson", orjson.loads)
+    return SectionDecoder("stdlib", json.loads)
+
+
+__all__ = [
+    "JSON_BACKENDS",
+    "MsgspecSectionDecoder",
+    "SectionDecoder",
+    "backend_available",
+    "build_section_decoder",
+    "select_decoder",
+]
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from typing import Any, Iterable
+
+from .gsi_json import SectionDecoder, build_section_decoder, select_decoder
+from .gsi_state import SECTION_PARSERS, GSIState
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Тело строки JSON после открывающей кавычки, включая закрывающую.
+_STRING_BODY = re.compile(r'[^"\\]*+(?:\\.[^"\\]*+)*+"')
+_SCALAR = re.compile(r"[^,}\]\s]++")
+# Составное значение JSON вложенностью до _SKIP_DEPTH уровней: границы
+# ищутся движком re без создания объектов; скобки и строки не проверяются
+# на парность типов. Глубже — полный raw_decode.
+_SKIP_DEPTH = 8
+_UNCHANGED = object()
+
+
+def _compound_pattern(depth: int) -> re.Pattern[str]:
+    string = r'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+    level = r"[{\[](?:[^\"{}\[\]]++|" + string + r")*+[}\]]"
+    for _ in range(depth - 1):
+        level = r"[{\[](?:[^\"{}\[\]]++|" + string + "|" + level + r")*+[}\]]"
+    return re.compile(level)
+
+
+_COMPOUND = _compound_pattern(_SKIP_DEPTH)
+
+
+def _skip_ws(text: str, index: int) -> int:
+    match = _WHITESPACE.match(text, index)
+    return index if match is None else match.end()
+
+
+def _string_end(text: str, index: int) -> int:
+    """Конец строки JSON, открывающая кавычка которой стоит перед index."""
+    match = _STRING_BODY.match(text, index)
+    if match is None:
+        raise ValueError(f"Unterminated string at {index - 1}")
+    return match.end()
+
+
+class GsiPayloadParser:
+    """Инкрементальный разбор тел GSI-запросов.
+
+    Тело декодируется в строку один раз, затем верхний уровень объекта
+    обходится по членам. Для каждой секции хранится её текст из прошлого
+    запроса: если новый текст начинается с него в той же позиции (сравнение
+    выполняется на уровне C без разбора JSON), секция пропускается целиком.
+    Изменившиеся секции декодируются, а типизированные поля GSIState
+    пересобираются только для подписанных секций, чьи байты изменились.
+    Неизменившиеся поля (например, словарь items) переиспользуются.
+
+    С быстрыми декодерами (orjson, msgspec) тело разбирается целиком на
+    уровне C прямо из bytes, а изменившиеся секции определяются сравнением
+    значений с прошлым запросом.
+
+    Экземпляр не потокобезопасен: у каждого сервера свой парсер.
+    """
+
+    def __init__(
+        self,
+        sections: Iterable[str] = SECTION_PARSERS,
+        decoder: str = "stdlib",
+    ) -> None:
+        """Создаёт парсер для подписанных секций payload.
+
+        decoder — stdlib, orjson, msgspec или auto (см. select_decoder).
+        """
+        self._sections = tuple(name for name in sections if name in SECTION_PARSERS)
+        self._decoder = json.JSONDecoder()
+        backend = select_decoder(decoder)
+        self._backend: SectionDecoder | None = (
+            None if backend == "stdlib" else build_section_decoder(backend)
+        )
+        self._texts: dict[str, str] = {}
+        self._values: dict[str, Any] = {}
+        self._fields: dict[str, dict[str, Any]] = {}
+        self._missing: set[str] = set()
+
+    def reset(self) -> None:
+        """Забывает прошлый payload (следующий разбор будет полным)."""
+        self._texts.clear()
+        self._values.clear()
+        self._fields.clear()
+        self._missing.clear()
+
+    def parse(
+        self,
+        raw: bytes | str,
+        updated_at: float | None = None,
+        received_at: float = 0.0,
+    ) -> GSIState:
+        """Разбирает тело запроса; при некорректном JSON — ValueError.
+
+        received_at — момент time.perf_counter() получения тела; вместе с
+        моментом окончания разбора он попадает в GSIState для замеров задержки.
+        """
+        if self._backend is None:
+            text = raw if isinstance(raw, str) else bytes(raw).decode("utf-8")
+            values = self._scan(text)
+            build = _build_fields
+        else:
+            values = self._decode(raw.encode("utf-8") if isinstance(raw, str) else raw)
+            build = self._backend.fields
+
+        for name in self._sections:
+            if name in values:
+                value = values[name]
+                if value is not _UNCHANGED:
+                    self._fields[name] = build(name, value)
+                    self._missing.discard(name)
+            elif name not in self._missing:
+                # Секции нет в payload — поля получают значения по умолчанию.
+                self._fields[name] = SECTION_PARSERS[name]({})
+                self._missing.add(name)
+
+        fields: dict[str, Any] = {}
+        for name in self._sections:
+            fields.update(self._fields[name])
+        return GSIState(
+            updated_at=time.time() if updated_at is None else updated_at,
+            received_at=received_at,
+            parsed_at=time.perf_counter(),
+            **fields,
+        )
+
+    @property
+    def backend(self) -> str:
+        """Возвращает имя используемого JSON-бэкенда."""
+        return "stdlib" if self._backend is None else self._backend.name
+
+    def _decode(self, raw: bytes) -> dict[str, Any]:
+        """Декодирует тело быстрым бэкендом; неизменные секции — _UNCHANGED."""
+        assert self._backend is not None
+        sections = self._backend.sections(raw)
+        previous = self._values
+        current: dict[str, Any] = {}
+        values: dict[str, Any] = {}
+        for name in self._sections:
+            if name not in sections:
+                continue
+            value = current[name] = sections[name]
+            values[name] = _UNCHANGED if previous.get(name, _UNCHANGED) == value else value
+        self._values = current
+        return values
+
+    def _scan(self, text: str) -> dict[str, Any]:
+        """Обходит члены верхнего уровня; неизменные значения — _UNCHANGED.
+
+        Значения неподписанных секций (abilities, wearables и т.п.) не
+        декодируются: их конец находит регулярное выражение по скобкам.
+        """
+        subscribed = self._sections
+        texts = self._texts
+        seen_texts: dict[str, str] = {}
+        values: dict[str, Any] = {}
+
+        index = _skip_ws(text, 0)
+        if text[index:index + 1] != "{":
+            raise ValueError("GSI payload must be a JSON object")
+        index = _skip_ws(text, index + 1)
+        if text[index:index + 1] == "}":
+            return self._finish(text, index + 1, values, seen_texts)
+
+        while True:
+            if text[index:index + 1] != '"':
+                raise ValueError(f"Expected member name at {index}")
+            key_end = _string_end(text, index + 1)
+            key = text[index + 1:key_end - 1]
+            if "\\" in key:
+                key = json.loads(text[index:key_end])
+            index = _skip_ws(text, key_end)
+            if text[index:index + 1] != ":":
+                raise ValueError(f"Expected ':' at {index}")
+            start = _skip_ws(text, index + 1)
+
+            previous = texts.get(key)
+            same = False
+            if previous is not None and text.startswith(previous, start):
+                # Совпадающий префикс — та же секция, если за ним конец
+                # значения (для чисел "12" и "123" префиксы совпадают).
+                end = _skip_ws(text, start + len(previous))
+                same = text[end:end + 1] in (",", "}")
+            if previous is not None and same:
+                values[key] = _UNCHANGED
+                index = start + len(previous)
+                seen_texts[key] = previous
+            elif key in subscribed:
+                values[key], index = self._decoder.raw_decode(text, start)
+                seen_texts[key] = text[start:index]
+            else:
+                index = self._skip_value(text, start)
+                seen_texts[key] = text[start:index]
+
+            index = _skip_ws(text, index)
+            delimiter = text[index:index + 1]
+            if delimiter == ",":
+                index = _skip_ws(text, index + 1)
+            elif delimiter == "}":
+                return self._finish(text, index + 1, values, seen_texts)
+            else:
+                raise ValueError(f"Expected ',' or '}}' at {index}")
+
+    def _skip_value(self, text: str, index: int) -> int:
+        """Конец значения неподписанной секции без построения объектов."""
+        first = text[index:index + 1]
+        if first == '"':
+            return _string_end(text, index + 1)
+        match = (_COMPOUND if first in ("{", "[") else _SCALAR).match(text, index)
+        if match is not None:
+            return match.end()
+        if first in ("{", "["):
+            # Слишком глубокая вложенность — разбор честным декодером.
+            return self._decoder.raw_decode(text, index)[1]
+        raise ValueError(f"Expected value at {index}")
+
+    def _finish(
+        self,
+        text: str,
+        index: int,
+        values: dict[str, Any],
+        seen_texts: dict[str, str],
+    ) -> dict[str, Any]:
+        if _skip_ws(text, index) != len(text):
+            raise ValueError(f"Extra data at {index}")
+        # Тексты запоминаются только после успешного разбора всего тела.
+        self._texts = seen_texts
+        return values
+
+
+def _build_fields(name: str, value: Any) -> dict[str, Any]:
+    return SECTION_PARSERS[name](value if isinstance(value, dict) else {})
+
+
+__all__ = ["GsiPayloadParser"]
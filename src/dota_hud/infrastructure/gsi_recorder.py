@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import io
+import logging
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"D2GSI\x01"
+# Заголовок записи: время получения (time.time()), длина сжатых данных, флаги.
+_HEADER = struct.Struct("<dIB")
+# Запись сжата без словаря (первая в сессии записи или после сброса).
+FLAG_KEYFRAME = 0x01
+_KEYFRAME_EVERY = 1024
+
+
+@dataclass(frozen=True)
+class GsiRecord:
+    """Одно тело POST из записи сессии GSI."""
+
+    timestamp: float
+    raw: bytes
+
+
+class GsiRecorder:
+    """Дописывает сырые тела GSI-запросов в компактный файл.
+
+    Формат: MAGIC, затем записи «заголовок + zlib». Соседние тела GSI почти
+    совпадают, поэтому каждое сжимается со словарём из предыдущего тела и
+    занимает десятки байт. Каждая новая сессия записи (и каждая 1024-я
+    запись) начинается с ключевой записи без словаря. Файл только
+    дописывается и сбрасывается на диск после каждой записи: оборванный
+    хвост при чтении отбрасывается, а перед дозаписью обрезается.
+    """
+
+    def __init__(self, path: Path, level: int = 6) -> None:
+        """Создаёт рекордер; файл открывается при первой записи."""
+        self._path = Path(path)
+        self._level = level
+        self._lock = threading.Lock()
+        self._file: BinaryIO | None = None
+        self._previous: bytes | None = None
+        self._since_keyframe = 0
+        self._closed = False
+
+    @property
+    def path(self) -> Path:
+        """Возвращает путь к файлу записи."""
+        return self._path
+
+    def record(self, raw: bytes, timestamp: float | None = None) -> None:
+        """Дописывает тело запроса (вызывается из потока GSI-сервера)."""
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._write(bytes(raw), time.time() if timestamp is None else timestamp)
+            except OSError:
+                logger.exception("GSI recorder failed, recording stopped: %s", self._path)
+                self._close_file()
+                self._closed = True
+
+    def close(self) -> None:
+        """Закрывает файл; последующие записи игнорируются."""
+        with self._lock:
+            self._close_file()
+            self._closed = True
+
+    def __enter__(self) -> "GsiRecorder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _write(self, raw: bytes, timestamp: float) -> None:
+        if self._file is None:
+            self._file = self._open()
+        keyframe = self._previous is None or self._since_keyframe >= _KEYFRAME_EVERY
+        if keyframe:
+            compressor = zlib.compressobj(self._level)
+            self._since_keyframe = 0
+        else:
+            compressor = zlib.compressobj(self._level, zdict=self._previous)
+        data = compressor.compress(raw) + compressor.flush()
+        flags = FLAG_KEYFRAME if keyframe else 0
+        self._file.write(_HEADER.pack(timestamp, len(data), flags) + data)
+        self._file.flush()
+        self._previous = raw
+        self._since_keyframe += 1
+
+    def _open(self) -> BinaryIO:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        if not (self._path.exists() and self._path.stat().st_size > 0):
+            created = self._path.open("wb")
+            created.write(MAGIC)
+            logger.info("GSI recording to %s", self._path)
+            return created
+        handle = self._path.open("r+b")
+        try:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise OSError(f"Not a GSI recording: {self._path}")
+            end = _complete_end(handle)
+            if end < handle.seek(0, io.SEEK_END):
+                # Оборванный хвост прошлой сессии: новые записи идут сразу
+                # за последней целой, иначе читатель остановится на обрыве.
+                logger.warning("GSI recording had a truncated tail, cut at %d", end)
+                handle.truncate(end)
+            handle.seek(end)
+        except BaseException:
+            handle.close()
+            raise
+        logger.info("GSI recording to %s", self._path)
+        return handle
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _complete_end(handle: BinaryIO) -> int:
+    """Смещение конца последней целой записи (файл прочитан после MAGIC)."""
+    end = handle.tell()
+    while True:
+        header = handle.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return end
+        _, length, _ = _HEADER.unpack(header)
+        if len(handle.read(length)) < length:
+            return end
+        end = handle.tell()
+
+
+def read_recording(path: Path) -> Iterator[GsiRecord]:
+    """Читает записи по порядку.
+
+    Оборванная последняя запись пропускается, на повреждённых сжатых
+    данных чтение останавливается с предупреждением в логе.
+    """
+    with Path(path).open("rb") as handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a GSI recording: {path}")
+        previous: bytes | None = None
+        while True:
+            header = handle.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            timestamp, length, flags = _HEADER.unpack(header)
+            data = handle.read(length)
+            if len(data) < length:
+                logger.warning("GSI recording is truncated: %s", path)
+                return
+            if flags & FLAG_KEYFRAME:
+                decompressor = zlib.decompressobj()
+            elif previous is None:
+                raise ValueError(f"GSI recording starts without a keyframe: {path}")
+            else:
+                decompressor = zlib.decompressobj(zdict=previous)
+            try:
+                raw = decompressor.decompress(data) + decompressor.flush()
+            except zlib.error:
+                logger.warning("GSI recording is corrupted at %d: %s", handle.tell(), path)
+                return
+            previous = raw
+            yield GsiRecord(timestamp=timestamp, raw=raw)
+
+
+__all__ = ["FLAG_KEYFRAME", "MAGIC", "GsiRecord", "GsiRecorder", "read_recording"]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+from .gsi_parser import GsiPayloadParser
+from .gsi_recorder import GsiRecord, read_recording
+
+if TYPE_CHECKING:
+    from ..application.infra_provider import GsiStateStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReplayStats:
+    """Итог проигрывания записи."""
+
+    posts: int
+    failed: int
+    seconds: float
+
+    @property
+    def posts_per_second(self) -> float:
+        """Возвращает среднюю скорость подачи запросов."""
+        return self.posts / self.seconds if self.seconds > 0 else float("inf")
+
+
+def parse_speed(value: str) -> float | None:
+    """Разбирает скорость: real (1×), max (без пауз) или множитель N."""
+    value = value.strip().lower()
+    if value == "real":
+        return 1.0
+    if value in ("max", "0", ""):
+        return None
+    speed = float(value.rstrip("x×"))
+    if speed <= 0:
+        raise ValueError(f"Replay speed must be positive: {value}")
+    return speed
+
+
+def paced(
+    records: Iterable[GsiRecord],
+    speed: float | None = 1.0,
+    clock: Callable[[], float] = time.perf_counter,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[GsiRecord]:
+    """Выдаёт записи с исходными интервалами, ускоренными в speed раз.
+
+    Моменты выдачи считаются от начала проигрывания, а не от предыдущей
+    записи, поэтому задержки обработки не накапливаются. speed=None —
+    без пауз.
+    """
+    start_clock: float | None = None
+    first_ts = 0.0
+    for record in records:
+        if speed is not None:
+            if start_clock is None:
+                start_clock = clock()
+                first_ts = record.timestamp
+            due = start_clock + (record.timestamp - first_ts) / speed
+            delay = due - clock()
+            if delay > 0:
+                sleep(delay)
+        yield record
+
+
+def replay_to_store(
+    path: Path,
+    store: "GsiStateStore",
+    speed: float | None = 1.0,
+    json_backend: str = "auto",
+) -> ReplayStats:
+    """Проигрывает запись напрямую в GsiStateStore, минуя HTTP.
+
+    Тела разбираются тем же инкрементальным парсером, что и в серверах,
+    а updated_at ставится в момент подачи, как при живой игре.
+    """
+    parser = GsiPayloadParser(decoder=json_backend)
+    posts = failed = 0
+    started = time.perf_counter()
+    for record in paced(read_recording(path), speed):
+        try:
+            state = parser.parse(record.raw)
+        except ValueError:
+            failed += 1
+            continue
+        store.update(state)
+        store.mark_heartbeat()
+        posts += 1
+    return ReplayStats(posts=posts, failed=failed, seconds=time.perf_counter() - started)
+
+
+async def replay_to_http_async(
+    path: Path,
+    url: str,
+    speed: float | None = 1.0,
+) -> ReplayStats:
+    """Проигрывает запись POST-запросами в GSI-сервер (одно keep-alive соединение)."""
+    import aiohttp
+
+    posts = failed = 0
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    headers = {"Content-Type": "application/json"}
+    async with aiohttp.ClientSession() as session:
+        start_clock: float | None = None
+        first_ts = 0.0
+        for record in read_recording(path):
+            if speed is not None:
+                if start_clock is None:
+                    start_clock = loop.time()
+                    first_ts = record.timestamp
+                delay = start_clock + (record.timestamp - first_ts) / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            async with session.post(url, data=record.raw, headers=headers) as response:
+                await response.read()
+                if response.status == 200:
+                    posts += 1
+                else:
+                    failed += 1
+    return ReplayStats(posts=posts, failed=failed, seconds=time.perf_counter() - started)
+
+
+def replay_to_http(path: Path, url: str, speed: float | None = 1.0) -> ReplayStats:
+    """Синхронная обёртка над replay_to_http_async."""
+    return asyncio.run(replay_to_http_async(path, url, speed))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI: проигрывание записи в работающий HUD или в память (нагрузочный тест)."""
+    parser = argparse.ArgumentParser(description="Replay a recorded GSI session")
+    parser.add_argument("recording", type=Path)
+    parser.add_argument("--speed", default="real", help="real, max or a multiplier (4, 4x)")
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="GSI endpoint, e.g. http://127.0.0.1:4000/ (default: in-memory store)",
+    )
+    args = parser.parse_args(argv)
+    speed = parse_speed(args.speed)
+
+    if args.url:
+        stats = replay_to_http(args.recording, args.url, speed)
+    else:
+        from ..application.infra_provider import GsiStateStore
+
+        stats = replay_to_store(args.recording, GsiStateStore(), speed)
+    print(
+        f"{stats.posts} posts, {stats.failed} failed, {stats.seconds:.3f} s "
+        f"({stats.posts_per_second:.0f} posts/s)"
+    )
+
+
+__all__ = [
+    "ReplayStats",
+    "paced",
+    "parse_speed",
+    "replay_to_http",
+    "replay_to_http_async",
+    "replay_to_store",
+]
+
+
+if __name__ == "__main__":
+    main()
+
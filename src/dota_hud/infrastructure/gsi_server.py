@@ -1,24 +1,15 @@
 from __future__ import annotations
 
-import json
 import logging
 import threading
-from dataclasses import dataclass
 import time
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from typing import Callable, Optional
+from typing import Callable
 
-logger = logging.getLogger(__name__)
-
-
-@dataclass
-class GSIState:
-    """Снимок состояния, полученный через GSI."""
+from .gsi_parser import GsiPayloadParser
+from .gsi_state import GSIState
 
-    clock_time: Optional[int] = None
-    game_state: Optional[str] = None
-    paused: bool = False
-    updated_at: float = 0.0
+logger = logging.getLogger(__name__)
 
 
 class GSIServer:
@@ -30,48 +21,44 @@ class GSIServer:
         port: int = 4000,
         on_update: Callable[[GSIState], None] | None = None,
         on_heartbeat: Callable[[], None] | None = None,
+        on_raw: Callable[[bytes], None] | None = None,
+        json_backend: str = "stdlib",
     ) -> None:
         """Создаёт сервер GSI."""
         self._host = host
         self._port = port
         self._on_update = on_update
         self._on_heartbeat = on_heartbeat
+        self._on_raw = on_raw
         self._lock = threading.Lock()
         self.state = GSIState()
+        self._parser = GsiPayloadParser(decoder=json_backend)
 
         class Handler(BaseHTTPRequestHandler):
             def do_POST(inner_self) -> None:
+                received_at = time.perf_counter()
                 length = int(inner_self.headers.get("Content-Length", 0))
                 raw = inner_self.rfile.read(length)
 
                 try:
-                    payload = json.loads(raw)
-                except json.JSONDecodeError:
+                    state = self._parser.parse(raw, received_at=received_at)
+                except ValueError:
                     inner_self.send_response(400)
                     inner_self.end_headers()
                     return
 
-                map_data = payload.get("map", {})
-
                 with self._lock:
-                    self.state.clock_time = map_data.get("clock_time")
-                    self.state.game_state = map_data.get("game_state")
-                    self.state.paused = bool(map_data.get("paused", False))
-                    self.state.updated_at = time.time()
-
-                    state_copy = GSIState(
-                        clock_time=self.state.clock_time,
-                        game_state=self.state.game_state,
-                        paused=self.state.paused,
-                        updated_at=self.state.updated_at,
-                    )
+                    self.state = state
+
+                if self._on_raw:
+                    self._on_raw(raw)
 
                 if self._on_update:
-                    self._on_update(state_copy)
+                    self._on_update(state)
                 if self._on_heartbeat:
                     self._on_heartbeat()
 
-                logger.debug("GSI state: %s", state_copy)
+                logger.debug("GSI state: %s", state)
 
                 inner_self.send_response(200)
                 inner_self.end_headers()
@@ -82,6 +69,7 @@ class GSIServer:
         self._server = HTTPServer((self._host, self._port), Handler)
         self._thread = threading.Thread(
             target=self._server.serve_forever,
+            name="GsiServer",
             daemon=True,
         )
 
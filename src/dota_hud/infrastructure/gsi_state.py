@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional
+
+
+@dataclass
+class GSIState:
+    """Снимок состояния GSI с расширенными полями."""
+
+    clock_time: Optional[int] = None
+    game_state: Optional[str] = None
+    paused: bool = False
+    updated_at: float = 0.0
+
+    # Hero
+    hero_name: Optional[str] = None
+    hero_level: int = 0
+
+    # Player
+    player_kills: int = 0
+    player_deaths: int = 0
+    player_assists: int = 0
+    player_gpm: int = 0
+    player_last_hits: int = 0
+    player_wards_placed: int = 0
+
+    # Items: slot_name -> item_name
+    items: dict[str, str] = field(default_factory=dict)
+
+    # Моменты time.perf_counter() получения и разбора тела (для замеров задержки)
+    received_at: float = field(default=0.0, compare=False)
+    parsed_at: float = field(default=0.0, compare=False)
+
+
+def _section(payload: Mapping[str, Any], name: str) -> Mapping[str, Any]:
+    value = payload.get(name)
+    return value if isinstance(value, dict) else {}
+
+
+def parse_items(items_data: Mapping[str, Any]) -> dict[str, str]:
+    """Возвращает занятые слоты предметов: slot_name -> item_name."""
+    items: dict[str, str] = {}
+    for key, val in items_data.items():
+        if isinstance(val, dict) and "name" in val:
+            name = val["name"]
+            if name and name != "empty":
+                items[key] = name
+    return items
+
+
+def _map_fields(map_data: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        "clock_time": map_data.get("clock_time"),
+        "game_state": map_data.get("game_state"),
+        "paused": bool(map_data.get("paused", False)),
+    }
+
+
+def _hero_fields(hero_data: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        "hero_name": hero_data.get("name"),
+        "hero_level": hero_data.get("level", 0),
+    }
+
+
+def _player_fields(player_data: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        "player_kills": player_data.get("kills", 0),
+        "player_deaths": player_data.get("deaths", 0),
+        "player_assists": player_data.get("assists", 0),
+        "player_gpm": player_data.get("gpm", 0),
+        "player_last_hits": player_data.get("last_hits", 0),
+        "player_wards_placed": player_data.get("wards_placed", 0),
+    }
+
+
+def _items_fields(items_data: Mapping[str, Any]) -> dict[str, Any]:
+    return {"items": parse_items(items_data)}
+
+
+# Секция payload -> поля GSIState, которые из неё строятся.
+SECTION_PARSERS: dict[str, Callable[[Mapping[str, Any]], dict[str, Any]]] = {
+    "map": _map_fields,
+    "hero": _hero_fields,
+    "player": _player_fields,
+    "items": _items_fields,
+}
+
+
+def parse_payload(
+    payload: Mapping[str, Any],
+    updated_at: float | None = None,
+) -> GSIState:
+    """Собирает GSIState из тела запроса Dota GSI."""
+    fields: dict[str, Any] = {}
+    for name, parse in SECTION_PARSERS.items():
+        fields.update(parse(_section(payload, name)))
+    return GSIState(
+        updated_at=time.time() if updated_at is None else updated_at,
+        **fields,
+    )
+
+
+__all__ = ["SECTION_PARSERS", "GSIState", "parse_items", "parse_payload"]
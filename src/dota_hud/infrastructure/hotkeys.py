@@ -24,6 +24,12 @@ class Hotkeys:
         self._hooks.append(
             keyboard.add_hotkey(self._config.lock, lambda: self._queue.put(HudAction.LOCK))
         )
+        if self._config.profile:
+            self._hooks.append(
+                keyboard.add_hotkey(
+                    self._config.profile, lambda: self._queue.put(HudAction.PROFILE)
+                )
+            )
 
     def stop(self) -> None:
         """Снимает регистрацию горячих клавиш."""
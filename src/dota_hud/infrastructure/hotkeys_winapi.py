@@ -25,6 +25,7 @@ MOD_NOREPEAT = 0x4000
 WM_HOTKEY = 0x0312
 HOTKEY_ID_LOCK = 1
 HOTKEY_ID_ADMIN = 2
+HOTKEY_ID_PROFILE = 3
 
 
 class WinApiHotkeys:
@@ -38,7 +39,7 @@ class WinApiHotkeys:
 
     def start(self) -> None:
         self._stop_event.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread = threading.Thread(target=self._run, name="Hotkeys", daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
@@ -77,6 +78,17 @@ class WinApiHotkeys:
             else:
                 logger.error("Failed to register admin hotkey %s", self._config.admin)
 
+        # Profiler hotkey (optional)
+        vk_profile = VK_CODES.get(self._config.profile.upper())
+        if vk_profile is not None:
+            if user32.RegisterHotKey(None, HOTKEY_ID_PROFILE, MOD_NOREPEAT, vk_profile):
+                registered.append(HOTKEY_ID_PROFILE)
+                logger.info(
+                    "Registered profile hotkey %s (vk=0x%X)", self._config.profile, vk_profile
+                )
+            else:
+                logger.error("Failed to register profile hotkey %s", self._config.profile)
+
         if not registered:
             logger.error("No hotkeys registered")
             return
@@ -90,6 +102,8 @@ class WinApiHotkeys:
                             self._queue.put(HudAction.LOCK)
                         elif msg.wParam == HOTKEY_ID_ADMIN:
                             self._queue.put(HudAction.ADMIN)
+                        elif msg.wParam == HOTKEY_ID_PROFILE:
+                            self._queue.put(HudAction.PROFILE)
                 else:
                     self._stop_event.wait(timeout=0.05)
         finally:
@@ -8,6 +8,12 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Dict, Iterable, Optional
 
+from .file_watch import ChangeWaiter, PollingWaiter, build_change_waiter
+
+# Размер блока чтения лога и предел недописанной строки в буфере.
+_READ_BLOCK = 64 * 1024
+_MAX_PENDING = 1024 * 1024
+
 
 @dataclass(frozen=True)
 class LogWatcherConfig:
@@ -17,10 +23,18 @@ class LogWatcherConfig:
     start_patterns: Iterable[str]
     poll_interval: float
     debounce_seconds: float
+    watch_backend: str = "auto"
 
 
 class LogWatcher:
-    """Наблюдает за игровым логом и сигнализирует о старте матча."""
+    """Наблюдает за игровым логом и сигнализирует о старте матча.
+
+    Дописанные байты читаются блоками, а все start_patterns ищутся одним
+    объединённым регулярным выражением по всем целым строкам блока.
+    Между записями поток спит на уведомлениях файловой системы
+    (inotify, уведомления каталога Windows) и почти не просыпается;
+    без них используется опрос раз в poll_interval.
+    """
 
     def __init__(
         self,
@@ -29,6 +43,7 @@ class LogWatcher:
         on_start: Callable[[], None],
         poll_interval: float = 0.1,
         debounce_seconds: float = 5.0,
+        watch_backend: str = "auto",
     ) -> None:
         """Создаёт наблюдатель за логом."""
         self._config = LogWatcherConfig(
@@ -36,6 +51,7 @@ class LogWatcher:
             start_patterns=start_patterns,
             poll_interval=poll_interval,
             debounce_seconds=debounce_seconds,
+            watch_backend=watch_backend,
         )
         self._on_start = on_start
         self._stop_event = threading.Event()
@@ -43,23 +59,35 @@ class LogWatcher:
         self._last_start_ts = 0.0
         self._last_log_ts: Dict[str, float] = {}
         self._patterns = [re.compile(pattern) for pattern in start_patterns if pattern]
+        self._combined = _combine_patterns(self._patterns)
+        self._waiter: ChangeWaiter = PollingWaiter(poll_interval)
 
     def start(self) -> None:
         """Запускает чтение лога."""
         if self._thread and self._thread.is_alive():
             return
         self._stop_event.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._waiter = build_change_waiter(
+            self._config.path, self._config.poll_interval, self._config.watch_backend
+        )
+        self._thread = threading.Thread(target=self._run, name="LogWatcher", daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
         """Останавливает чтение лога."""
         self._stop_event.set()
+        self._waiter.wake()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=1)
 
     def _run(self) -> None:
         self._log("start", f"[log] watcher started: {self._config.path}")
+        try:
+            self._watch()
+        finally:
+            self._waiter.close()
+
+    def _watch(self) -> None:
         while not self._stop_event.is_set():
             if not self._config.path.exists():
                 self._log_throttled(
@@ -67,7 +95,7 @@ class LogWatcher:
                     f"[log] file not found, waiting: {self._config.path}",
                     min_interval=5.0,
                 )
-                self._stop_event.wait(self._config.poll_interval)
+                self._waiter.wait()
                 continue
             try:
                 self._tail_file()
@@ -80,9 +108,11 @@ class LogWatcher:
                 self._stop_event.wait(self._config.poll_interval)
 
     def _tail_file(self) -> None:
-        with self._config.path.open("r", encoding="utf-8", errors="ignore") as handle:
+        with self._config.path.open("rb") as handle:
             handle.seek(0, os.SEEK_END)
             offset = handle.tell()
+            inode = os.fstat(handle.fileno()).st_ino
+            pending = b""
             self._log_throttled(
                 "opened",
                 f"[log] watching: {self._config.path}",
@@ -90,16 +120,20 @@ class LogWatcher:
             )
 
             while not self._stop_event.is_set():
-                line = handle.readline()
-                if line:
-                    offset = handle.tell()
-                    matched = self._match_pattern(line)
-                    if matched:
-                        self._request_start(matched)
+                block = handle.read(_READ_BLOCK)
+                if block:
+                    offset += len(block)
+                    data = pending + block if pending else block
+                    cut = data.rfind(b"\n") + 1
+                    pending = data[cut:][-_MAX_PENDING:]
+                    if cut:
+                        matched = self._match_pattern(data[:cut].decode("utf-8", "ignore"))
+                        if matched:
+                            self._request_start(matched)
                     continue
 
                 try:
-                    size = self._config.path.stat().st_size
+                    stat = self._config.path.stat()
                 except FileNotFoundError:
                     self._log_throttled(
                         "missing",
@@ -108,7 +142,7 @@ class LogWatcher:
                     )
                     return
 
-                if size < offset:
+                if stat.st_size < offset or stat.st_ino != inode:
                     self._log_throttled(
                         "truncated",
                         f"[log] file truncated, reopening: {self._config.path}",
@@ -116,12 +150,29 @@ class LogWatcher:
                     )
                     return
 
-                self._stop_event.wait(self._config.poll_interval)
-
-    def _match_pattern(self, line: str) -> Optional[str]:
-        for pattern in self._patterns:
-            if pattern.search(line):
-                return pattern.pattern
+                self._waiter.wait()
+
+    def _match_pattern(self, text: str) -> Optional[str]:
+        """Возвращает первый шаблон, найденный в тексте (одной или многих строк).
+
+        Шаблоны совпадают только в пределах строки: если сводное выражение
+        захватило перевод строки (\\s, [^x] и т.п.), текст проверяется
+        построчно.
+        """
+        if self._combined is not None:
+            match = self._combined.search(text)
+            if match is None:
+                return None
+            found = match.group()
+            if "\n" not in found and "\r" not in found:
+                assert match.lastgroup is not None
+                return self._patterns[int(match.lastgroup[1:])].pattern
+        # Шаблоны, не сводимые в одно выражение, или совпадение через
+        # перевод строки: построчно, как раньше.
+        for line in text.splitlines():
+            for pattern in self._patterns:
+                if pattern.search(line):
+                    return pattern.pattern
         return None
 
     def _request_start(self, pattern: str) -> None:
@@ -143,3 +194,21 @@ class LogWatcher:
         if last is not None and now - last < min_interval:
             return
         self._log(key, message)
+
+
+def _combine_patterns(patterns: list[re.Pattern[str]]) -> Optional[re.Pattern[str]]:
+    """Сводит шаблоны в одно выражение с именованной группой на каждый.
+
+    ^ и $ совпадают на границах строк (MULTILINE), но сами шаблоны могут
+    захватить перевод строки — это проверяет _match_pattern. None — если
+    выражение не собирается (например, из-за встроенных флагов в середине).
+    """
+    if not patterns:
+        return None
+    try:
+        return re.compile(
+            "|".join(f"(?P<p{index}>{pattern.pattern})" for index, pattern in enumerate(patterns)),
+            re.MULTILINE,
+        )
+    except re.error:
+        return None
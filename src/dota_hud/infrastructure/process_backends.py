@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+PROCESS_BACKENDS = ("auto", "win32", "procfs", "psutil", "tasklist")
+
+# /proc/<pid>/comm обрезается ядром до 15 символов.
+_COMM_LENGTH = 15
+
+
+class ProcessBackend(Protocol):
+    """Поиск процесса по имени образа.
+
+    Необязательный метод wait_exit(pid, timeout) -> bool | None блокирует
+    до завершения процесса или таймаута (True — процесс завершился,
+    None — за этим pid следить нельзя); детектор вызывает его вместо
+    периодического опроса, пока процесс жив.
+    """
+
+    poll_interval: float
+
+    def find(self, name: str) -> Optional[int]:
+        """Возвращает pid процесса с образом name (или -1 если pid неизвестен)."""
+
+    def close(self) -> None:
+        """Освобождает ресурсы бэкенда."""
+
+
+class TasklistBackend:
+    """Запуск tasklist на каждый опрос (прежнее поведение, запасной вариант)."""
+
+    poll_interval = 5.0
+
+    def find(self, name: str) -> Optional[int]:
+        """Ищет процесс в выводе tasklist; pid не разбирается."""
+        try:
+            result = subprocess.run(
+                ["tasklist", "/FI", f"IMAGENAME eq {name}"],
+                capture_output=True, text=True, timeout=5,
+            )
+        except Exception:
+            logger.debug("Failed to check process %s", name, exc_info=True)
+            return None
+        return -1 if name.lower() in result.stdout.lower() else None
+
+    def close(self) -> None:
+        """Ничего не освобождает."""
+
+
+class PsutilBackend:
+    """Перечисление процессов через psutil (без запуска внешних программ)."""
+
+    poll_interval = 1.0
+
+    def __init__(self) -> None:
+        """Импортирует psutil; ImportError если пакет не установлен."""
+        import psutil  # type: ignore[import-untyped]
+
+        self._psutil = psutil
+
+    def find(self, name: str) -> Optional[int]:
+        """Возвращает pid первого процесса с образом name."""
+        target = name.lower()
+        for process in self._psutil.process_iter(["name"]):
+            if (process.info.get("name") or "").lower() == target:
+                return int(process.pid)
+        return None
+
+    def wait_exit(self, pid: int, timeout: float) -> Optional[bool]:
+        """Ждёт завершения процесса pid не дольше timeout секунд."""
+        psutil = self._psutil
+        try:
+            psutil.Process(pid).wait(timeout)
+        except psutil.TimeoutExpired:
+            return False
+        except psutil.NoSuchProcess:
+            return True
+        except psutil.Error:
+            return None
+        return True
+
+    def close(self) -> None:
+        """Ничего не освобождает."""
+
+
+class ProcfsBackend:
+    """Linux: чтение /proc/<pid>/comm и ожидание завершения через pidfd.
+
+    Под Wine/Proton имя потока процесса совпадает с именем образа, так
+    что dota2.exe находится без запуска ps; завершение процесса приходит
+    событием на pidfd (Linux 5.3+), без опроса.
+    """
+
+    poll_interval = 1.0
+
+    def __init__(self, proc_root: Path = Path("/proc")) -> None:
+        """Создаёт бэкенд над каталогом proc_root."""
+        self._root = proc_root
+        self._pidfd: tuple[int, int] | None = None
+
+    def find(self, name: str) -> Optional[int]:
+        """Возвращает pid первого процесса с образом name."""
+        target = name.lower()
+        comm_target = target[:_COMM_LENGTH]
+        try:
+            entries = os.listdir(self._root)
+        except OSError:
+            return None
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            try:
+                comm = (self._root / entry / "comm").read_bytes()
+            except OSError:
+                continue
+            if comm.decode("utf-8", "replace").strip().lower() != comm_target:
+                continue
+            if len(target) <= _COMM_LENGTH or self._cmdline_matches(entry, target):
+                return int(entry)
+        return None
+
+    def _cmdline_matches(self, pid: str, target: str) -> bool:
+        try:
+            argv0 = (self._root / pid / "cmdline").read_bytes().split(b"\0", 1)[0]
+        except OSError:
+            return False
+        image = argv0.decode("utf-8", "replace").replace("\\", "/").rsplit("/", 1)[-1]
+        return image.lower() == target
+
+    def wait_exit(self, pid: int, timeout: float) -> Optional[bool]:
+        """Ждёт завершения процесса pid по pidfd не дольше timeout секунд."""
+        try:
+            fd = self._open_pidfd(pid)
+        except ProcessLookupError:
+            return True
+        if fd is None:
+            return None
+        import select
+
+        poller = select.poll()
+        poller.register(fd, select.POLLIN)
+        if poller.poll(max(0, int(timeout * 1000))):
+            self._close_pidfd()
+            return True
+        return False
+
+    def _open_pidfd(self, pid: int) -> Optional[int]:
+        if self._pidfd is not None and self._pidfd[0] == pid:
+            return self._pidfd[1]
+        self._close_pidfd()
+        pidfd_open = getattr(os, "pidfd_open", None)
+        if pidfd_open is None:
+            return None
+        try:
+            fd = int(pidfd_open(pid))
+        except ProcessLookupError:
+            raise
+        except OSError:
+            return None
+        self._pidfd = (pid, fd)
+        return fd
+
+    def _close_pidfd(self) -> None:
+        if self._pidfd is not None:
+            os.close(self._pidfd[1])
+            self._pidfd = None
+
+    def close(self) -> None:
+        """Закрывает открытый pidfd."""
+        self._close_pidfd()
+
+
+class Win32Backend:
+    """Windows: снимок процессов Toolhelp32 и ожидание на хэндле процесса."""
+
+    poll_interval = 1.0
+
+    _TH32CS_SNAPPROCESS = 0x00000002
+    _SYNCHRONIZE = 0x00100000
+    _WAIT_OBJECT_0 = 0x00000000
+    _WAIT_TIMEOUT = 0x00000102
+
+    # Модуль ctypes и функции kernel32 — задаются только в Windows.
+    _ctypes: Any
+    _kernel32: Any
+    _entry_type: Any
+    _handle: tuple[int, int] | None
+
+    def __init__(self) -> None:
+        """Загружает kernel32; OSError вне Windows."""
+        if sys.platform != "win32":
+            raise OSError("Toolhelp32 is only available on Windows")
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", wintypes.DWORD),
+                ("cntUsage", wintypes.DWORD),
+                ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", wintypes.DWORD),
+                ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD),
+                ("pcPriClassBase", wintypes.LONG),
+                ("dwFlags", wintypes.DWORD),
+                ("szExeFile", wintypes.WCHAR * 260),
+            ]
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+        kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        kernel32.WaitForSingleObject.restype = wintypes.DWORD
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._ctypes = ctypes
+        self._kernel32 = kernel32
+        self._entry_type = PROCESSENTRY32W
+        self._handle = None
+
+    def find(self, name: str) -> Optional[int]:
+        """Возвращает pid первого процесса с образом name."""
+        ctypes = self._ctypes
+        kernel32 = self._kernel32
+        snapshot = kernel32.CreateToolhelp32Snapshot(self._TH32CS_SNAPPROCESS, 0)
+        if not snapshot or snapshot == ctypes.c_void_p(-1).value:
+            logger.debug("CreateToolhelp32Snapshot failed: %s", ctypes.get_last_error())
+            return None
+        try:
+            entry = self._entry_type()
+            entry.dwSize = ctypes.sizeof(entry)
+            target = name.lower()
+            ok = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while ok:
+                if entry.szExeFile.lower() == target:
+                    return int(entry.th32ProcessID)
+                ok = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            kernel32.CloseHandle(snapshot)
+        return None
+
+    def wait_exit(self, pid: int, timeout: float) -> Optional[bool]:
+        """Ждёт завершения процесса pid на его хэндле не дольше timeout секунд."""
+        handle = self._open(pid)
+        if handle is None:
+            return None
+        result = self._kernel32.WaitForSingleObject(handle, max(0, int(timeout * 1000)))
+        if result == self._WAIT_TIMEOUT:
+            return False
+        self._close_handle()
+        return True if result == self._WAIT_OBJECT_0 else None
+
+    def _open(self, pid: int) -> Optional[int]:
+        if self._handle is not None and self._handle[0] == pid:
+            return self._handle[1]
+        self._close_handle()
+        handle = self._kernel32.OpenProcess(self._SYNCHRONIZE, False, pid)
+        if not handle:
+            return None
+        self._handle = (pid, int(handle))
+        return self._handle[1]
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            self._kernel32.CloseHandle(self._handle[1])
+            self._handle = None
+
+    def close(self) -> None:
+        """Закрывает открытый хэндл процесса."""
+        self._close_handle()
+
+
+def build_process_backend(name: str = "auto") -> ProcessBackend:
+    """Создаёт бэкенд поиска процессов по имени или по платформе.
+
+    auto: Windows — Toolhelp32, Linux — /proc, иначе psutil (если
+    установлен) и в последнюю очередь tasklist. Недоступный бэкенд
+    заменяется следующим по цепочке auto.
+    """
+    if name not in PROCESS_BACKENDS:
+        logger.warning("Unknown process backend %r, using auto", name)
+        name = "auto"
+    if name == "tasklist":
+        return TasklistBackend()
+    candidates: list[str] = [name] if name != "auto" else []
+    if sys.platform == "win32":
+        candidates.append("win32")
+    elif Path("/proc/self/comm").exists():
+        candidates.append("procfs")
+    candidates.append("psutil")
+    for candidate in candidates:
+        try:
+            if candidate == "win32":
+                return Win32Backend()
+            if candidate == "procfs":
+                return ProcfsBackend()
+            if candidate == "psutil":
+                return PsutilBackend()
+        except (ImportError, OSError, AttributeError) as exc:
+            logger.debug("Process backend %s unavailable: %s", candidate, exc)
+    return TasklistBackend()
+
+
+__all__ = [
+    "PROCESS_BACKENDS",
+    "ProcessBackend",
+    "ProcfsBackend",
+    "PsutilBackend",
+    "TasklistBackend",
+    "Win32Backend",
+    "build_process_backend",
+]
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FORMATS = ("speedscope", "collapsed")
+
+# Стек потока: имя потока и code-объекты от корня к листу.
+_StackKey = tuple[str, tuple[CodeType, ...]]
+
+
+class SamplingProfiler:
+    """Сэмплирующий профилировщик всех потоков процесса.
+
+    Фоновый поток с частотой hz снимает sys._current_frames() и копит
+    счётчики одинаковых стеков; код HUD при этом не инструментируется.
+    Накладные расходы ограничены: если снятие сэмпла занимает больше
+    max_overhead от интервала, интервал растягивается; глубина стека
+    обрезается до max_depth, а запись останавливается сама через
+    max_seconds. По stop() или по истечении max_seconds результат пишется
+    в output_dir в формате speedscope (JSON) или collapsed stacks
+    (flamegraph.pl, inferno); об автоостановке сообщает on_auto_stop
+    (вызывается в потоке профилировщика).
+    """
+
+    def __init__(
+        self,
+        hz: int = 100,
+        output_dir: Path = Path("profiles"),
+        output_format: str = "speedscope",
+        max_seconds: float = 300.0,
+        max_overhead: float = 0.02,
+        max_depth: int = 64,
+        on_auto_stop: Callable[[Path | None], None] | None = None,
+    ) -> None:
+        """Создаёт профилировщик; сэмплирование начинается с start()."""
+        if output_format not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format: {output_format}")
+        self._interval = 1.0 / max(1, hz)
+        self._output_dir = Path(output_dir)
+        self._format = output_format
+        self._max_seconds = max_seconds
+        self._max_overhead = max(0.001, max_overhead)
+        self._max_depth = max(1, max_depth)
+        self._on_auto_stop = on_auto_stop
+        self._stacks: Counter[_StackKey] = Counter()
+        self._thread_names: dict[int, str] = {}
+        self._samples = 0
+        self._sample_seconds = 0.0
+        self._started_at = 0.0
+        self._stopped_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Завершение записи (stop() или автоостановка) выполняется один раз.
+        self._finish_lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Возвращает признак идущей записи."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def samples(self) -> int:
+        """Возвращает число снятых сэмплов."""
+        return self._samples
+
+    @property
+    def overhead(self) -> float:
+        """Возвращает долю времени записи, ушедшую на снятие сэмплов."""
+        duration = (self._stopped_at or time.perf_counter()) - self._started_at
+        return self._sample_seconds / duration if duration > 0 else 0.0
+
+    def start(self) -> None:
+        """Начинает новую запись (предыдущие сэмплы сбрасываются)."""
+        if self.is_running:
+            return
+        self._stacks.clear()
+        self._thread_names.clear()
+        self._samples = 0
+        self._sample_seconds = 0.0
+        self._started_at = time.perf_counter()
+        self._stopped_at = 0.0
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="SamplingProfiler", daemon=True
+        )
+        self._thread.start()
+        logger.info("Profiler started (%.0f Hz)", 1.0 / self._interval)
+
+    def stop(self) -> Path | None:
+        """Останавливает запись и сохраняет профиль; возвращает путь к файлу.
+
+        Если запись уже остановилась сама по max_seconds, профиль сохранён
+        ею и stop() возвращает None.
+        """
+        thread = self._thread
+        if thread is None:
+            return None
+        self._stop_event.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        return self._finish(thread)
+
+    def toggle(self) -> Path | None:
+        """Запускает или останавливает запись; при остановке возвращает путь."""
+        if self.is_running:
+            return self.stop()
+        self.start()
+        return None
+
+    def write(self, path: Path) -> None:
+        """Сохраняет накопленные сэмплы в path в формате профилировщика."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self._format == "collapsed":
+            path.write_text(self.collapsed(), encoding="utf-8")
+        else:
+            path.write_text(json.dumps(self.speedscope()), encoding="utf-8")
+
+    def collapsed(self) -> str:
+        """Возвращает стеки в формате collapsed: «поток;f1;f2 count»."""
+        lines = []
+        for (thread_name, codes), count in self._stacks.most_common():
+            frames = ";".join(_frame_name(code) for code in codes)
+            lines.append(f"{thread_name};{frames} {count}" if frames else f"{thread_name} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> dict[str, Any]:
+        """Возвращает профиль в формате speedscope (по профилю на поток)."""
+        frame_index: dict[CodeType, int] = {}
+        frames: list[dict[str, Any]] = []
+        by_thread: dict[str, tuple[list[list[int]], list[float]]] = {}
+        for (thread_name, codes), count in self._stacks.items():
+            stack = []
+            for code in codes:
+                index = frame_index.get(code)
+                if index is None:
+                    index = frame_index[code] = len(frames)
+                    frames.append(
+                        {
+                            "name": code.co_name,
+                            "file": code.co_filename,
+                            "line": code.co_firstlineno,
+                        }
+                    )
+                stack.append(index)
+            samples, weights = by_thread.setdefault(thread_name, ([], []))
+            samples.append(stack)
+            weights.append(count * self._interval)
+        duration = (self._stopped_at or time.perf_counter()) - self._started_at
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread_name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": duration,
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread_name, (samples, weights) in sorted(by_thread.items())
+            ],
+            "name": "d2hub",
+            "exporter": "dota_hud.sampling_profiler",
+        }
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        deadline = self._started_at + self._max_seconds
+        delay = self._interval
+        reached_limit = False
+        try:
+            while not self._stop_event.wait(delay):
+                started = time.perf_counter()
+                if started >= deadline:
+                    logger.info("Profiler reached max duration, stopping")
+                    reached_limit = True
+                    break
+                self._sample(own_ident)
+                cost = time.perf_counter() - started
+                self._sample_seconds += cost
+                # Держим долю сэмплирования не выше max_overhead.
+                delay = max(self._interval, cost / self._max_overhead) - cost
+        finally:
+            self._stopped_at = time.perf_counter()
+        if reached_limit:
+            # Сохраняем сразу: следующий start() сбросил бы накопленные стеки.
+            path = self._finish(threading.current_thread())
+            if self._on_auto_stop is not None:
+                self._on_auto_stop(path)
+
+    def _finish(self, thread: threading.Thread) -> Path | None:
+        with self._finish_lock:
+            if self._thread is not thread:
+                return None
+            self._thread = None
+        if not self._samples:
+            logger.info("Profiler stopped without samples")
+            return None
+        path = self._output_path()
+        try:
+            self.write(path)
+        except OSError as exc:
+            logger.error("Failed to write profile %s: %s", path, exc)
+            return None
+        logger.info(
+            "Profiler stopped: %d samples, overhead %.2f%%, saved to %s",
+            self._samples,
+            self.overhead * 100,
+            path,
+        )
+        return path
+
+    def _sample(self, own_ident: int) -> None:
+        names = self._thread_names
+        max_depth = self._max_depth
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            name = names.get(ident)
+            if name is None:
+                names.update((t.ident, t.name) for t in threading.enumerate() if t.ident)
+                name = names.setdefault(ident, f"thread-{ident}")
+            self._stacks[(name, _stack(frame, max_depth))] += 1
+        self._samples += 1
+
+    def _output_path(self) -> Path:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        suffix = ".collapsed.txt" if self._format == "collapsed" else ".speedscope.json"
+        return self._output_dir / f"hud-{stamp}{suffix}"
+
+
+def _stack(frame: FrameType | None, max_depth: int) -> tuple[CodeType, ...]:
+    codes: list[CodeType] = []
+    while frame is not None and len(codes) < max_depth:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    return tuple(codes)
+
+
+def _frame_name(code: CodeType) -> str:
+    filename = code.co_filename.replace("\\", "/").rsplit("/", 1)[-1]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+__all__ = ["PROFILE_FORMATS", "SamplingProfiler"]
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import importlib.abc
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class ImportTiming:
+    """Время импорта модуля: полное (с вложенными импортами) и собственное."""
+
+    name: str
+    inclusive: float = 0.0
+    self_time: float = 0.0
+
+
+class _TimedLoader:
+    """Обёртка загрузчика, замеряющая exec_module; остальное проксируется."""
+
+    def __init__(self, loader: Any, timer: "ImportTimer") -> None:
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: Any) -> Any:
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create is not None else None
+
+    def exec_module(self, module: Any) -> None:
+        # Модуль не должен видеть обёртку после импорта (importlib.resources и т.п.).
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        self._timer._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._leave()
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder, собирающий время импорта каждого модуля.
+
+    Сам модули не ищет: спрашивает следующие finder'ы в sys.meta_path и
+    оборачивает загрузчик найденного spec. Собственное время модуля —
+    полное минус время импортов, сделанных из него.
+    """
+
+    def __init__(self) -> None:
+        """Создаёт таймер; установка — install()."""
+        self.timings: dict[str, ImportTiming] = {}
+        self._stack: list[tuple[str, float, float]] = []
+
+    def install(self) -> None:
+        """Ставит таймер первым в sys.meta_path."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        """Убирает таймер из sys.meta_path."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname: str, path: Any = None, target: Any = None) -> Any:
+        """Находит spec через остальные finder'ы и оборачивает его загрузчик."""
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self)
+            return spec
+        return None
+
+    def top(self, limit: int = 25) -> list[ImportTiming]:
+        """Возвращает самые дорогие импорты по собственному времени."""
+        return sorted(self.timings.values(), key=lambda t: t.self_time, reverse=True)[:limit]
+
+    def _enter(self, name: str) -> None:
+        self._stack.append((name, time.perf_counter(), 0.0))
+
+    def _leave(self) -> None:
+        name, started, children = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        timing = self.timings.setdefault(name, ImportTiming(name))
+        timing.inclusive += elapsed
+        timing.self_time += elapsed - children
+        if self._stack:
+            parent, parent_started, parent_children = self._stack[-1]
+            self._stack[-1] = (parent, parent_started, parent_children + elapsed)
+
+
+def resident_memory() -> int | None:
+    """Возвращает резидентную память процесса в байтах (None если неизвестно)."""
+    if sys.platform == "win32":
+        return _resident_memory_windows()
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Запасной вариант — пиковое значение: КБ в Linux, байты в macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _resident_memory_windows() -> int | None:
+    if sys.platform != "win32":
+        return None
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi = ctypes.WinDLL("psapi")
+    ok = psapi.GetProcessMemoryInfo(
+        kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+    )
+    return int(counters.WorkingSetSize) if ok else None
+
+
+class StartupProfile:
+    """Профиль запуска: импорты, фазы старта и резидентная память.
+
+    mark() отмечает конец фазы; report() собирает текст для --startup-profile.
+    """
+
+    def __init__(self) -> None:
+        """Создаёт профиль и ставит таймер импортов."""
+        self._started = time.perf_counter()
+        self._phases: list[tuple[str, float, int | None]] = []
+        self.imports = ImportTimer()
+        self.imports.install()
+
+    def mark(self, phase: str) -> None:
+        """Отмечает завершение фазы запуска."""
+        self._phases.append((phase, time.perf_counter() - self._started, resident_memory()))
+
+    def report(self, limit: int = 25) -> str:
+        """Останавливает таймер импортов и возвращает отчёт."""
+        self.imports.uninstall()
+        lines = ["Startup phases:"]
+        previous = 0.0
+        for phase, at, rss in self._phases:
+            memory = f"{rss / 2**20:8.1f} MiB" if rss is not None else "       n/a"
+            delta = (at - previous) * 1000
+            lines.append(f"  {at * 1000:8.1f} ms  (+{delta:7.1f})  {memory}  {phase}")
+            previous = at
+        total = sum(t.self_time for t in self.imports.timings.values())
+        lines.append(
+            f"Imports: {len(self.imports.timings)} modules, {total * 1000:.1f} ms"
+        )
+        lines.append("      self  inclusive  module")
+        for timing in self.imports.top(limit):
+            lines.append(
+                f"  {timing.self_time * 1000:8.1f} {timing.inclusive * 1000:10.1f}  {timing.name}"
+            )
+        return "\n".join(lines)
+
+
+__all__ = ["ImportTiming", "ImportTimer", "StartupProfile", "resident_memory"]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Optional
+
+from ..application.hud_port import HudPort, HudSchedulePort
+from ..application.models import HudState, MacroLine
+
+# set_* блоков, которые целиком перекрывает apply(HudState).
+_STATE_SETTERS = ("set_timer", "set_warning", "set_now", "set_next", "set_macro")
+
+
+class DeferredHud:
+    """HUD, окно которого создаётся только при первом показе.
+
+    До show() (или run()) вызовы apply() и set_* запоминаются — по
+    последнему на каждый блок — и переигрываются в созданном окне;
+    таймеры и post() идут через отдельный лёгкий scheduler, поэтому цикл
+    контроллера работает и без окна. Так приложение до обнаружения Dota живёт в
+    трее, не тратя время и память на виджеты HUD.
+    """
+
+    def __init__(self, factory: Callable[[], HudPort], scheduler: HudSchedulePort) -> None:
+        """Создаёт обёртку; factory вызывается один раз при материализации."""
+        self._factory = factory
+        self._scheduler = scheduler
+        self._hud: HudPort | None = None
+        self._pending: dict[str, tuple[Any, ...]] = {}
+        self._lock_toggles = 0
+        self._on_close: Callable[[], None] | None = None
+        self._paint_probe: Optional[Callable[[float], None]] = None
+
+    @property
+    def materialized(self) -> bool:
+        """Возвращает признак созданного окна HUD."""
+        return self._hud is not None
+
+    def materialize(self) -> HudPort:
+        """Создаёт окно (если ещё нет) и переносит в него накопленное состояние."""
+        if self._hud is not None:
+            return self._hud
+        hud = self._factory()
+        if self._on_close is not None:
+            hud.set_on_close(self._on_close)
+        set_paint_probe = getattr(hud, "set_paint_probe", None)
+        if set_paint_probe is not None and self._paint_probe is not None:
+            set_paint_probe(self._paint_probe)
+        if self._lock_toggles % 2:
+            hud.toggle_lock()
+        for name, args in self._pending.items():
+            getattr(hud, name)(*args)
+        self._pending.clear()
+        self._hud = hud
+        return hud
+
+    def _forward(self, name: str, *args: Any) -> None:
+        if self._hud is None:
+            self._pending[name] = args
+        else:
+            getattr(self._hud, name)(*args)
+
+    def apply(self, state: HudState) -> None:
+        """Применяет состояние HUD (до создания окна — запоминает целиком)."""
+        if self._hud is None:
+            for name in _STATE_SETTERS:
+                self._pending.pop(name, None)
+            self._pending.pop("apply", None)
+        self._forward("apply", state)
+
+    def set_warning(self, text: str | None, level: str | None = None) -> None:
+        """Устанавливает уровень предупреждения."""
+        self._forward("set_warning", text, level)
+
+    def set_timer(self, text: str) -> None:
+        """Обновляет текст таймера."""
+        self._forward("set_timer", text)
+
+    def set_now(self, text: str, level: str | None = None) -> None:
+        """Обновляет блок NOW."""
+        self._forward("set_now", text, level)
+
+    def set_next(self, text: str, level: str | None = None) -> None:
+        """Обновляет блок NEXT."""
+        self._forward("set_next", text, level)
+
+    def set_macro(
+        self,
+        text: str,
+        level: str | None = None,
+        lines: list[MacroLine] | None = None,
+    ) -> None:
+        """Обновляет блок MACRO."""
+        self._forward("set_macro", text, level, lines)
+
+    def set_build(self, text: str) -> None:
+        """Обновляет блок BUILD."""
+        self._forward("set_build", text)
+
+    def every(self, ms: int, fn: Callable[[], None]) -> None:
+        """Планирует вызов функции в цикле UI."""
+        self._scheduler.every(ms, fn)
+
+    def post(self, fn: Callable[[], None]) -> None:
+        """Потокобезопасно ставит вызов функции в цикл UI."""
+        self._scheduler.post(fn)
+
+    def set_paint_probe(self, probe: Optional[Callable[[float], None]]) -> None:
+        """Устанавливает обработчик отрисовки (передаётся окну, если оно его знает)."""
+        self._paint_probe = probe
+        set_paint_probe = getattr(self._hud, "set_paint_probe", None)
+        if set_paint_probe is not None:
+            set_paint_probe(probe)
+
+    def set_on_close(self, callback: Callable[[], None]) -> None:
+        """Устанавливает обработчик закрытия окна."""
+        self._on_close = callback
+        if self._hud is not None:
+            self._hud.set_on_close(callback)
+
+    def toggle_lock(self) -> None:
+        """Переключает режим блокировки (до создания окна — запоминает)."""
+        if self._hud is None:
+            self._lock_toggles += 1
+        else:
+            self._hud.toggle_lock()
+
+    def show(self) -> None:
+        """Создаёт окно при первом вызове и показывает его."""
+        self.materialize().show()
+
+    def hide(self) -> None:
+        """Скрывает окно HUD, если оно создано."""
+        if self._hud is not None:
+            self._hud.hide()
+
+    def isVisible(self) -> bool:
+        """Возвращает True если окно создано и видимо."""
+        return self._hud is not None and self._hud.isVisible()
+
+    def run(self) -> None:
+        """Запускает цикл UI окна HUD."""
+        self.materialize().run()
+
+    def close(self) -> None:
+        """Закрывает окно HUD, если оно создано."""
+        if self._hud is not None:
+            self._hud.close()
+
+
+__all__ = ["DeferredHud"]
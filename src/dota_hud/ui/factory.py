@@ -8,8 +8,13 @@ from .hud_style import HudStyle
 class UiFactory:
     """Создаёт HUD окно на основе конфигурации."""
 
-    def build(self, config: HudConfig) -> HudPort:
-        """Создаёт реализацию HUD по имени UI."""
+    def build(self, config: HudConfig, lazy: bool = False) -> HudPort:
+        """Создаёт реализацию HUD по имени UI.
+
+        qt — окно из QLabel, canvas — одно окно с отрисовкой блоков в
+        paintEvent (HudCanvas). При lazy окно Qt создаётся только при
+        первом показе (DeferredHud).
+        """
         ui_name = (config.ui or "qt").lower()
         style = HudStyle(
             title=config.title,
@@ -30,11 +35,29 @@ class UiFactory:
             macro_line_spacing=config.macro_line_spacing,
             macro_bar_height=config.macro_bar_height,
             macro_show_title=config.macro_show_title,
+            animation_fps=config.animation_fps,
         )
 
-        if ui_name == "qt":
-            from .qt.hud_window import HudQt
+        if ui_name in ("qt", "canvas"):
+            if lazy:
+                from .deferred import DeferredHud
+                from .qt.scheduler import QtScheduler
+
+                return DeferredHud(lambda: self._build_qt(style, ui_name), QtScheduler())
+            return self._build_qt(style, ui_name)
+        if ui_name == "headless":
+            from .headless import HeadlessHud
 
-            return HudQt(style)
+            return HeadlessHud()
 
         raise ValueError(f"Unsupported HUD UI backend: {ui_name}")
+
+    @staticmethod
+    def _build_qt(style: HudStyle, ui_name: str = "qt") -> HudPort:
+        if ui_name == "canvas":
+            from .qt.hud_canvas import HudCanvas
+
+            return HudCanvas(style)
+        from .qt.hud_window import HudQt
+
+        return HudQt(style)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from queue import Empty, SimpleQueue
+from typing import Any, Callable
+
+from ..application.models import HudState, MacroLine
+
+
+@dataclass(frozen=True)
+class HudCall:
+    """Один вызов set_* с моментом вызова (мс по часам HUD)."""
+
+    at_ms: float
+    name: str
+    args: tuple[Any, ...]
+
+
+class HeadlessHud:
+    """HUD без окна: пишет вызовы set_* в кольцевой буфер.
+
+    Цикл UI эмулируется очередью таймеров. В режиме реального времени
+    run() спит до ближайшего таймера или post(); с виртуальными часами
+    (virtual_clock=True) время двигает вызывающий код через run_pending(),
+    и таймеры срабатывают без ожидания — так прогоняются бенчмарки и
+    реплеи на машинах без дисплея.
+    """
+
+    def __init__(self, capacity: int = 1024, virtual_clock: bool = False) -> None:
+        """Создаёт HUD с буфером на capacity последних вызовов."""
+        self.calls: deque[HudCall] = deque(maxlen=capacity)
+        self.frames = 0
+        self._virtual = virtual_clock
+        self._now_ms = 0.0
+        self._origin = time.perf_counter()
+        self._timers: list[tuple[float, int, Callable[[], None]]] = []
+        self._order = itertools.count()
+        self._posted: SimpleQueue[Callable[[], None]] = SimpleQueue()
+        self._wakeup = threading.Event()
+        self._visible = False
+        self._locked = False
+        self._closed = False
+        self._on_close: Callable[[], None] | None = None
+        self._applied: HudState | None = None
+
+    def now_ms(self) -> float:
+        """Возвращает время по часам HUD в миллисекундах."""
+        if self._virtual:
+            return self._now_ms
+        return (time.perf_counter() - self._origin) * 1000.0
+
+    @property
+    def locked(self) -> bool:
+        """Возвращает признак блокировки HUD."""
+        return self._locked
+
+    def last(self, name: str) -> HudCall | None:
+        """Возвращает последний вызов метода name из буфера."""
+        for call in reversed(self.calls):
+            if call.name == name:
+                return call
+        return None
+
+    def apply(self, state: HudState) -> None:
+        """Запоминает кадр: в буфер попадают только изменившиеся блоки."""
+        self.frames += 1
+        previous, self._applied = self._applied, state
+        if previous is not None and state is previous:
+            return
+        if previous is None or state.timer_text != previous.timer_text:
+            self._record("set_timer", state.timer_text)
+        if previous is None or state.warning != previous.warning:
+            self._record("set_warning", state.warning.text, state.warning.level)
+        if previous is None or (state.now_text, state.now_level) != (
+            previous.now_text,
+            previous.now_level,
+        ):
+            self._record("set_now", state.now_text, state.now_level)
+        if previous is None or (state.next_text, state.next_level) != (
+            previous.next_text,
+            previous.next_level,
+        ):
+            self._record("set_next", state.next_text, state.next_level)
+        if previous is None or (state.macro_text, state.macro_level, state.macro_lines) != (
+            previous.macro_text,
+            previous.macro_level,
+            previous.macro_lines,
+        ):
+            self._record("set_macro", state.macro_text, state.macro_level, state.macro_lines)
+
+    def set_warning(self, text: str | None, level: str | None = None) -> None:
+        """Запоминает предупреждение."""
+        self._record("set_warning", text, level)
+
+    def set_timer(self, text: str) -> None:
+        """Запоминает таймер; каждый цикл HUD начинается с него."""
+        self.frames += 1
+        self._record("set_timer", text)
+
+    def set_now(self, text: str, level: str | None = None) -> None:
+        """Запоминает блок NOW."""
+        self._record("set_now", text, level)
+
+    def set_next(self, text: str, level: str | None = None) -> None:
+        """Запоминает блок NEXT."""
+        self._record("set_next", text, level)
+
+    def set_macro(
+        self,
+        text: str,
+        level: str | None = None,
+        lines: list[MacroLine] | None = None,
+    ) -> None:
+        """Запоминает блок MACRO."""
+        self._record("set_macro", text, level, tuple(lines or ()))
+
+    def set_build(self, text: str) -> None:
+        """Запоминает блок BUILD."""
+        self._record("set_build", text)
+
+    def every(self, ms: int, fn: Callable[[], None]) -> None:
+        """Планирует однократный вызов через ms миллисекунд."""
+        heapq.heappush(self._timers, (self.now_ms() + ms, next(self._order), fn))
+        self._wakeup.set()
+
+    def post(self, fn: Callable[[], None]) -> None:
+        """Потокобезопасно ставит вызов в цикл HUD."""
+        self._posted.put(fn)
+        self._wakeup.set()
+
+    def set_on_close(self, callback: Callable[[], None]) -> None:
+        """Устанавливает обработчик закрытия."""
+        self._on_close = callback
+
+    def toggle_lock(self) -> None:
+        """Переключает блокировку."""
+        self._locked = not self._locked
+
+    def show(self) -> None:
+        """Помечает HUD видимым."""
+        self._visible = True
+
+    def hide(self) -> None:
+        """Помечает HUD скрытым."""
+        self._visible = False
+
+    def isVisible(self) -> bool:
+        """Возвращает признак видимости."""
+        return self._visible
+
+    def run(self) -> None:
+        """Крутит цикл HUD в реальном времени до close()."""
+        self.show()
+        while not self._closed:
+            self._wakeup.clear()
+            self.run_pending()
+            if self._closed:
+                break
+            timeout = None
+            if self._timers:
+                timeout = max(0.0, (self._timers[0][0] - self.now_ms()) / 1000.0)
+            self._wakeup.wait(timeout)
+
+    def run_pending(self, advance_ms: float = 0.0) -> int:
+        """Выполняет готовые вызовы и возвращает их число.
+
+        С виртуальными часами время сначала сдвигается на advance_ms, а
+        таймеры, которые успели запланировать себя повторно в пределах этого
+        окна, тоже выполняются.
+        """
+        if self._virtual:
+            self._now_ms += advance_ms
+        executed = 0
+        while not self._closed:
+            try:
+                fn = self._posted.get_nowait()
+            except Empty:
+                if not self._timers or self._timers[0][0] > self.now_ms():
+                    break
+                fn = heapq.heappop(self._timers)[2]
+            fn()
+            executed += 1
+        return executed
+
+    def close(self) -> None:
+        """Останавливает цикл HUD."""
+        self._closed = True
+        self._wakeup.set()
+
+    def _record(self, name: str, *args: Any) -> None:
+        self.calls.append(HudCall(self.now_ms(), name, args))
+
+
+__all__ = ["HeadlessHud", "HudCall"]
@@ -25,3 +25,4 @@ class HudStyle:
     macro_line_spacing: int
     macro_bar_height: int
     macro_show_title: bool
+    animation_fps: int = 60
@@ -94,7 +94,8 @@ class AdminWindow(QtWidgets.QWidget):
         self.tabs.addTab(self._build_macro_tab(), "Macro")
         self.tabs.addTab(self._build_build_tab(), "Сборка")
         self.tabs.addTab(self._build_settings_tab(), "Настройки")
-        self.tabs.addTab(self._build_status_tab(), "Статус")
+        self._status_tab = self._build_status_tab()
+        self.tabs.addTab(self._status_tab, "Статус")
 
         layout.addWidget(self.tabs)
 
@@ -269,6 +270,18 @@ class AdminWindow(QtWidgets.QWidget):
             label.setStyleSheet("font-size: 14px; padding: 12px; background: #141820; border-radius: 8px;")
             layout.addWidget(label)
 
+        self.status_latency = QtWidgets.QLabel("Задержки: —")
+        self.status_latency.setStyleSheet(
+            "font-family: monospace; font-size: 12px; padding: 12px;"
+            " background: #141820; border-radius: 8px;"
+        )
+        self.status_latency.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+        layout.addWidget(self.status_latency)
+
+        btn_latency = QtWidgets.QPushButton("Обновить задержки")
+        btn_latency.clicked.connect(self._handle_refresh_latency)
+        layout.addWidget(btn_latency)
+
         btn_recreate = QtWidgets.QPushButton("Пересоздать GSI конфиг")
         btn_recreate.setObjectName("btn_add")
         btn_recreate.clicked.connect(self._handle_recreate_gsi)
@@ -286,6 +299,24 @@ class AdminWindow(QtWidgets.QWidget):
         """Устанавливает callback для пересоздания GSI конфига."""
         self._on_recreate_gsi = callback
 
+    def set_on_refresh_latency(self, callback: "Callable[[], str]") -> None:
+        """Устанавливает callback, возвращающий отчёт о задержках HUD."""
+        self._on_refresh_latency = callback
+
+    def set_latency_report(self, text: str) -> None:
+        """Показывает отчёт о задержках на вкладке статуса."""
+        self.status_latency.setText(f"Задержки GSI → HUD:\n{text}")
+
+    def show_status_tab(self) -> None:
+        """Показывает окно на вкладке статуса."""
+        self.tabs.setCurrentWidget(self._status_tab)
+        self.show()
+
+    def _handle_refresh_latency(self) -> None:
+        callback = getattr(self, "_on_refresh_latency", None)
+        if callback:
+            self.set_latency_report(callback())
+
     def _handle_recreate_gsi(self) -> None:
         if hasattr(self, "_on_recreate_gsi") and self._on_recreate_gsi:
             self._on_recreate_gsi()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from PySide6 import QtCore
+
+DEFAULT_ANIMATION_FPS = 60
+
+
+def _in_out_quad(progress: float) -> float:
+    """Кривая InOutQuad (как QEasingCurve.InOutQuad)."""
+    if progress < 0.5:
+        return 2.0 * progress * progress
+    return 1.0 - (-2.0 * progress + 2.0) ** 2 / 2.0
+
+
+@dataclass
+class Tween:
+    """Переход значения от start к end за duration секунд.
+
+    then — необязательный второй участок (через сколько секунд после
+    старта и к какому значению): значение плавно возвращается к нему от
+    текущего за ту же длительность.
+    """
+
+    start: float
+    end: float
+    duration: float
+    started_at: float
+    then: Optional[tuple[float, float]] = None
+
+    def value_at(self, now: float) -> float:
+        """Значение перехода в момент now."""
+        if self.duration <= 0:
+            return self.end
+        progress = min(1.0, max(0.0, (now - self.started_at) / self.duration))
+        return self.start + (self.end - self.start) * _in_out_quad(progress)
+
+    def finished_at(self, now: float) -> bool:
+        """Возвращает признак завершения основного участка к моменту now."""
+        return now - self.started_at >= self.duration
+
+
+class FrameClock(QtCore.QObject):
+    """Общие часы анимаций окна HUD.
+
+    Все переходы (подсветка блоков, вспышка предупреждения) продвигаются
+    одним таймером не чаще fps раз в секунду; после каждого кадра
+    on_frame получает имена изменившихся значений — окно перекрашивает
+    их и перерисовывается один раз. Когда активных переходов нет,
+    таймер остановлен. При fps <= 0 переходы не анимируются: значение
+    сразу становится конечным.
+    """
+
+    def __init__(
+        self,
+        on_frame: Callable[[set[str]], None],
+        fps: int = DEFAULT_ANIMATION_FPS,
+        parent: QtCore.QObject | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Создаёт часы; on_frame вызывается в потоке UI после кадра."""
+        super().__init__(parent)
+        self._on_frame = on_frame
+        self._clock = clock
+        self._fps = int(fps)
+        self._tweens: dict[str, Tween] = {}
+        self.values: dict[str, float] = {}
+        self._timer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        if self._fps > 0:
+            self._timer.setInterval(max(1, round(1000 / self._fps)))
+        self._timer.timeout.connect(self.tick)
+
+    @property
+    def fps(self) -> int:
+        """Возвращает ограничение кадров в секунду (0 — без анимации)."""
+        return self._fps
+
+    @property
+    def active(self) -> bool:
+        """Возвращает True пока есть незавершённые переходы."""
+        return bool(self._tweens)
+
+    def value(self, key: str, default: float = 0.0) -> float:
+        """Текущее значение по ключу."""
+        return self.values.get(key, default)
+
+    def animate(
+        self,
+        key: str,
+        end: float,
+        duration_ms: int,
+        start: float | None = None,
+        then: tuple[int, float] | None = None,
+    ) -> None:
+        """Запускает переход key к end (от start или от текущего значения).
+
+        then=(delay_ms, value): через delay_ms после старта значение
+        возвращается к value.
+        """
+        if self._fps <= 0:
+            final = then[1] if then is not None else end
+            self._tweens.pop(key, None)
+            if self.values.get(key) != final:
+                self.values[key] = final
+                self._on_frame({key})
+            return
+        if start is None:
+            start = self.values.get(key, 0.0)
+        self._tweens[key] = Tween(
+            start=float(start),
+            end=float(end),
+            duration=duration_ms / 1000,
+            started_at=self._clock(),
+            then=None if then is None else (then[0] / 1000, float(then[1])),
+        )
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self, key: str) -> None:
+        """Останавливает переход key, оставляя текущее значение."""
+        self._tweens.pop(key, None)
+        if not self._tweens:
+            self._timer.stop()
+
+    def tick(self) -> None:
+        """Продвигает все переходы на текущий момент и сообщает о кадре."""
+        now = self._clock()
+        changed: set[str] = set()
+        for key, tween in list(self._tweens.items()):
+            if tween.then is not None and now - tween.started_at >= tween.then[0]:
+                # Второй участок: от текущего значения обратно к then-значению.
+                current = tween.value_at(tween.started_at + tween.then[0])
+                tween = Tween(
+                    start=current,
+                    end=tween.then[1],
+                    duration=tween.duration,
+                    started_at=tween.started_at + tween.then[0],
+                )
+                self._tweens[key] = tween
+            value = tween.value_at(now)
+            if self.values.get(key) != value:
+                self.values[key] = value
+                changed.add(key)
+            if tween.then is None and tween.finished_at(now):
+                del self._tweens[key]
+        if not self._tweens:
+            self._timer.stop()
+        if changed:
+            self._on_frame(changed)
+
+
+__all__ = ["DEFAULT_ANIMATION_FPS", "FrameClock", "Tween"]
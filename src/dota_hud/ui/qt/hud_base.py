@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import abc
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from ..hud_style import HudStyle
+from ...application.models import HudState, MacroLine
+from .frame_clock import FrameClock
+from .scheduler import MainThreadInvoker
+from .styles import default_colors
+
+
+if TYPE_CHECKING:
+    _HudWindowMeta = abc.ABCMeta
+else:
+
+    class _HudWindowMeta(type(QtWidgets.QWidget)):
+        """Метакласс QWidget, запрещающий окна с нереализованными abstractmethod.
+
+        Метакласс Shiboken несовместим с проверкой abc.ABCMeta, поэтому
+        абстрактные методы ищутся при создании окна; для mypy это ABCMeta.
+        """
+
+        def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+            missing = sorted(
+                name
+                for name in dir(cls)
+                if getattr(getattr(cls, name, None), "__isabstractmethod__", False)
+            )
+            if missing:
+                raise TypeError(
+                    f"Can't instantiate abstract class {cls.__name__}: {', '.join(missing)}"
+                )
+            return super().__call__(*args, **kwargs)
+
+
+class HudWindowBase(QtWidgets.QWidget, metaclass=_HudWindowMeta):
+    """Общее поведение окон HUD (HudQt и HudCanvas).
+
+    Окно поверх игры без фокуса, блокировка с кликом сквозь окно,
+    перетаскивание, уровни подсветки блоков и вспышка предупреждения на
+    FrameClock, пакетное apply() и порты планирования/закрытия.
+    Наследник строит свои блоки после super().__init__(), обязан
+    реализовать абстрактные set_* и при необходимости переопределяет
+    _on_animation_frame и _finish_frame.
+    """
+
+    def __init__(self, style: HudStyle) -> None:
+        """Создаёт окно HUD и настраивает флаги окна."""
+        self._app = QtWidgets.QApplication.instance()
+        if self._app is None:
+            self._app = QtWidgets.QApplication([])
+
+        super().__init__()
+
+        self._style = style
+        self._colors = default_colors()
+        self._warning_level = ""
+        self._warning_block_strength = 0.0
+        self._warning_base_strength = 0.0
+        self._last_warning_text = ""
+        self._last_warning_level = ""
+        self._block_levels = {"now": "", "next": "", "macro": ""}
+        self._block_strengths = {"now": 0.0, "next": 0.0, "macro": 0.0}
+        self._clock = FrameClock(self._on_animation_frame, style.animation_fps, self)
+        self._auto_height_enabled = True
+        self._base_height = style.height
+        self._locked = False
+        self._drag_enabled = True
+        self._drag_offset = QtCore.QPoint()
+        self._on_close: Optional[Callable[[], None]] = None
+        self._closing = False
+
+        # apply(): последнее применённое состояние; внутри кадра наследник
+        # откладывает раскладку и перерисовку до _finish_frame().
+        self._applied: HudState | None = None
+        self._batching = False
+        self._layout_dirty = False
+
+        self._invoker = MainThreadInvoker(self)
+        self._paint_probe: Optional[Callable[[float], None]] = None
+        self._paint_pending = False
+
+        self._configure_window()
+
+    def _configure_window(self) -> None:
+        self.setWindowTitle(self._style.title)
+        flags = (
+            QtCore.Qt.FramelessWindowHint
+            | QtCore.Qt.WindowStaysOnTopHint
+            | QtCore.Qt.Tool
+            | QtCore.Qt.WindowDoesNotAcceptFocus
+        )
+        self.setWindowFlags(flags)
+        self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
+        self.setAttribute(QtCore.Qt.WA_ShowWithoutActivating, True)
+        self.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.resize(self._style.width, self._style.height)
+        self.move(self._style.x, self._style.y)
+
+    def _font(self, size: int, weight: str | None = None) -> QtGui.QFont:
+        font = QtGui.QFont(self._style.font_family)
+        font.setPointSize(size)
+        weight_value = self._weight_from_string(weight or self._style.font_weight)
+        font.setWeight(weight_value)
+        return font
+
+    @staticmethod
+    def _weight_from_string(weight: str) -> QtGui.QFont.Weight:
+        if weight.lower() == "bold":
+            return QtGui.QFont.Weight.Bold
+        return QtGui.QFont.Weight.Normal
+
+    def _parse_macro_color(self, value: str | None) -> QtGui.QColor:
+        if not value:
+            return self._colors.block_background
+        color = QtGui.QColor(str(value))
+        if not color.isValid():
+            return self._colors.block_background
+        return color
+
+    def _report_paint(self) -> None:
+        """Сообщает probe о первой отрисовке после изменения (конец paintEvent)."""
+        if self._paint_pending and self._paint_probe is not None:
+            self._paint_pending = False
+            self._paint_probe(time.perf_counter())
+
+    # ---- уровни подсветки ---------------------------------------------------
+
+    def _block_background_color(self, key: str) -> QtGui.QColor:
+        base = self._colors.block_background
+        level = self._block_levels.get(key, "")
+        strength = self._block_strengths.get(key, 0.0)
+        if level == "danger":
+            target = self._colors.warning_block_danger
+        elif level == "warn":
+            target = self._colors.warning_block_warn
+        else:
+            target = self._colors.block_background
+        return self._blend_colors(base, target, strength)
+
+    @staticmethod
+    def _blend_colors(
+        base: QtGui.QColor,
+        target: QtGui.QColor,
+        strength: float,
+    ) -> QtGui.QColor:
+        strength = max(0.0, min(1.0, float(strength)))
+        red = int(base.red() + (target.red() - base.red()) * strength)
+        green = int(base.green() + (target.green() - base.green()) * strength)
+        blue = int(base.blue() + (target.blue() - base.blue()) * strength)
+        return QtGui.QColor(red, green, blue)
+
+    @staticmethod
+    def _target_block_strength(level: str) -> float:
+        if level in {"danger", "warn"}:
+            return 1.0
+        if level == "info":
+            return 0.6
+        return 0.0
+
+    def _set_block_level(self, key: str, level: str | None) -> None:
+        normalized = str(level or "").lower()
+        if self._block_levels.get(key) == normalized:
+            return
+        self._block_levels[key] = normalized
+        self._clock.animate(
+            key,
+            self._target_block_strength(normalized),
+            450,
+            start=self._block_strengths.get(key, 0.0),
+        )
+
+    def _take_animation_values(self, changed: set[str]) -> None:
+        """Переносит значения кадра FrameClock в силы подсветки."""
+        values = self._clock.values
+        for key in changed:
+            value = max(0.0, min(1.0, values[key]))
+            if key == "warning":
+                self._warning_block_strength = value
+            else:
+                self._block_strengths[key] = value
+
+    def _on_animation_frame(self, changed: set[str]) -> None:
+        """Применяет кадр анимации; перерисовку выполняет наследник."""
+        self._take_animation_values(changed)
+
+    def _target_warning_strength(self) -> float:
+        if self._warning_level in {"danger", "warn"}:
+            return 1.0
+        if self._warning_level == "info":
+            return 0.6
+        return 0.0
+
+    def _base_warning_strength(self) -> float:
+        if self._warning_level in {"danger", "warn"}:
+            return 0.8 if self._warning_level == "danger" else 0.65
+        if self._warning_level == "info":
+            return 0.45
+        return 0.0
+
+    def _animate_warning_overlay(self) -> None:
+        self._warning_base_strength = self._base_warning_strength()
+        # Вспышка до полной силы и через 220 мс возврат к базовой подсветке.
+        self._clock.animate(
+            "warning",
+            self._target_warning_strength(),
+            240,
+            start=self._warning_base_strength,
+            then=(220, self._warning_base_strength),
+        )
+
+    def _update_warning_level(self, text: str | None, level: str | None) -> str | None:
+        """Запоминает текст и уровень предупреждения; None — если не изменились."""
+        warning_text = text or ""
+        if level is None and isinstance(text, bool):
+            warning_level = "warn" if text else ""
+        else:
+            warning_level = str(level or "")
+        if warning_text == self._last_warning_text and warning_level == self._last_warning_level:
+            return None
+        self._last_warning_text = warning_text
+        self._last_warning_level = warning_level
+        self._warning_level = warning_level
+        return warning_text
+
+    # ---- блокировка и перетаскивание ----------------------------------------
+
+    def _set_clickthrough(self, enabled: bool) -> None:
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, enabled)
+        self.setWindowFlag(QtCore.Qt.WindowTransparentForInput, enabled)
+        self.show()
+
+    def set_drag_enabled(self, enabled: bool) -> None:
+        """Включает или выключает перетаскивание окна."""
+        self._drag_enabled = bool(enabled)
+
+    def toggle_lock(self) -> None:
+        """Переключает режим блокировки."""
+        self.set_lock(not self._locked)
+
+    def set_lock(self, enabled: bool) -> None:
+        """Управляет блокировкой и кликом сквозь окно."""
+        enabled = bool(enabled)
+        self._locked = enabled
+        self.set_drag_enabled(not enabled)
+        self._set_clickthrough(enabled)
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
+        """Обрабатывает начало перетаскивания."""
+        if not self._drag_enabled or event.button() != QtCore.Qt.LeftButton:
+            super().mousePressEvent(event)
+            return
+        self._drag_offset = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
+        event.accept()
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
+        """Обрабатывает перемещение при перетаскивании."""
+        if not self._drag_enabled or not (event.buttons() & QtCore.Qt.LeftButton):
+            super().mouseMoveEvent(event)
+            return
+        self.move(event.globalPosition().toPoint() - self._drag_offset)
+        event.accept()
+
+    # ---- HudViewPort --------------------------------------------------------
+
+    def apply(self, state: HudState) -> None:
+        """Применяет состояние HUD целиком.
+
+        Поля сравниваются с прошлым состоянием, обновляются только
+        изменившиеся блоки; раскладка и перерисовка выполняются не больше
+        одного раза за кадр.
+        """
+        previous = self._applied
+        if previous is not None and (state is previous or state == previous):
+            return
+        self._batching = True
+        try:
+            if previous is None or state.timer_text != previous.timer_text:
+                self.set_timer(state.timer_text)
+            if previous is None or state.warning != previous.warning:
+                self.set_warning(state.warning.text, state.warning.level)
+            if (
+                previous is None
+                or state.now_text != previous.now_text
+                or state.now_level != previous.now_level
+            ):
+                self.set_now(state.now_text, state.now_level)
+            if (
+                previous is None
+                or state.next_text != previous.next_text
+                or state.next_level != previous.next_level
+            ):
+                self.set_next(state.next_text, state.next_level)
+            if (
+                previous is None
+                or state.macro_level != previous.macro_level
+                or state.macro_lines != previous.macro_lines
+            ):
+                self.set_macro(state.macro_text, state.macro_level, list(state.macro_lines))
+        finally:
+            self._batching = False
+        self._applied = state
+        self._finish_frame()
+
+    def _finish_frame(self) -> None:
+        """Выполняет отложенные внутри apply() раскладку и перерисовку."""
+
+    def _touch(self) -> None:
+        """Отмечает прямой вызов set_*: прошлое состояние apply() больше не точно."""
+        if not self._batching:
+            self._applied = None
+
+    @abc.abstractmethod
+    def set_timer(self, text: str) -> None:
+        """Обновляет текст таймера."""
+
+    @abc.abstractmethod
+    def set_warning(self, text: str | None, level: str | None = None) -> None:
+        """Обновляет визуальный уровень предупреждения."""
+
+    @abc.abstractmethod
+    def set_now(self, text: str, level: str | None = None) -> None:
+        """Обновляет блок NOW."""
+
+    @abc.abstractmethod
+    def set_next(self, text: str, level: str | None = None) -> None:
+        """Обновляет блок NEXT."""
+
+    @abc.abstractmethod
+    def set_macro(
+        self,
+        text: str,
+        level: str | None = None,
+        lines: list["MacroLine"] | None = None,
+    ) -> None:
+        """Обновляет блок MACRO."""
+
+    # ---- HudSchedulePort / HudControlPort -----------------------------------
+
+    def every(self, ms: int, fn: Callable[[], None]) -> None:
+        """Планирует повторный вызов функции через заданный интервал."""
+        QtCore.QTimer.singleShot(ms, fn)
+
+    def post(self, fn: Callable[[], None]) -> None:
+        """Потокобезопасно ставит вызов функции в цикл UI."""
+        self._invoker.invoke.emit(fn)
+
+    def set_paint_probe(self, probe: Optional[Callable[[float], None]]) -> None:
+        """Устанавливает обработчик первой отрисовки после изменения текста.
+
+        probe получает момент time.perf_counter() конца paintEvent.
+        """
+        self._paint_probe = probe
+
+    def set_on_close(self, callback: Callable[[], None]) -> None:
+        """Устанавливает обработчик закрытия окна."""
+        self._on_close = callback
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        """Обрабатывает закрытие окна."""
+        if self._closing:
+            event.accept()
+            return
+        if self._on_close:
+            self._on_close()
+        event.ignore()
+
+    def run(self) -> None:
+        """Запускает цикл обработки событий UI."""
+        self.show()
+        self._app.exec()
+
+    def close(self) -> None:
+        """Закрывает окно и завершает приложение."""
+        self._closing = True
+        self._app.quit()
+        super().close()
+
+
+__all__ = ["HudWindowBase"]
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+from PySide6 import QtCore, QtGui
+
+from ..hud_style import HudStyle
+from ...application.models import MacroLine
+from .hud_base import HudWindowBase
+from .hud_window import paint_macro_bar
+from .paint_cache import background_pixmap, bar_fill_width
+
+# QStaticText в режиме PlainText не переносит строку по "\n".
+_LINE_SEPARATOR = "\u2028"
+
+
+class _TextBlock:
+    """Текст блока HUD: QStaticText с раскладкой, готовой для заданного шрифта.
+
+    Раскладка пересчитывается только при смене текста или ширины; цвет
+    задаётся пером QPainter и на раскладку не влияет.
+    """
+
+    def __init__(self, font: QtGui.QFont, padding: int) -> None:
+        self.font = font
+        self.padding = padding
+        self.text = ""
+        self.static = QtGui.QStaticText()
+        self.static.setTextFormat(QtCore.Qt.PlainText)
+        self.static.setPerformanceHint(QtGui.QStaticText.AggressiveCaching)
+        self.line_height = QtGui.QFontMetrics(font).height()
+        self._width = -1
+        self._height = 0
+
+    def set_text(self, text: str) -> bool:
+        """Меняет текст; False если он не изменился."""
+        if text == self.text:
+            return False
+        self.text = text
+        self.static.setText(text.replace("\n", _LINE_SEPARATOR))
+        self._width = -1
+        return True
+
+    def height(self, width: int) -> int:
+        """Высота блока с отступами при ширине width."""
+        if width != self._width:
+            self._width = width
+            self.static.setTextWidth(max(1, width - 2 * self.padding))
+            self.static.prepare(QtGui.QTransform(), self.font)
+            self._height = max(self.line_height, int(self.static.size().height() + 0.999))
+        return self._height + 2 * self.padding
+
+
+class HudCanvas(HudWindowBase):
+    """Окно HUD, рисующее все блоки в одном paintEvent.
+
+    Альтернатива HudQt (hud.ui: canvas): вместо QLabel со стилями каждый
+    блок — закэшированный QStaticText, а цвета и подложки рисуются
+    QPainter'ом. Анимации уровней идут через общий FrameClock и меняют
+    только числа, без разбора CSS; раскладка пересчитывается при смене
+    текста, не чаще раза за кадр.
+    """
+
+    def __init__(self, style: HudStyle) -> None:
+        """Создаёт окно HUD."""
+        super().__init__(style)
+
+        padding = style.block_padding
+        block_font = self._font(style.font_size)
+        self.timer = _TextBlock(self._font(style.font_size + 12, "bold"), 0)
+        self.warning = _TextBlock(block_font, padding)
+        self.now = _TextBlock(block_font, padding)
+        self.next = _TextBlock(block_font, padding)
+        self.macro_title = _TextBlock(block_font, padding)
+        self.macro_fallback = _TextBlock(block_font, padding)
+        self.build = _TextBlock(self._font(style.font_size - 2), padding)
+        self.timer.set_text("0:00")
+        self.now.set_text("ГОТОВО  |  F7 LOCK")
+        self.next.set_text("ДАЛЕЕ: —")
+        self.macro_title.set_text("MACRO:")
+        self.macro_fallback.set_text("MACRO: —")
+        self._bar_font = self._font(style.font_size, "normal")
+        self._macro_lines: tuple[MacroLine, ...] = ()
+        self._macro_colors: list[QtGui.QColor] = []
+        self._last_macro: tuple[str, tuple[MacroLine, ...]] | None = None
+
+        # Прямоугольники блоков после последней раскладки.
+        self._rects: dict[str, QtCore.QRect] = {}
+        self._bar_rects: list[QtCore.QRect] = []
+
+        self._relayout()
+
+    # ---- раскладка ----------------------------------------------------------
+
+    def _invalidate(self) -> None:
+        """Отмечает смену текста; внутри apply() раскладка — в конце кадра."""
+        self._paint_pending = True
+        if self._batching:
+            self._layout_dirty = True
+            return
+        self._relayout()
+
+    def _relayout(self) -> None:
+        """Раскладывает блоки сверху вниз и подгоняет высоту окна."""
+        style = self._style
+        left = style.margin_horizontal
+        width = max(1, self.width() - 2 * style.margin_horizontal)
+        y = style.margin_vertical
+        rects: dict[str, QtCore.QRect] = {}
+
+        def place(key: str, height: int, spacing: int = style.spacing) -> None:
+            nonlocal y
+            rects[key] = QtCore.QRect(left, y, width, height)
+            y += height + spacing
+
+        place("timer", self.timer.height(width))
+        if self.warning.text:
+            place("warning", self.warning.height(width))
+        place("now", self.now.height(width))
+        place("next", self.next.height(width))
+        if style.macro_show_title:
+            place("macro_title", self.macro_title.height(width))
+        self._bar_rects = []
+        if self._macro_lines:
+            for _ in self._macro_lines:
+                self._bar_rects.append(QtCore.QRect(left, y, width, style.macro_bar_height))
+                y += style.macro_bar_height + style.macro_line_spacing
+            y += style.spacing - style.macro_line_spacing
+        else:
+            place("macro_fallback", self.macro_fallback.height(width))
+        if self.build.text:
+            place("build", self.build.height(width))
+        self._rects = rects
+        if self._auto_height_enabled:
+            desired_height = max(self._base_height, y - style.spacing + style.margin_vertical)
+            if desired_height > self.height():
+                self.resize(self._style.width, desired_height)
+        self.update()
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        """Пересчитывает раскладку при смене ширины окна."""
+        super().resizeEvent(event)
+        if event.oldSize().width() != event.size().width():
+            self._relayout()
+
+    # ---- отрисовка ----------------------------------------------------------
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
+        self._paint_background(painter)
+        colors = self._colors
+        rects = self._rects
+        painter.setPen(QtCore.Qt.NoPen)
+
+        self._draw_text(painter, self.timer, rects["timer"], colors.text_primary)
+        warning_rect = rects.get("warning")
+        if warning_rect is not None:
+            color, fill = self._warning_colors()
+            if fill is not None:
+                self._fill_block(painter, warning_rect, fill)
+            self._draw_text(painter, self.warning, warning_rect, color)
+        self._fill_block(painter, rects["now"], self._block_fill("now", 140))
+        self._draw_text(painter, self.now, rects["now"], colors.text_primary)
+        self._fill_block(painter, rects["next"], self._block_fill("next", 120))
+        self._draw_text(painter, self.next, rects["next"], colors.text_next)
+        macro_fill = self._block_fill("macro", 120)
+        for key in ("macro_title", "macro_fallback"):
+            rect = rects.get(key)
+            if rect is not None:
+                self._fill_block(painter, rect, macro_fill)
+                self._draw_text(painter, getattr(self, key), rect, colors.text_primary)
+        if self._bar_rects:
+            painter.setFont(self._bar_font)
+            for rect, line, color in zip(self._bar_rects, self._macro_lines, self._macro_colors):
+                paint_macro_bar(
+                    painter, rect, line.text, line.progress or 0.0, color, colors.text_primary
+                )
+            painter.setPen(QtCore.Qt.NoPen)
+        build_rect = rects.get("build")
+        if build_rect is not None:
+            build_fill = QtGui.QColor(colors.block_background)
+            build_fill.setAlpha(100)
+            self._fill_block(painter, build_rect, build_fill)
+            self._draw_text(painter, self.build, build_rect, colors.text_primary)
+
+        painter.end()
+        self._report_paint()
+
+    def _paint_background(self, painter: QtGui.QPainter) -> None:
+        pixmap = background_pixmap(
+            self.size(), self._colors.background_base, self._style.alpha, self.devicePixelRatioF()
+        )
+        painter.drawPixmap(0, 0, pixmap)
+
+    @staticmethod
+    def _fill_block(painter: QtGui.QPainter, rect: QtCore.QRect, color: QtGui.QColor) -> None:
+        if color.alpha() <= 0:
+            return
+        painter.setBrush(color)
+        painter.drawRoundedRect(rect, 4, 4)
+
+    @staticmethod
+    def _draw_text(
+        painter: QtGui.QPainter,
+        block: _TextBlock,
+        rect: QtCore.QRect,
+        color: QtGui.QColor,
+    ) -> None:
+        painter.setFont(block.font)
+        painter.setPen(color)
+        padding = block.padding
+        painter.drawStaticText(rect.left() + padding, rect.top() + padding, block.static)
+        painter.setPen(QtCore.Qt.NoPen)
+
+    def _block_fill(self, key: str, alpha: int) -> QtGui.QColor:
+        fill = self._block_background_color(key)
+        fill.setAlpha(alpha)
+        return fill
+
+    def _warning_colors(self) -> tuple[QtGui.QColor, QtGui.QColor | None]:
+        colors = self._colors
+        if self._warning_level == "danger":
+            text, fill, alpha = colors.text_danger, colors.warning_block_danger, 230
+        elif self._warning_level == "warn":
+            text, fill, alpha = colors.text_warning, colors.warning_block_warn, 210
+        elif self._warning_level == "info":
+            text, fill, alpha = colors.text_info, colors.block_background, 90
+        else:
+            return colors.text_primary, None
+        fill = QtGui.QColor(fill)
+        fill.setAlpha(int(alpha * self._warning_block_strength))
+        return text, fill
+
+    # ---- анимации уровней ---------------------------------------------------
+
+    def _on_animation_frame(self, changed: set[str]) -> None:
+        """Переносит значения кадра FrameClock; одна перерисовка изменившихся блоков."""
+        self._take_animation_values(changed)
+        region = QtGui.QRegion()
+        for key in changed:
+            if key == "warning":
+                rect_keys: tuple[str, ...] = ("warning",)
+            else:
+                rect_keys = ("macro_title", "macro_fallback") if key == "macro" else (key,)
+            for rect_key in rect_keys:
+                rect = self._rects.get(rect_key)
+                if rect is not None:
+                    region += rect
+        if not region.isEmpty():
+            self.update(region)
+
+    # ---- HudViewPort --------------------------------------------------------
+
+    def _finish_frame(self) -> None:
+        if self._layout_dirty:
+            self._layout_dirty = False
+            self._relayout()
+
+    def set_warning(self, text: str | None, level: str | None = None) -> None:
+        """Обновляет визуальный уровень предупреждения."""
+        self._touch()
+        warning_text = self._update_warning_level(text, level)
+        if warning_text is None:
+            return
+        self.warning.set_text(warning_text)
+        self._animate_warning_overlay()
+        self._invalidate()
+
+    def set_timer(self, text: str) -> None:
+        """Обновляет текст таймера."""
+        self._touch()
+        if not self.timer.set_text(text):
+            return
+        self._paint_pending = True
+        rect = self._rects.get("timer")
+        if rect is not None and self.timer.height(rect.width()) == rect.height():
+            self.update(rect)
+        else:
+            self._invalidate()
+
+    def set_now(self, text: str, level: str | None = None) -> None:
+        """Обновляет блок NOW."""
+        self._touch()
+        self._set_block_level("now", level)
+        if self.now.set_text(text):
+            self._invalidate()
+
+    def set_next(self, text: str, level: str | None = None) -> None:
+        """Обновляет блок NEXT."""
+        self._touch()
+        self._set_block_level("next", level)
+        if self.next.set_text(text):
+            self._invalidate()
+
+    def set_macro(
+        self,
+        text: str,
+        level: str | None = None,
+        lines: list["MacroLine"] | None = None,
+    ) -> None:
+        """Обновляет блок MACRO."""
+        self._touch()
+        macro = (str(level or ""), tuple(lines or ()))
+        if macro == self._last_macro:
+            return
+        self._last_macro = macro
+        self._set_block_level("macro", level)
+        new_lines = macro[1]
+        if len(new_lines) != len(self._macro_lines) or any(
+            old.color != new.color for old, new in zip(self._macro_lines, new_lines)
+        ):
+            self._macro_colors = [self._parse_macro_color(line.color) for line in new_lines]
+        old_lines = self._macro_lines
+        self._macro_lines = new_lines
+        if len(new_lines) != len(old_lines):
+            self._invalidate()
+            return
+        # Полоса перерисовывается, только если сдвинулся видимый пиксель заливки.
+        for rect, old, new in zip(self._bar_rects, old_lines, new_lines):
+            if (
+                old.text != new.text
+                or old.color != new.color
+                or bar_fill_width(rect.width(), old.progress)
+                != bar_fill_width(rect.width(), new.progress)
+            ):
+                self._paint_pending = True
+                self.update(rect)
+
+    def set_build(self, text: str) -> None:
+        """Обновляет блок BUILD."""
+        self._touch()
+        if self.build.set_text(text):
+            self._invalidate()
+
+
+__all__ = ["HudCanvas"]
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from typing import Callable, Optional
-
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from ..hud_style import HudStyle
 from ...application.models import MacroLine
-from .styles import default_colors
+from .hud_base import HudWindowBase
+from .paint_cache import background_pixmap, bar_fill_pixmap, bar_fill_width
 
 
 class MacroProgressBar(QtWidgets.QWidget):
@@ -26,74 +25,59 @@ class MacroProgressBar(QtWidgets.QWidget):
         self.setFixedHeight(height)
 
     def set_data(self, text: str, progress: float, color: QtGui.QColor) -> None:
+        """Обновляет полосу; перерисовка — только если изменился видимый пиксель."""
+        progress = max(0.0, min(1.0, progress))
+        width = self.width()
+        unchanged = (
+            text == self._text
+            and color == self._color
+            and bar_fill_width(width, progress) == bar_fill_width(width, self._progress)
+        )
         self._text = text
-        self._progress = max(0.0, min(1.0, progress))
+        self._progress = progress
         self._color = color
-        self.update()
+        if not unchanged:
+            self.update()
 
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        paint_macro_bar(
+            painter, self.rect(), self._text, self._progress, self._color, self._text_color
+        )
+        painter.end()
 
-        rect = self.rect()
-        bar_width = int(rect.width() * self._progress)
-        if bar_width > 0:
-            slant = min(10, bar_width)
-            polygon = QtGui.QPolygonF(
-                [
-                    QtCore.QPointF(rect.left(), rect.top()),
-                    QtCore.QPointF(rect.left() + bar_width - slant, rect.top()),
-                    QtCore.QPointF(rect.left() + bar_width, rect.center().y()),
-                    QtCore.QPointF(rect.left() + bar_width - slant, rect.bottom()),
-                    QtCore.QPointF(rect.left(), rect.bottom()),
-                ]
-            )
-            gradient = QtGui.QLinearGradient(rect.left(), 0, rect.left() + bar_width, 0)
-            base = QtGui.QColor(self._color)
-            gradient.setColorAt(0.0, QtGui.QColor(base.red(), base.green(), base.blue(), 140))
-            gradient.setColorAt(1.0, QtGui.QColor(base.red(), base.green(), base.blue(), 60))
-            painter.setPen(QtCore.Qt.NoPen)
-            painter.setBrush(QtGui.QBrush(gradient))
-            painter.drawPolygon(polygon)
 
-        painter.setPen(self._text_color)
-        painter.drawText(rect.adjusted(4, 0, -4, 0), QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, self._text)
-        painter.end()
+def paint_macro_bar(
+    painter: QtGui.QPainter,
+    rect: QtCore.QRect,
+    text: str,
+    progress: float,
+    color: QtGui.QColor,
+    text_color: QtGui.QColor,
+) -> None:
+    """Рисует полосу макро-тайминга в rect текущим шрифтом painter.
+
+    Заливка берётся готовой pixmap из кэша по ширине заполнения и цвету.
+    """
+    filled = bar_fill_width(rect.width(), progress)
+    if filled > 0:
+        ratio = painter.device().devicePixelRatioF()
+        painter.drawPixmap(rect.topLeft(), bar_fill_pixmap(filled, rect.height(), color, ratio))
+
+    painter.setPen(text_color)
+    painter.drawText(rect.adjusted(4, 0, -4, 0), QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, text)
 
 
-class HudQt(QtWidgets.QWidget):
+class HudQt(HudWindowBase):
     """Окно HUD на базе PySide6."""
 
     def __init__(self, style: HudStyle) -> None:
         """Создаёт окно HUD."""
-        self._app = QtWidgets.QApplication.instance()
-        if self._app is None:
-            self._app = QtWidgets.QApplication([])
-
-        super().__init__()
-
-        self._style = style
-        self._colors = default_colors()
-        self._warning_level = ""
-        self._warning_block_strength = 0.0
-        self._warning_anim: Optional[QtCore.QPropertyAnimation] = None
-        self._warning_hold_timer = QtCore.QTimer(self)
-        self._warning_hold_timer.setSingleShot(True)
-        self._warning_base_strength = 0.0
-        self._last_warning_text = ""
-        self._last_warning_level = ""
+        super().__init__(style)
+
         self._warning_fill_color: QtGui.QColor | None = None
         self._warning_fill_alpha = 0
-        self._block_levels = {"now": "", "next": "", "macro": ""}
-        self._block_strengths = {"now": 0.0, "next": 0.0, "macro": 0.0}
-        self._block_anims: dict[str, QtCore.QVariantAnimation] = {}
-        self._auto_height_enabled = True
-        self._base_height = style.height
-        self._locked = False
-        self._drag_enabled = True
-        self._drag_offset = QtCore.QPoint()
-        self._on_close: Optional[Callable[[], None]] = None
-        self._closing = False
 
         self._last_now_text = ""
         self._last_now_level = ""
@@ -101,26 +85,12 @@ class HudQt(QtWidgets.QWidget):
         self._last_next_level = ""
         self._last_timer_text = ""
         self._last_build_text = ""
+        self._last_macro: tuple[str, tuple[MacroLine, ...]] | None = None
+        # Перекраска с перерисовкой, отложенная внутри apply() до конца кадра.
+        self._restyle_dirty = False
 
-        self._configure_window()
         self._build_layout()
         self._apply_text_colors()
-        self._warning_hold_timer.timeout.connect(self._fade_warning_overlay)
-
-    def _configure_window(self) -> None:
-        self.setWindowTitle(self._style.title)
-        flags = (
-            QtCore.Qt.FramelessWindowHint
-            | QtCore.Qt.WindowStaysOnTopHint
-            | QtCore.Qt.Tool
-            | QtCore.Qt.WindowDoesNotAcceptFocus
-        )
-        self.setWindowFlags(flags)
-        self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
-        self.setAttribute(QtCore.Qt.WA_ShowWithoutActivating, True)
-        self.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.resize(self._style.width, self._style.height)
-        self.move(self._style.x, self._style.y)
 
     def _build_layout(self) -> None:
         layout = QtWidgets.QVBoxLayout()
@@ -177,19 +147,6 @@ class HudQt(QtWidgets.QWidget):
 
         self.setLayout(layout)
 
-    def _font(self, size: int, weight: str | None = None) -> QtGui.QFont:
-        font = QtGui.QFont(self._style.font_family)
-        font.setPointSize(size)
-        weight_value = self._weight_from_string(weight or self._style.font_weight)
-        font.setWeight(weight_value)
-        return font
-
-    @staticmethod
-    def _weight_from_string(weight: str) -> int:
-        if weight.lower() == "bold":
-            return QtGui.QFont.Weight.Bold
-        return QtGui.QFont.Weight.Normal
-
     @staticmethod
     def _rgba(color: QtGui.QColor, alpha: int | None = None) -> str:
         alpha_value = color.alpha() if alpha is None else alpha
@@ -296,6 +253,9 @@ class HudQt(QtWidgets.QWidget):
     def _resize_to_content(self) -> None:
         if not self._auto_height_enabled:
             return
+        if self._batching:
+            self._layout_dirty = True
+            return
         if self.layout() is not None:
             self.layout().activate()
             content_height = self.layout().sizeHint().height()
@@ -309,39 +269,17 @@ class HudQt(QtWidgets.QWidget):
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
 
-        rect = self.rect()
-
-        base = QtGui.QColor(self._colors.background_base)
-        effective_alpha = max(self._style.alpha, 0.75)
-        max_alpha = int(255 * effective_alpha)  # стартовая прозрачность
-
-        gradient = QtGui.QLinearGradient(
-            rect.left(),
+        painter.drawPixmap(
             0,
-            rect.right(),
             0,
+            background_pixmap(
+                self.size(),
+                self._colors.background_base,
+                self._style.alpha,
+                self.devicePixelRatioF(),
+            ),
         )
 
-        # слева — читаемо
-        gradient.setColorAt(
-            0.0,
-            QtGui.QColor(base.red(), base.green(), base.blue(), max_alpha),
-        )
-
-        # середина — мягкое затухание
-        gradient.setColorAt(
-            0.6,
-            QtGui.QColor(base.red(), base.green(), base.blue(), int(max_alpha * 0.22)),
-        )
-
-        # справа — почти незаметно
-        gradient.setColorAt(
-            0.9,
-            QtGui.QColor(base.red(), base.green(), base.blue(), 0),
-        )
-
-        painter.fillRect(rect, gradient)
-
         if self._warning_fill_color and self._warning_fill_alpha > 0:
             warning_rect = self.warning.geometry().adjusted(
                 -self._style.block_padding,
@@ -356,209 +294,76 @@ class HudQt(QtWidgets.QWidget):
             painter.drawRoundedRect(warning_rect, 4, 4)
 
         painter.end()
-
-    def _block_background_color(self, key: str) -> QtGui.QColor:
-        base = self._colors.block_background
-        level = self._block_levels.get(key, "")
-        strength = self._block_strengths.get(key, 0.0)
-        if level == "danger":
-            target = self._colors.warning_block_danger
-        elif level == "warn":
-            target = self._colors.warning_block_warn
-        elif level == "info":
-            target = self._colors.block_background
-        else:
-            target = self._colors.block_background
-        return self._blend_colors(base, target, strength)
-
-    @staticmethod
-    def _blend_colors(
-        base: QtGui.QColor,
-        target: QtGui.QColor,
-        strength: float,
-    ) -> QtGui.QColor:
-        strength = max(0.0, min(1.0, float(strength)))
-        red = int(base.red() + (target.red() - base.red()) * strength)
-        green = int(base.green() + (target.green() - base.green()) * strength)
-        blue = int(base.blue() + (target.blue() - base.blue()) * strength)
-        return QtGui.QColor(red, green, blue)
-
-    def _target_block_strength(self, level: str) -> float:
-        if level in {"danger", "warn"}:
-            return 1.0
-        if level == "info":
-            return 0.6
-        return 0.0
-
-    def _set_block_level(self, key: str, level: str | None) -> None:
-        normalized = str(level or "").lower()
-        if self._block_levels.get(key) == normalized:
+        self._report_paint()
+
+    def _on_animation_frame(self, changed: set[str]) -> None:
+        """Переносит значения кадра FrameClock и перекрашивает окно один раз."""
+        self._take_animation_values(changed)
+        self._restyle()
+
+    def _finish_frame(self) -> None:
+        if self._restyle_dirty:
+            self._restyle_dirty = False
+            self._restyle()
+        if self._layout_dirty:
+            self._layout_dirty = False
+            self._resize_to_content()
+
+    def _restyle(self) -> None:
+        """Перекрашивает блоки и окно; внутри apply() — один раз в конце кадра."""
+        if self._batching:
+            self._restyle_dirty = True
             return
-        self._block_levels[key] = normalized
-        target = self._target_block_strength(normalized)
-        anim = self._block_anims.get(key)
-        if anim is None:
-            anim = QtCore.QVariantAnimation(self)
-            anim.setDuration(450)
-            anim.setEasingCurve(QtCore.QEasingCurve.InOutQuad)
-            anim.valueChanged.connect(
-                lambda value, block=key: self._update_block_strength(block, value)
-            )
-            self._block_anims[key] = anim
-        anim.stop()
-        anim.setStartValue(self._block_strengths.get(key, 0.0))
-        anim.setEndValue(target)
-        anim.start()
-
-    def _update_block_strength(self, key: str, value: object) -> None:
-        self._block_strengths[key] = max(0.0, min(1.0, float(value)))
         self._apply_text_colors()
         self.update()
 
-    def _target_warning_strength(self) -> float:
-        if self._warning_level == "danger":
-            return 1.0
-        if self._warning_level == "warn":
-            return 1.0
-        if self._warning_level == "info":
-            return 0.6
-        return 0.0
-
-    def _base_warning_strength(self) -> float:
-        if self._warning_level in {"danger", "warn"}:
-            return 0.8 if self._warning_level == "danger" else 0.65
-        if self._warning_level == "info":
-            return 0.45
-        return 0.0
-
-    def _animate_warning_overlay(self) -> None:
-        target = self._target_warning_strength()
-        if self._warning_anim is None:
-            self._warning_anim = QtCore.QPropertyAnimation(self, b"warningBlockStrength")
-            self._warning_anim.setDuration(240)
-            self._warning_anim.setEasingCurve(QtCore.QEasingCurve.InOutQuad)
-        self._warning_anim.stop()
-        self._warning_anim.setStartValue(self._warning_base_strength)
-        self._warning_anim.setEndValue(target)
-        self._warning_anim.start()
-        self._warning_hold_timer.stop()
-        self._warning_hold_timer.start(220)
-
-    def _fade_warning_overlay(self) -> None:
-        if not self._warning_anim:
-            return
-        self._warning_anim.stop()
-        self._warning_anim.setStartValue(self._warning_block_strength)
-        self._warning_anim.setEndValue(self._warning_base_strength)
-        self._warning_anim.start()
-
-    @QtCore.Property(float)
-    def warningBlockStrength(self) -> float:
-        return self._warning_block_strength
-
-    @warningBlockStrength.setter
-    def warningBlockStrength(self, value: float) -> None:
-        self._warning_block_strength = max(0.0, min(1.0, float(value)))
-        self._apply_text_colors()
-        self.update()
-
-    def _set_clickthrough(self, enabled: bool) -> None:
-        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, enabled)
-        self.setWindowFlag(QtCore.Qt.WindowTransparentForInput, enabled)
-        self.show()
-
-    def set_drag_enabled(self, enabled: bool) -> None:
-        """Включает или выключает перетаскивание окна."""
-        self._drag_enabled = bool(enabled)
-
-    def toggle_lock(self) -> None:
-        """Переключает режим блокировки."""
-        self.set_lock(not self._locked)
-
-    def set_lock(self, enabled: bool) -> None:
-        """Управляет блокировкой и кликом сквозь окно."""
-        enabled = bool(enabled)
-        self._locked = enabled
-        self.set_drag_enabled(not enabled)
-        self._set_clickthrough(enabled)
-
-    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
-        """Обрабатывает начало перетаскивания."""
-        if not self._drag_enabled or event.button() != QtCore.Qt.LeftButton:
-            super().mousePressEvent(event)
-            return
-        self._drag_offset = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
-        event.accept()
-
-    def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
-        """Обрабатывает перемещение при перетаскивании."""
-        if not self._drag_enabled or not (event.buttons() & QtCore.Qt.LeftButton):
-            super().mouseMoveEvent(event)
-            return
-        self.move(event.globalPosition().toPoint() - self._drag_offset)
-        event.accept()
-
     def set_warning(self, text: str | None, level: str | None = None) -> None:
         """Обновляет визуальный уровень предупреждения."""
-        warning_text = text or ""
+        self._touch()
+        warning_text = self._update_warning_level(text, level)
+        if warning_text is None:
+            return
         self.warning.setText(warning_text)
-        if level is None and isinstance(text, bool):
-            warning_level = "warn" if text else ""
-        else:
-            warning_level = str(level or "")
-        should_animate = (
-            warning_text != self._last_warning_text
-            or warning_level != self._last_warning_level
-        )
-        self._warning_level = warning_level
-        self._last_warning_text = warning_text
-        self._last_warning_level = warning_level
-        self._warning_base_strength = self._base_warning_strength()
-        if not should_animate:
-            self._warning_block_strength = self._warning_base_strength
-        self._apply_text_colors()
-        if should_animate:
-            self._animate_warning_overlay()
+        self._paint_pending = True
+        self._animate_warning_overlay()
+        self._restyle()
         self._resize_to_content()
-        self.update()
 
     def set_timer(self, text: str) -> None:
         """Обновляет текст таймера."""
+        self._touch()
         if text == self._last_timer_text:
             return
         self._last_timer_text = text
+        self._paint_pending = True
         self.timer.setText(text)
 
     def set_now(self, text: str, level: str | None = None) -> None:
         """Обновляет блок NOW."""
+        self._touch()
         normalized_level = str(level or "")
         if text == self._last_now_text and normalized_level == self._last_now_level:
             return
         self._last_now_text = text
         self._last_now_level = normalized_level
+        self._paint_pending = True
         self.now.setText(text)
         self._set_block_level("now", level)
         self._resize_to_content()
 
     def set_next(self, text: str, level: str | None = None) -> None:
         """Обновляет блок NEXT."""
+        self._touch()
         normalized_level = str(level or "")
         if text == self._last_next_text and normalized_level == self._last_next_level:
             return
         self._last_next_text = text
         self._last_next_level = normalized_level
+        self._paint_pending = True
         self.next.setText(text)
         self._set_block_level("next", level)
         self._resize_to_content()
 
-    def _parse_macro_color(self, value: str | None) -> QtGui.QColor:
-        if not value:
-            return self._colors.block_background
-        color = QtGui.QColor(str(value))
-        if not color.isValid():
-            return self._colors.block_background
-        return color
-
     def _apply_macro_lines(self, lines: list["MacroLine"]) -> None:
         old_count = len(self._macro_line_widgets)
         is_fallback = old_count == 1 and isinstance(
@@ -627,6 +432,12 @@ class HudQt(QtWidgets.QWidget):
         lines: list["MacroLine"] | None = None,
     ) -> None:
         """Обновляет блок MACRO."""
+        self._touch()
+        macro = (str(level or ""), tuple(lines or ()))
+        if macro == self._last_macro:
+            return
+        self._last_macro = macro
+        self._paint_pending = True
         if self._style.macro_show_title:
             self.macro_title.setText("MACRO:")
         self._set_block_level("macro", level)
@@ -635,6 +446,7 @@ class HudQt(QtWidgets.QWidget):
 
     def set_build(self, text: str) -> None:
         """Обновляет блок BUILD."""
+        self._touch()
         if text == self._last_build_text:
             return
         self._last_build_text = text
@@ -644,31 +456,3 @@ class HudQt(QtWidgets.QWidget):
         self.build_label.setText(text)
         self.build_label.setVisible(True)
         self._resize_to_content()
-
-    def every(self, ms: int, fn: Callable[[], None]) -> None:
-        """Планирует повторный вызов функции через заданный интервал."""
-        QtCore.QTimer.singleShot(ms, fn)
-
-    def set_on_close(self, callback: Callable[[], None]) -> None:
-        """Устанавливает обработчик закрытия окна."""
-        self._on_close = callback
-
-    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
-        """Обрабатывает закрытие окна."""
-        if self._closing:
-            event.accept()
-            return
-        if self._on_close:
-            self._on_close()
-        event.ignore()
-
-    def run(self) -> None:
-        """Запускает цикл обработки событий UI."""
-        self.show()
-        self._app.exec()
-
-    def close(self) -> None:
-        """Закрывает окно и завершает приложение."""
-        self._closing = True
-        self._app.quit()
-        super().close()
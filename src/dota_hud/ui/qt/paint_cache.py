@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from PySide6 import QtCore, QtGui
+
+# Заливок полос немного: ширина заполнения меняется на пиксель за секунды.
+_BAR_CACHE_SIZE = 128
+_BACKGROUND_CACHE_SIZE = 4
+
+
+class PixmapCache:
+    """LRU-кэш готовых QPixmap по ключу."""
+
+    def __init__(self, limit: int) -> None:
+        """Создаёт кэш не больше чем на limit pixmap."""
+        self._limit = limit
+        self._items: OrderedDict[Hashable, QtGui.QPixmap] = OrderedDict()
+
+    def get(self, key: Hashable, render: Callable[[], QtGui.QPixmap]) -> QtGui.QPixmap:
+        """Возвращает pixmap по ключу; при промахе рисует его через render()."""
+        pixmap = self._items.get(key)
+        if pixmap is not None:
+            self._items.move_to_end(key)
+            return pixmap
+        pixmap = render()
+        self._items[key] = pixmap
+        if len(self._items) > self._limit:
+            self._items.popitem(last=False)
+        return pixmap
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+_backgrounds = PixmapCache(_BACKGROUND_CACHE_SIZE)
+_bar_fills = PixmapCache(_BAR_CACHE_SIZE)
+
+
+def _blank(width: int, height: int, ratio: float) -> QtGui.QPixmap:
+    pixmap = QtGui.QPixmap(max(1, round(width * ratio)), max(1, round(height * ratio)))
+    pixmap.setDevicePixelRatio(ratio)
+    pixmap.fill(QtCore.Qt.transparent)
+    return pixmap
+
+
+def background_pixmap(
+    size: QtCore.QSize,
+    base: QtGui.QColor,
+    alpha: float,
+    ratio: float = 1.0,
+) -> QtGui.QPixmap:
+    """Фон окна HUD: горизонтальный градиент base, затухающий вправо.
+
+    Кэшируется по размеру окна, прозрачности, цвету и плотности пикселей.
+    """
+    max_alpha = int(255 * max(alpha, 0.75))
+    key = (size.width(), size.height(), max_alpha, base.rgba(), ratio)
+
+    def render() -> QtGui.QPixmap:
+        pixmap = _blank(size.width(), size.height(), ratio)
+        rect = QtCore.QRect(QtCore.QPoint(0, 0), size)
+        gradient = QtGui.QLinearGradient(rect.left(), 0, rect.right(), 0)
+        # слева — читаемо
+        gradient.setColorAt(0.0, QtGui.QColor(base.red(), base.green(), base.blue(), max_alpha))
+        # середина — мягкое затухание
+        gradient.setColorAt(
+            0.6, QtGui.QColor(base.red(), base.green(), base.blue(), int(max_alpha * 0.22))
+        )
+        # справа — почти незаметно
+        gradient.setColorAt(0.9, QtGui.QColor(base.red(), base.green(), base.blue(), 0))
+        painter = QtGui.QPainter(pixmap)
+        painter.fillRect(rect, gradient)
+        painter.end()
+        return pixmap
+
+    return _backgrounds.get(key, render)
+
+
+def bar_fill_width(width: int, progress: float | None) -> int:
+    """Ширина заливки полосы в пикселях (прогресс, квантованный до пикселя)."""
+    return int(width * max(0.0, min(1.0, progress or 0.0)))
+
+
+def bar_fill_pixmap(
+    filled: int,
+    height: int,
+    color: QtGui.QColor,
+    ratio: float = 1.0,
+) -> QtGui.QPixmap:
+    """Заливка полосы макро-тайминга: градиент со скошенным правым краем.
+
+    Зависит только от ширины заливки, высоты и цвета, поэтому одна
+    pixmap переиспользуется всеми полосами и перерисовками.
+    """
+    key = (filled, height, color.rgba(), ratio)
+
+    def render() -> QtGui.QPixmap:
+        pixmap = _blank(filled, height, ratio)
+        bottom = height - 1
+        slant = min(10, filled)
+        polygon = QtGui.QPolygonF(
+            [
+                QtCore.QPointF(0, 0),
+                QtCore.QPointF(filled - slant, 0),
+                QtCore.QPointF(filled, bottom // 2),
+                QtCore.QPointF(filled - slant, bottom),
+                QtCore.QPointF(0, bottom),
+            ]
+        )
+        gradient = QtGui.QLinearGradient(0, 0, filled, 0)
+        gradient.setColorAt(0.0, QtGui.QColor(color.red(), color.green(), color.blue(), 140))
+        gradient.setColorAt(1.0, QtGui.QColor(color.red(), color.green(), color.blue(), 60))
+        painter = QtGui.QPainter(pixmap)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QBrush(gradient))
+        painter.drawPolygon(polygon)
+        painter.end()
+        return pixmap
+
+    return _bar_fills.get(key, render)
+
+
+def clear_caches() -> None:
+    """Сбрасывает все кэши отрисовки."""
+    _backgrounds.clear()
+    _bar_fills.clear()
+
+
+__all__ = [
+    "PixmapCache",
+    "background_pixmap",
+    "bar_fill_pixmap",
+    "bar_fill_width",
+    "clear_caches",
+]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from PySide6 import QtCore
+
+
+class MainThreadInvoker(QtCore.QObject):
+    """Выполняет функции в потоке, которому принадлежит объект."""
+
+    invoke = QtCore.Signal(object)
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.invoke.connect(self._run, QtCore.Qt.QueuedConnection)
+
+    @QtCore.Slot(object)
+    def _run(self, fn: Callable[[], None]) -> None:
+        fn()
+
+
+class QtScheduler:
+    """Планировщик цикла UI на QtCore, без виджетов (HudSchedulePort)."""
+
+    def __init__(self) -> None:
+        """Создаёт планировщик; вызывать из главного потока."""
+        self._invoker = MainThreadInvoker()
+
+    def every(self, ms: int, fn: Callable[[], None]) -> None:
+        """Планирует однократный вызов функции через ms миллисекунд."""
+        QtCore.QTimer.singleShot(ms, fn)
+
+    def post(self, fn: Callable[[], None]) -> None:
+        """Потокобезопасно ставит вызов функции в цикл UI."""
+        self._invoker.invoke.emit(fn)
+
+
+__all__ = ["MainThreadInvoker", "QtScheduler"]
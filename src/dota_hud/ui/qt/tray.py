@@ -35,6 +35,8 @@ class TrayIcon(QtWidgets.QSystemTrayIcon):
         self._on_toggle_hud: Optional[Callable[[], None]] = None
         self._on_role_changed: Optional[Callable[[str], None]] = None
         self._on_quit: Optional[Callable[[], None]] = None
+        self._on_show_latency: Optional[Callable[[], None]] = None
+        self._on_toggle_profiler: Optional[Callable[[], None]] = None
 
         self._build_icon()
         self._build_menu()
@@ -62,11 +64,15 @@ class TrayIcon(QtWidgets.QSystemTrayIcon):
         on_toggle_hud: Callable[[], None] | None = None,
         on_role_changed: Callable[[str], None] | None = None,
         on_quit: Callable[[], None] | None = None,
+        on_show_latency: Callable[[], None] | None = None,
+        on_toggle_profiler: Callable[[], None] | None = None,
     ) -> None:
         self._on_open_settings = on_open_settings
         self._on_toggle_hud = on_toggle_hud
         self._on_role_changed = on_role_changed
         self._on_quit = on_quit
+        self._on_show_latency = on_show_latency
+        self._on_toggle_profiler = on_toggle_profiler
 
     def set_role(self, role: str) -> None:
         """Обновляет текущую роль в меню."""
@@ -74,6 +80,12 @@ class TrayIcon(QtWidgets.QSystemTrayIcon):
         for action in self._role_actions:
             action.setChecked(action.data() == role)
 
+    def set_profiling(self, active: bool) -> None:
+        """Обновляет пункт меню профилировщика."""
+        self._profiler_action.setText(
+            "Остановить профилирование" if active else "Начать профилирование"
+        )
+
     def _build_icon(self) -> None:
         self._update_icon()
 
@@ -123,6 +135,12 @@ class TrayIcon(QtWidgets.QSystemTrayIcon):
             role_group.addAction(action)
             self._role_actions.append(action)
 
+        latency_action = menu.addAction("Задержки HUD")
+        latency_action.triggered.connect(self._handle_show_latency)
+
+        self._profiler_action = menu.addAction("Начать профилирование")
+        self._profiler_action.triggered.connect(self._handle_toggle_profiler)
+
         menu.addSeparator()
 
         quit_action = menu.addAction("Выход")
@@ -151,6 +169,14 @@ class TrayIcon(QtWidgets.QSystemTrayIcon):
         if self._on_role_changed:
             self._on_role_changed(role)
 
+    def _handle_show_latency(self) -> None:
+        if self._on_show_latency:
+            self._on_show_latency()
+
+    def _handle_toggle_profiler(self) -> None:
+        if self._on_toggle_profiler:
+            self._on_toggle_profiler()
+
     def _handle_quit(self) -> None:
         if self._on_quit:
             self._on_quit()
@@ -3,7 +3,22 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_config_cache(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Кэш скомпилированных конфигов — во временном каталоге, а не в профиле.
+
+    ConfigCache складывает разобранные конфиги (pickle) в D2HUB_CACHE_DIR.
+    Без подмены тесты писали бы в кэш пользователя и могли бы читать
+    оттуда результаты чужих прогонов.
+    """
+    monkeypatch.setenv("D2HUB_CACHE_DIR", str(tmp_path_factory.mktemp("config-cache")))
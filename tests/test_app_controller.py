@@ -3,6 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Callable
 
+import pytest
+
 from dota_hud.application.app_controller import AppController
 from dota_hud.config.loader import load_config
 
@@ -35,6 +37,14 @@ class FakeHud:
     ) -> None:
         """Принимает текст MACRO."""
 
+    def apply(self, state) -> None:  # type: ignore[no-untyped-def]
+        """Раскладывает состояние HUD по set_*."""
+        self.set_timer(state.timer_text)
+        self.set_warning(state.warning.text, state.warning.level)
+        self.set_now(state.now_text, state.now_level)
+        self.set_next(state.next_text, state.next_level)
+        self.set_macro(state.macro_text, state.macro_level, list(state.macro_lines))
+
     def every(self, ms: int, fn: Callable[[], None]) -> None:
         """Принимает планирование таймера."""
 
@@ -66,3 +76,205 @@ def test_create_app_controller(tmp_path: Path) -> None:
     controller = AppController(config, hud=FakeHud())
 
     assert controller is not None
+
+
+class RecordingHud(FakeHud):
+    """Заглушка HUD, запоминающая запланированные вызовы."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.scheduled: list[tuple[int, Callable[[], None]]] = []
+        self.posted: list[Callable[[], None]] = []
+        self.timers: list[str] = []
+        self.nows: list[str] = []
+
+    def set_timer(self, text: str) -> None:
+        self.timers.append(text)
+
+    def set_now(self, text: str, level: str | None = None) -> None:
+        self.nows.append(text)
+
+    def every(self, ms: int, fn: Callable[[], None]) -> None:
+        self.scheduled.append((ms, fn))
+
+    def post(self, fn: Callable[[], None]) -> None:
+        self.posted.append(fn)
+
+
+class NullHotkeys:
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def drain(self, max_items: int = 30) -> list:
+        return []
+
+
+class NullServer:
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class FakeInfraProvider:
+    def build(self, config):
+        from dota_hud.application.infra_provider import GsiStateStore, InfraServices
+
+        return InfraServices(
+            gsi_state_store=GsiStateStore(),
+            gsi_server=NullServer(),
+            hotkeys=NullHotkeys(),
+            log_watcher=None,
+        )
+
+
+def test_event_loop_recomputes_only_on_gsi_change(tmp_path: Path) -> None:
+    import time
+
+    from dota_hud.infrastructure.gsi_state import GSIState
+
+    cfg_path = _write_config(tmp_path, "general:\n  loop_mode: event\n")
+    hud = RecordingHud()
+    controller = AppController(
+        load_config(cfg_path), hud=hud, infra_provider=FakeInfraProvider()
+    )
+    store = controller._gsi_state_store
+    controller.start_hotkeys_and_loop()
+
+    hud.scheduled.pop()[1]()
+    assert hud.timers == ["0:00"]
+    # Без новых данных HUD спит не дольше loop_max_sleep_ms и не пересчитывается.
+    delay, wake = hud.scheduled.pop()
+    assert delay == 500
+    wake()
+    assert hud.timers == ["0:00"]
+
+    store.update(GSIState(clock_time=125, updated_at=time.time()))
+    assert len(hud.posted) == 1
+    hud.posted.pop()()
+    assert hud.timers == ["0:00", "2:05"]
+    # Следующее пробуждение — к порогу GSI STALE, но не позже max_sleep.
+    delay, wake = hud.scheduled[-1]
+    assert 0 < delay <= 500
+
+    # Устаревший таймер после более раннего пробуждения игнорируется.
+    stale_delay, stale_wake = hud.scheduled[-2]
+    stale_wake()
+    assert hud.timers == ["0:00", "2:05"]
+
+
+def test_poll_loop_skips_ticks_without_new_snapshot(tmp_path: Path) -> None:
+    import time
+
+    from dota_hud.infrastructure.gsi_state import GSIState
+
+    cfg_path = _write_config(tmp_path, "{}")
+    hud = RecordingHud()
+    controller = AppController(
+        load_config(cfg_path), hud=hud, infra_provider=FakeInfraProvider()
+    )
+    store = controller._gsi_state_store
+    controller.start_hotkeys_and_loop()
+
+    hud.scheduled.pop()[1]()
+    hud.scheduled.pop()[1]()
+    assert hud.timers == ["0:00"]
+
+    store.update(GSIState(clock_time=61, updated_at=time.time()))
+    hud.scheduled.pop()[1]()
+    hud.scheduled.pop()[1]()
+    assert hud.timers == ["0:00", "1:01"]
+
+
+@pytest.mark.parametrize("loop_mode", ["poll", "event"])
+def test_fresh_snapshot_with_same_clock_clears_stale(tmp_path: Path, loop_mode: str) -> None:
+    import time
+
+    from dota_hud.infrastructure.gsi_state import GSIState
+
+    cfg_path = _write_config(tmp_path, f"general:\n  loop_mode: {loop_mode}\n")
+    hud = RecordingHud()
+    controller = AppController(
+        load_config(cfg_path), hud=hud, infra_provider=FakeInfraProvider()
+    )
+    store = controller._gsi_state_store
+    store.update(GSIState(clock_time=125, updated_at=time.time() - 60))
+    controller._step()
+    assert hud.nows[-1] == "GSI STALE"
+
+    store.update(GSIState(clock_time=125, updated_at=time.time()))
+    controller._step()
+    assert hud.nows[-1] != "GSI STALE"
+
+
+def test_controller_records_gsi_latency_stages(tmp_path: Path) -> None:
+    import time
+
+    from dota_hud.infrastructure.gsi_state import GSIState
+
+    cfg_path = _write_config(tmp_path, "general:\n  loop_mode: event\n")
+    hud = RecordingHud()
+    controller = AppController(
+        load_config(cfg_path), hud=hud, infra_provider=FakeInfraProvider()
+    )
+    controller.start_hotkeys_and_loop()
+    hud.scheduled.pop()[1]()
+
+    received = time.perf_counter()
+    controller._gsi_state_store.update(
+        GSIState(clock_time=10, updated_at=time.time(), received_at=received, parsed_at=received)
+    )
+    hud.posted.pop()()
+
+    for stage in ("parse", "store", "pickup", "total"):
+        assert controller.latency.histogram(stage).count == 1, stage
+    for stage in ("cycle", "presenter", "ui_set"):
+        assert controller.latency.histogram(stage).count >= 1, stage
+
+
+def test_profile_hotkey_toggles_profiler(tmp_path: Path) -> None:
+    from dota_hud.application.commands import HudAction
+
+    profile_dir = tmp_path / "profiles"
+    cfg_path = _write_config(
+        tmp_path, f"general:\n  profile_dir: '{profile_dir.as_posix()}'\n"
+    )
+    hud = RecordingHud()
+    provider = FakeInfraProvider()
+    controller = AppController(load_config(cfg_path), hud=hud, infra_provider=provider)
+    pressed: list[HudAction] = [HudAction.PROFILE]
+    controller._hotkeys.drain = lambda max_items=30: [pressed.pop()] if pressed else []
+    toggles: list[bool] = []
+    controller.set_on_profiler(lambda active, path: toggles.append(active))
+    controller.start_hotkeys_and_loop()
+
+    hud.scheduled.pop()[1]()
+    assert controller.profiling
+    assert hud.timers == ["0:00"]
+
+    controller.shutdown()
+    assert not controller.profiling
+    assert toggles == [True]
+
+
+def test_profiler_auto_stop_is_reported_from_ui_thread(tmp_path: Path) -> None:
+    cfg_path = _write_config(
+        tmp_path, f"general:\n  profile_dir: '{(tmp_path / 'profiles').as_posix()}'\n"
+    )
+    hud = RecordingHud()
+    controller = AppController(
+        load_config(cfg_path), hud=hud, infra_provider=FakeInfraProvider()
+    )
+    events: list[tuple[bool, Path | None]] = []
+    controller.set_on_profiler(lambda active, path: events.append((active, path)))
+    saved = tmp_path / "profile.json"
+
+    controller._on_profiler_auto_stop(saved)
+
+    assert events == []
+    hud.posted.pop()()
+    assert events == [(False, saved)]
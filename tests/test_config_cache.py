@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+from dota_hud.config import loader
+from dota_hud.config.cache import code_stamp
+from dota_hud.config.loader import load_config, load_config_bundle
+
+
+def _write(path: Path, text: str) -> Path:
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _age(*paths: Path, seconds: int = 60) -> None:
+    """Сдвигает mtime в прошлое, чтобы файлы не считались «свежими»."""
+    for path in paths:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def config_files(tmp_path: Path) -> tuple[Path, Path, Path]:
+    module = _write(
+        tmp_path / "timeline.yaml",
+        'timeline:\n  - at: "1:00"\n    items: ["Модуль"]\nrules:\n'
+        '  - start: "0:00"\n    until: "0:10"\n    every_seconds: 5\n    items: ["Правило"]\n',
+    )
+    macro = _write(
+        tmp_path / "macro.yaml",
+        'macro_timings:\n  - name: Power\n    first_spawn: "6:00"\n    interval: "2:00"\n',
+    )
+    main = _write(
+        tmp_path / "config.yaml",
+        'hud:\n  title: "Cached"\nmodules: ["timeline.yaml"]\nmacro_config: "macro.yaml"\n'
+        'timeline:\n  - at: "0:30"\n    items: ["Основной"]\n',
+    )
+    _age(module, macro, main)
+    return main, module, macro
+
+
+@pytest.fixture
+def parse_counter(monkeypatch: pytest.MonkeyPatch) -> list[bytes]:
+    parsed: list[bytes] = []
+    original = loader._parse_yaml
+
+    def counting(raw: bytes):
+        parsed.append(raw)
+        return original(raw)
+
+    monkeypatch.setattr(loader, "_parse_yaml", counting)
+    return parsed
+
+
+def test_bundle_reads_each_file_once_and_builds_admin_raw(
+    config_files: tuple[Path, Path, Path], parse_counter: list[bytes]
+) -> None:
+    main, _, _ = config_files
+
+    loaded = load_config_bundle(main)
+
+    assert len(parse_counter) == 3
+    assert [bucket.t for bucket in loaded.config.buckets] == [30, 60]
+    assert [(rule.start, rule.until, rule.every) for rule in loaded.config.rules] == [(0, 10, 5)]
+    assert loaded.config.macro_timings[0].name == "Power"
+    assert [entry["at"] for entry in loaded.raw["timeline"]] == ["0:30", "1:00"]
+    assert loaded.raw["macro_timings"][0]["name"] == "Power"
+
+
+def test_warm_load_skips_yaml_parsing(
+    config_files: tuple[Path, Path, Path], parse_counter: list[bytes]
+) -> None:
+    main, _, _ = config_files
+    cold = load_config(main)
+    parse_counter.clear()
+
+    warm = load_config(main)
+
+    assert parse_counter == []
+    assert warm == cold
+
+
+def test_changed_module_is_reparsed_alone(
+    config_files: tuple[Path, Path, Path], parse_counter: list[bytes]
+) -> None:
+    main, module, _ = config_files
+    load_config(main)
+    parse_counter.clear()
+
+    _write(module, 'timeline:\n  - at: "2:00"\n    items: ["Новый"]\n')
+    config = load_config(main)
+
+    assert len(parse_counter) == 1
+    assert [bucket.t for bucket in config.buckets] == [30, 120]
+
+
+def test_touched_file_with_same_content_is_not_reparsed(
+    config_files: tuple[Path, Path, Path], parse_counter: list[bytes]
+) -> None:
+    main, _, macro = config_files
+    load_config(main)
+    parse_counter.clear()
+
+    os.utime(macro)
+    load_config(main)
+
+    assert parse_counter == []
+
+
+def test_corrupted_cache_is_rebuilt(config_files: tuple[Path, Path, Path]) -> None:
+    main, _, _ = config_files
+    expected = load_config(main)
+    for cache_file in Path(os.environ["D2HUB_CACHE_DIR"]).glob("config-*.pickle"):
+        cache_file.write_bytes(b"not a pickle")
+
+    assert load_config(main) == expected
+
+
+def test_cache_entry_of_wrong_shape_is_a_miss(
+    config_files: tuple[Path, Path, Path], parse_counter: list[bytes]
+) -> None:
+    main, _, _ = config_files
+    expected = load_config(main)
+    for cache_file in Path(os.environ["D2HUB_CACHE_DIR"]).glob("config-*.pickle"):
+        entry = pickle.loads(cache_file.read_bytes())
+        del entry.__dict__["written_ns"]
+        cache_file.write_bytes(pickle.dumps(entry))
+    parse_counter.clear()
+
+    assert load_config(main) == expected
+    assert len(parse_counter) == 3
+
+
+def test_frozen_build_stamps_executable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    executable = _write(tmp_path / "d2hub.exe", "v1")
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(sys, "executable", str(executable))
+    before = code_stamp()
+
+    _write(executable, "v2 build")
+
+    assert code_stamp() != before
+
+
+def test_cache_can_be_disabled(
+    config_files: tuple[Path, Path, Path],
+    parse_counter: list[bytes],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    main, _, _ = config_files
+    load_config(main)
+    monkeypatch.setenv("D2HUB_NO_CONFIG_CACHE", "1")
+    parse_counter.clear()
+
+    load_config(main)
+
+    assert len(parse_counter) == 3
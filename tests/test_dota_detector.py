@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from unittest.mock import patch, MagicMock
 from dota_hud.infrastructure.dota_detector import DotaDetector
+from dota_hud.infrastructure.process_backends import TasklistBackend
 
 
 def test_detector_not_running_when_process_absent():
@@ -9,7 +10,7 @@ def test_detector_not_running_when_process_absent():
     mock_result.stdout = "Image Name                     PID\nSystem Idle Process              0"
     mock_result.returncode = 0
     with patch("subprocess.run", return_value=mock_result):
-        detector = DotaDetector()
+        detector = DotaDetector(backend=TasklistBackend())
         assert detector.is_running() is False
 
 
@@ -18,13 +19,13 @@ def test_detector_running_when_process_present():
     mock_result.stdout = "Image Name                     PID\ndota2.exe                      1234"
     mock_result.returncode = 0
     with patch("subprocess.run", return_value=mock_result):
-        detector = DotaDetector()
+        detector = DotaDetector(backend=TasklistBackend())
         assert detector.is_running() is True
 
 
 def test_detector_handles_exception():
     with patch("subprocess.run", side_effect=OSError("fail")):
-        detector = DotaDetector()
+        detector = DotaDetector(backend=TasklistBackend())
         assert detector.is_running() is False
 
 
@@ -48,3 +49,93 @@ def test_detector_custom_process_name():
 def test_detector_custom_poll_interval():
     detector = DotaDetector(poll_interval=2.0)
     assert detector._poll_interval == 2.0
+
+
+class FakeBackend:
+    """Бэкенд процессов со сценарием ответов find()."""
+
+    poll_interval = 0.01
+
+    def __init__(self, answers, exits=True):
+        self.answers = list(answers)
+        self.exits = exits
+        self.waited = []
+        self.closed = False
+
+    def find(self, name):
+        return self.answers.pop(0) if self.answers else None
+
+    def wait_exit(self, pid, timeout):
+        self.waited.append(pid)
+        return self.exits
+
+    def close(self):
+        self.closed = True
+
+
+def test_detector_uses_backend_poll_interval():
+    detector = DotaDetector(backend=FakeBackend([]))
+    assert detector._poll_interval == 0.01
+
+
+def test_detector_waits_for_exit_event_instead_of_polling():
+    import threading
+
+    events = []
+    lost = threading.Event()
+    backend = FakeBackend([4242, None])
+    detector = DotaDetector(
+        backend=backend,
+        on_found=lambda: events.append("found"),
+        on_lost=lambda: (events.append("lost"), lost.set()),
+    )
+    detector.start()
+    assert lost.wait(2.0)
+    detector.stop()
+    assert events == ["found", "lost"]
+    assert backend.waited == [4242]
+    assert backend.closed
+
+
+def test_procfs_backend_finds_process_by_comm_and_cmdline(tmp_path):
+    from dota_hud.infrastructure.process_backends import ProcfsBackend
+
+    for pid, comm, cmdline in (
+        ("1", "systemd", b"/sbin/init\0"),
+        ("77", "dota2.exe", b"C:\\dota 2 beta\\game\\bin\\win64\\dota2.exe\0"),
+        ("90", "averylongproces", b"/opt/averylongprocess.bin\0"),
+    ):
+        (tmp_path / pid).mkdir()
+        (tmp_path / pid / "comm").write_text(comm + "\n")
+        (tmp_path / pid / "cmdline").write_bytes(cmdline)
+    (tmp_path / "self").mkdir()
+
+    backend = ProcfsBackend(tmp_path)
+    assert backend.find("dota2.exe") == 77
+    assert backend.find("DOTA2.EXE") == 77
+    assert backend.find("averylongprocess.bin") == 90
+    assert backend.find("averylongprocess.exe") is None
+    assert backend.find("missing.exe") is None
+
+
+def test_procfs_backend_waits_for_real_process_exit():
+    import os
+    import subprocess
+    import sys
+
+    import pytest
+
+    from dota_hud.infrastructure.process_backends import ProcfsBackend
+
+    if not hasattr(os, "pidfd_open"):
+        pytest.skip("pidfd_open is not available")
+    process = subprocess.Popen([sys.executable, "-c", "import sys; sys.stdin.read()"],
+                               stdin=subprocess.PIPE)
+    backend = ProcfsBackend()
+    try:
+        assert backend.wait_exit(process.pid, 0.05) is False
+        process.stdin.close()
+        assert backend.wait_exit(process.pid, 5.0) is True
+    finally:
+        process.wait()
+        backend.close()
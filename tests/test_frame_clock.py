@@ -0,0 +1,153 @@
+"""Tests for FrameClock: shared HUD animation clock with an FPS cap."""
+
+from __future__ import annotations
+
+import importlib
+from unittest.mock import patch
+
+import pytest
+
+
+class FakeTime:
+    """Управляемые часы для тестов."""
+
+    def __init__(self) -> None:
+        """Начинает отсчёт с нуля."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _frame_clock_module():
+    pytest.importorskip("PySide6")
+    try:
+        return importlib.import_module("dota_hud.ui.qt.frame_clock")
+    except ImportError as exc:
+        pytest.skip(f"Qt deps not available: {exc}")
+
+
+def _make_clock(fps: int = 60):
+    module = _frame_clock_module()
+    fake = FakeTime()
+    frames: list[set[str]] = []
+    clock = module.FrameClock(lambda changed: frames.append(set(changed)), fps, clock=fake)
+    return clock, fake, frames
+
+
+def _make_hud():
+    pytest.importorskip("PySide6")
+    from dota_hud.ui.hud_style import HudStyle
+    from dota_hud.ui.qt.hud_window import HudQt
+
+    return HudQt(
+        HudStyle(
+            title="test",
+            width=300,
+            height=100,
+            x=0,
+            y=0,
+            alpha=1.0,
+            font_family="sans-serif",
+            font_size=12,
+            font_weight="normal",
+            margin_horizontal=4,
+            margin_vertical=4,
+            spacing=2,
+            block_padding=4,
+            text_fade_duration_ms=0,
+            text_fade_start_opacity=1.0,
+            macro_line_spacing=2,
+            macro_bar_height=16,
+            macro_show_title=False,
+            animation_fps=30,
+        )
+    )
+
+
+def test_tweens_advance_together_in_one_frame(qapp) -> None:  # type: ignore[no-untyped-def]
+    clock, fake, frames = _make_clock()
+    clock.animate("now", 1.0, 400, start=0.0)
+    clock.animate("next", 1.0, 400, start=0.0)
+    clock.animate("warning", 1.0, 400, start=0.0)
+    assert clock.active
+    assert clock._timer.isActive()
+    assert clock._timer.interval() == 17
+    fake.now = 0.2
+    clock.tick()
+    assert frames == [{"now", "next", "warning"}]
+    assert clock.value("now") == pytest.approx(0.5)
+
+
+def test_clock_goes_idle_after_last_tween(qapp) -> None:  # type: ignore[no-untyped-def]
+    clock, fake, frames = _make_clock()
+    clock.animate("now", 1.0, 100, start=0.0)
+    fake.now = 0.5
+    clock.tick()
+    assert clock.value("now") == 1.0
+    assert not clock.active
+    assert not clock._timer.isActive()
+    clock.tick()
+    assert len(frames) == 1
+
+
+def test_then_leg_returns_to_base(qapp) -> None:  # type: ignore[no-untyped-def]
+    clock, fake, frames = _make_clock()
+    clock.animate("warning", 1.0, 240, start=0.6, then=(220, 0.6))
+    fake.now = 0.22
+    clock.tick()
+    peak = clock.value("warning")
+    assert 0.6 < peak <= 1.0
+    fake.now = 0.34
+    clock.tick()
+    assert 0.6 < clock.value("warning") < peak
+    assert clock.active
+    fake.now = 0.5
+    clock.tick()
+    assert clock.value("warning") == pytest.approx(0.6)
+    assert not clock.active
+
+
+def test_zero_fps_jumps_to_final_value(qapp) -> None:  # type: ignore[no-untyped-def]
+    clock, _, frames = _make_clock(fps=0)
+    clock.animate("warning", 1.0, 240, start=0.6, then=(220, 0.6))
+    clock.animate("now", 1.0, 450)
+    assert clock.value("warning") == 0.6
+    assert clock.value("now") == 1.0
+    assert not clock.active
+    assert not clock._timer.isActive()
+    assert frames == [{"warning"}, {"now"}]
+
+
+def test_easing_matches_qt_in_out_quad() -> None:
+    module = _frame_clock_module()
+    from PySide6 import QtCore
+
+    curve = QtCore.QEasingCurve(QtCore.QEasingCurve.InOutQuad)
+    for step in range(11):
+        progress = step / 10
+        assert module._in_out_quad(progress) == pytest.approx(curve.valueForProgress(progress))
+
+
+def test_hud_restyles_once_per_frame_for_all_animations(qapp) -> None:  # type: ignore[no-untyped-def]
+    hud = _make_hud()
+    fake = FakeTime()
+    hud._clock._clock = fake
+    hud.set_now("now", "warn")
+    hud.set_next("next", "danger")
+    hud.set_warning("smoke", "danger")
+    hud.set_macro("MACRO", "info", [])
+    assert hud._clock.active
+    assert hud._clock.fps == 30
+    fake.now = 0.1
+    with patch.object(hud, "_apply_text_colors") as restyle, patch.object(hud, "update") as update:
+        hud._clock.tick()
+    restyle.assert_called_once()
+    update.assert_called_once()
+    assert 0.0 < hud._block_strengths["now"] < 1.0
+    assert hud._warning_block_strength > 0.0
+    fake.now = 1.0
+    hud._clock.tick()
+    assert not hud._clock.active
+    assert hud._block_strengths["next"] == 1.0
+    assert hud._warning_block_strength == pytest.approx(0.8)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from dota_hud.application.frame_table import FrameTable, compile_frame_table, render_frame
+from dota_hud.application.hud_presenter import HudPresenter, PresenterConfig
+from dota_hud.config.loader import load_config
+from dota_hud.domain.scheduler import Scheduler
+from dota_hud.domain.warning_windows import WarningWindowService
+
+CONFIG_PATH = Path(__file__).resolve().parents[1] / "configs" / "timings.yaml"
+
+
+def _presenter(config) -> HudPresenter:
+    return HudPresenter(
+        PresenterConfig(
+            max_lines=config.presenter.max_lines,
+            macro_max_lines=config.presenter.macro_max_lines,
+            macro_timings=tuple(config.macro_timings),
+            macro_hints=tuple(config.presenter.macro_hints),
+        )
+    )
+
+
+def test_frame_table_matches_live_rendering() -> None:
+    config = load_config(CONFIG_PATH)
+    presenter = _presenter(config)
+    table = FrameTable(
+        config.buckets, config.windows, presenter, horizon_seconds=900, rules=config.rules
+    )
+    service = WarningWindowService()
+    index = service.build_index(config.windows)
+    scheduler = Scheduler(config.buckets, config.rules)
+
+    for role in (None, "carry", "hard_support"):
+        for second in range(0, 901, 13):
+            scheduler.set_external_elapsed(second)
+            expected = render_frame(scheduler.tick(role=role), index, service, presenter)
+            assert table.lookup(second, role) == expected
+
+
+def test_frame_table_returns_none_past_horizon() -> None:
+    config = load_config(CONFIG_PATH)
+    table = FrameTable(config.buckets, config.windows, _presenter(config), horizon_seconds=60)
+
+    assert table.lookup(60) is not None
+    assert table.lookup(61) is None
+    assert table.lookup(-1) is None
+
+
+def test_frame_table_repeated_lookup_returns_same_state() -> None:
+    config = load_config(CONFIG_PATH)
+    table = FrameTable(config.buckets, config.windows, _presenter(config), horizon_seconds=60)
+
+    assert table.lookup(30, "mid") is table.lookup(30, "mid")
+
+
+def test_compile_frame_table_disabled(tmp_path: Path) -> None:
+    cfg_path = tmp_path / "config.yaml"
+    cfg_path.write_text("presenter:\n  frame_table_horizon_seconds: 0\n", encoding="utf-8")
+    config = load_config(cfg_path)
+
+    assert compile_frame_table(config, _presenter(config)) is None
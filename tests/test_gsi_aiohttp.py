@@ -88,3 +88,15 @@ async def test_server_handles_bad_json():
             assert resp.status == 400
 
     await server.stop()
+
+
+def test_stop_from_thread_closes_event_loop():
+    server = AioGsiServer(host="127.0.0.1", port=0)
+    loops = []
+    for _ in range(2):
+        server.start_in_thread()
+        loops.append(server._loop)
+        assert server.port != 0
+        server.stop_from_thread()
+    assert loops[0] is not loops[1]
+    assert all(loop.is_closed() for loop in loops)
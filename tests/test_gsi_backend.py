@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+import urllib.request
+
+from dota_hud.infrastructure.gsi_backend import ThreadedAioGsiServer, build_gsi_server
+from dota_hud.infrastructure.gsi_server import GSIServer
+from dota_hud.infrastructure.gsi_state import GSIState, parse_payload
+
+
+def test_parse_payload_fills_extended_fields() -> None:
+    state = parse_payload(
+        {
+            "map": {"clock_time": 42, "paused": True},
+            "hero": {"name": "npc_dota_hero_lion", "level": 3},
+            "player": {"kills": 2, "gpm": 300},
+            "items": {"slot0": {"name": "item_blink"}, "slot1": {"name": "empty"}},
+        },
+        updated_at=10.0,
+    )
+
+    assert state.clock_time == 42
+    assert state.paused is True
+    assert state.updated_at == 10.0
+    assert state.hero_name == "npc_dota_hero_lion"
+    assert state.player_gpm == 300
+    assert state.items == {"slot0": "item_blink"}
+
+
+def test_parse_payload_tolerates_missing_sections() -> None:
+    state = parse_payload({"map": None, "items": []})
+
+    assert state.clock_time is None
+    assert state.items == {}
+
+
+def test_build_gsi_server_selects_backend() -> None:
+    assert isinstance(build_gsi_server("aiohttp", port=0), ThreadedAioGsiServer)
+    assert isinstance(build_gsi_server("uvloop", port=0), ThreadedAioGsiServer)
+    assert isinstance(build_gsi_server("unknown", port=0), ThreadedAioGsiServer)
+    server = build_gsi_server("stdlib", port=0)
+    assert isinstance(server, GSIServer)
+    server._server.server_close()
+
+
+def test_threaded_aiohttp_server_delivers_extended_state() -> None:
+    updates: list[GSIState] = []
+    server = build_gsi_server("aiohttp", port=0, on_update=updates.append)
+    server.start()
+    try:
+        body = json.dumps(
+            {"map": {"clock_time": 90}, "hero": {"name": "npc_dota_hero_axe"}}
+        ).encode()
+        request = urllib.request.Request(f"http://127.0.0.1:{server.port}/", data=body)
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert response.status == 200
+    finally:
+        server.stop()
+
+    assert [(s.clock_time, s.hero_name) for s in updates] == [(90, "npc_dota_hero_axe")]
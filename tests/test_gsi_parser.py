@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from dota_hud.infrastructure.gsi_json import JSON_BACKENDS, backend_available
+from dota_hud.infrastructure.gsi_parser import GsiPayloadParser
+from dota_hud.infrastructure.gsi_state import parse_payload
+
+BACKENDS = [name for name in JSON_BACKENDS if backend_available(name)]
+
+
+def _payload(clock: int, items: dict | None = None, paused: bool = False) -> dict:
+    return {
+        "provider": {"name": "Dota 2", "timestamp": 1000 + clock},
+        "map": {"clock_time": clock, "game_state": "IN_PROGRESS", "paused": paused},
+        "hero": {"name": "npc_dota_hero_lion", "level": 6},
+        "player": {"kills": 1, "gpm": 320},
+        "items": items or {"slot0": {"name": "item_blink"}, "slot1": {"name": "empty"}},
+    }
+
+
+@pytest.mark.parametrize("decoder", BACKENDS)
+def test_first_parse_matches_full_decode(decoder: str) -> None:
+    parser = GsiPayloadParser(decoder=decoder)
+    payload = _payload(100)
+
+    state = parser.parse(json.dumps(payload).encode(), updated_at=1.0)
+
+    assert state == parse_payload(payload, updated_at=1.0)
+
+
+@pytest.mark.parametrize("decoder", BACKENDS)
+def test_only_clock_change_reuses_other_sections(decoder: str) -> None:
+    parser = GsiPayloadParser(decoder=decoder)
+    first = parser.parse(json.dumps(_payload(100)).encode())
+
+    state = parser.parse(json.dumps(_payload(101)).encode())
+
+    assert state.clock_time == 101
+    assert state.items is first.items
+
+
+@pytest.mark.parametrize("decoder", BACKENDS)
+def test_changed_sections_are_redecoded(decoder: str) -> None:
+    parser = GsiPayloadParser(decoder=decoder)
+    first = parser.parse(json.dumps(_payload(100)).encode())
+    items = {"slot0": {"name": "item_force_staff"}}
+
+    state = parser.parse(json.dumps(_payload(100, items=items, paused=True)).encode())
+
+    assert state.paused is True
+    assert state.items == {"slot0": "item_force_staff"}
+    assert state.items is not first.items
+
+
+def test_number_prefix_is_not_treated_as_unchanged() -> None:
+    parser = GsiPayloadParser()
+    parser.parse(b'{"map": {"clock_time": 1}, "provider": 12}')
+
+    assert parser.parse(b'{"map": {"clock_time": 1}, "provider": 123}').clock_time == 1
+
+    parser.parse(b'{"map": {"clock_time": 12}}')
+    assert parser.parse(b'{"map": {"clock_time": 123}}').clock_time == 123
+
+
+def test_unsubscribed_sections_are_skipped_without_decoding() -> None:
+    parser = GsiPayloadParser()
+    payload = (
+        '{"abilities": {"ability0": {"name": "x\\"}{", "cd": [1, {"a": "]"}]}},'
+        ' "wearables": [1, 2, {"w": "}"}], "provider": "Dota \\u0032",'
+        ' "map": {"clock_time": 42}, "auth": null}'
+    )
+    decoded: list[int] = []
+    raw_decode = parser._decoder.raw_decode
+
+    def counting(text: str, index: int):  # type: ignore[no-untyped-def]
+        decoded.append(index)
+        return raw_decode(text, index)
+
+    parser._decoder.raw_decode = counting  # type: ignore[method-assign]
+    state = parser.parse(payload.encode())
+
+    assert state.clock_time == 42
+    assert len(decoded) == 1
+    assert state == parse_payload(json.loads(payload), updated_at=state.updated_at)
+
+
+@pytest.mark.parametrize(
+    "raw", [b'{"abilities": {"a": [1, 2}', b'{"abilities": "open', b'{"abilities": , "map": {}}']
+)
+def test_malformed_unsubscribed_section_raises_value_error(raw: bytes) -> None:
+    with pytest.raises(ValueError):
+        GsiPayloadParser().parse(raw)
+
+
+def test_deeply_nested_unsubscribed_section_is_skipped() -> None:
+    deep = '{"a": ' * 12 + '"}]"' + "}" * 12
+    raw = ('{"abilities": ' + deep + ', "map": {"clock_time": 42}}').encode()
+
+    state = GsiPayloadParser().parse(raw)
+
+    assert state.clock_time == 42
+
+
+@pytest.mark.parametrize("decoder", BACKENDS)
+def test_missing_section_resets_fields(decoder: str) -> None:
+    parser = GsiPayloadParser(decoder=decoder)
+    parser.parse(json.dumps(_payload(5)).encode())
+
+    state = parser.parse(json.dumps({"map": {"clock_time": 6}}).encode())
+
+    assert state.hero_name is None
+    assert state.items == {}
+
+
+@pytest.mark.parametrize("decoder", BACKENDS)
+@pytest.mark.parametrize("raw", [b"", b"[]", b'{"map": }', b'{"map": {}} x', b"\xff"])
+def test_invalid_payload_raises_value_error(decoder: str, raw: bytes) -> None:
+    parser = GsiPayloadParser(decoder=decoder)
+    with pytest.raises(ValueError):
+        parser.parse(raw)
+
+
+@pytest.mark.parametrize("decoder", BACKENDS)
+def test_failed_parse_keeps_previous_fingerprints(decoder: str) -> None:
+    parser = GsiPayloadParser(decoder=decoder)
+    first = parser.parse(json.dumps(_payload(1)).encode())
+    with pytest.raises(ValueError):
+        parser.parse(b'{"items": {"slot0": {"name": "item_dagon"}}, "map": oops}')
+
+    state = parser.parse(json.dumps(_payload(1)).encode())
+    assert state.items is first.items
+
+
+def test_msgspec_falls_back_when_payload_does_not_match_schema() -> None:
+    pytest.importorskip("msgspec")
+    parser = GsiPayloadParser(decoder="msgspec")
+
+    state = parser.parse(b'{"map": {"clock_time": 7}, "player": {"team2": {}}}')
+
+    assert state.clock_time == 7
+    assert state.player_kills == 0
+
+
+@pytest.mark.parametrize("decoder", BACKENDS)
+@pytest.mark.parametrize(
+    "raw", [b'{"map": 5}', b'{"hero": [1]}', b'{"items": 5, "player": "x"}']
+)
+def test_non_object_section_is_treated_as_empty(decoder: str, raw: bytes) -> None:
+    state = GsiPayloadParser(decoder=decoder).parse(raw)
+
+    assert state.clock_time is None
+    assert state.hero_name is None
+    assert state.items == {}
+    assert state.player_kills == 0
+
+
+def test_unavailable_decoder_falls_back_to_stdlib() -> None:
+    assert GsiPayloadParser(decoder="no-such-json").backend == "stdlib"
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from dota_hud.application.infra_provider import GsiStateStore
+from dota_hud.infrastructure.gsi_backend import build_gsi_server
+from dota_hud.infrastructure.gsi_recorder import GsiRecord, GsiRecorder, read_recording
+from dota_hud.infrastructure.gsi_replay import (
+    paced,
+    parse_speed,
+    replay_to_http,
+    replay_to_store,
+)
+
+
+def _body(clock: int) -> bytes:
+    return json.dumps(
+        {
+            "map": {"clock_time": clock, "game_state": "IN_PROGRESS"},
+            "hero": {"name": "npc_dota_hero_lion", "level": 6},
+            "items": {f"slot{i}": {"name": f"item_{i}"} for i in range(9)},
+        }
+    ).encode()
+
+
+def _record(path: Path, clocks: range, start_ts: float = 100.0) -> list[bytes]:
+    bodies = [_body(clock) for clock in clocks]
+    with GsiRecorder(path) as recorder:
+        for index, body in enumerate(bodies):
+            recorder.record(body, timestamp=start_ts + index * 0.1)
+    return bodies
+
+
+def test_recording_round_trip_is_compact(tmp_path: Path) -> None:
+    path = tmp_path / "session.d2gsi"
+    bodies = _record(path, range(50))
+
+    records = list(read_recording(path))
+
+    assert [record.raw for record in records] == bodies
+    assert records[1].timestamp - records[0].timestamp == pytest.approx(0.1)
+    assert path.stat().st_size < sum(len(body) for body in bodies) / 4
+
+
+def test_recording_appends_sessions_and_drops_truncated_tail(tmp_path: Path) -> None:
+    path = tmp_path / "session.d2gsi"
+    first = _record(path, range(3))
+    second = _record(path, range(10, 13), start_ts=200.0)
+    with path.open("ab") as handle:
+        handle.write(b"\x00\x01\x02")
+
+    assert [record.raw for record in read_recording(path)] == first + second
+
+
+def test_append_after_truncated_tail_keeps_new_records(tmp_path: Path) -> None:
+    path = tmp_path / "session.d2gsi"
+    first = _record(path, range(3))
+    size = path.stat().st_size
+    with path.open("ab") as handle:
+        handle.write(b"\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c")
+
+    second = _record(path, range(10, 13), start_ts=200.0)
+
+    assert [record.raw for record in read_recording(path)] == first + second
+    assert path.stat().st_size > size
+
+
+def test_corrupted_record_stops_reading(tmp_path: Path, caplog) -> None:  # type: ignore[no-untyped-def]
+    path = tmp_path / "session.d2gsi"
+    bodies = _record(path, range(3))
+    data = bytearray(path.read_bytes())
+    data[-4:] = b"\xff\xff\xff\xff"
+    path.write_bytes(bytes(data))
+
+    records = [record.raw for record in read_recording(path)]
+
+    assert records == bodies[:2]
+    assert "corrupted" in caplog.text
+
+
+def test_paced_keeps_original_intervals() -> None:
+    records = [GsiRecord(timestamp=10.0 + step, raw=b"{}") for step in range(3)]
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    assert len(list(paced(records, speed=2.0, clock=lambda: now[0], sleep=sleep))) == 3
+    assert sleeps == [0.5, 0.5]
+    assert list(paced(records, speed=None, sleep=sleep)) == records
+    assert len(sleeps) == 2
+
+
+def test_parse_speed() -> None:
+    assert parse_speed("real") == 1.0
+    assert parse_speed("4x") == 4.0
+    assert parse_speed("max") is None
+
+
+def test_replay_to_store(tmp_path: Path) -> None:
+    path = tmp_path / "session.d2gsi"
+    _record(path, range(20))
+    store = GsiStateStore()
+
+    stats = replay_to_store(path, store, speed=None)
+
+    assert stats.posts == 20
+    assert store.get().clock_time == 19
+    assert store.seq == 40  # update + heartbeat на каждый POST
+
+
+def test_server_records_and_replay_reaches_server(tmp_path: Path) -> None:
+    path = tmp_path / "session.d2gsi"
+    _record(path, range(5))
+    copy_path = tmp_path / "copy.d2gsi"
+    recorder = GsiRecorder(copy_path)
+    updates: list[int | None] = []
+    server = build_gsi_server(
+        "aiohttp",
+        port=0,
+        on_update=lambda state: updates.append(state.clock_time),
+        on_raw=recorder.record,
+    )
+    server.start()
+    try:
+        stats = replay_to_http(path, f"http://127.0.0.1:{server.port}/", speed=None)
+    finally:
+        server.stop()
+        recorder.close()
+
+    assert stats.posts == 5
+    assert updates == [0, 1, 2, 3, 4]
+    assert [r.raw for r in read_recording(copy_path)] == [r.raw for r in read_recording(path)]
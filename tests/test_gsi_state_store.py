@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import threading
+
+from dota_hud.application.infra_provider import GsiStateStore
+from dota_hud.infrastructure.gsi_state import GSIState
+
+
+def test_store_publishes_numbered_snapshots() -> None:
+    store = GsiStateStore()
+    empty = store.snapshot()
+    assert empty.seq == 0
+    assert empty.state is None
+
+    state = GSIState(clock_time=10, updated_at=100.0)
+    store.update(state)
+    snapshot = store.snapshot()
+    assert snapshot.seq == 1
+    assert snapshot.state is state
+    assert snapshot.last_update_ts == 100.0
+    assert snapshot.last_heartbeat_ts is None
+
+    store.mark_heartbeat()
+    assert store.seq == 2
+    assert store.last_heartbeat() is not None
+    # Старый снимок не меняется после публикации нового.
+    assert snapshot.seq == 1
+    assert snapshot.last_heartbeat_ts is None
+    assert store.get() is state
+
+
+def test_store_notifies_listeners_after_publish() -> None:
+    store = GsiStateStore()
+    seen: list[int] = []
+    store.subscribe(lambda: seen.append(store.seq))
+
+    store.update(GSIState(clock_time=1, updated_at=1.0))
+    store.update(GSIState(clock_time=2, updated_at=2.0))
+
+    assert seen == [1, 2]
+
+
+def test_store_reader_sees_consistent_snapshots() -> None:
+    store = GsiStateStore()
+    stop = threading.Event()
+    mismatches: list[int] = []
+
+    def reader() -> None:
+        while not stop.is_set():
+            snapshot = store.snapshot()
+            if snapshot.state is not None and snapshot.state.clock_time != snapshot.seq:
+                mismatches.append(snapshot.seq)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for second in range(1, 2001):
+        store.update(GSIState(clock_time=second, updated_at=float(second)))
+    stop.set()
+    thread.join()
+
+    assert mismatches == []
+    assert store.seq == 2000
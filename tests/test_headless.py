@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from dota_hud.config.loader import load_config
+from dota_hud.config.models import HudConfig
+from dota_hud.headless import run_benchmark, synthetic_states
+from dota_hud.ui.factory import UiFactory
+from dota_hud.ui.headless import HeadlessHud
+
+
+def _config(tmp_path: Path, text: str = "{}"):
+    cfg_path = tmp_path / "config.yaml"
+    cfg_path.write_text(text, encoding="utf-8")
+    return load_config(cfg_path)
+
+
+def test_headless_hud_keeps_last_calls_in_ring_buffer() -> None:
+    hud = HeadlessHud(capacity=3)
+    for second in range(5):
+        hud.set_timer(f"0:0{second}")
+
+    assert hud.frames == 5
+    assert [call.args for call in hud.calls] == [("0:02",), ("0:03",), ("0:04",)]
+    assert hud.last("set_timer").args == ("0:04",)
+
+
+def test_headless_hud_virtual_timers_run_in_order() -> None:
+    hud = HeadlessHud(virtual_clock=True)
+    fired: list[str] = []
+    hud.every(200, lambda: fired.append("late"))
+    hud.every(100, lambda: fired.append("early"))
+    hud.post(lambda: fired.append("posted"))
+
+    assert hud.run_pending() == 1
+    assert hud.run_pending(150) == 1
+    assert hud.run_pending(50) == 1
+    assert fired == ["posted", "early", "late"]
+    assert hud.now_ms() == 200
+
+
+def test_headless_hud_run_stops_on_close() -> None:
+    hud = HeadlessHud()
+    hud.every(1, hud.close)
+    hud.run()
+
+    assert hud.isVisible()
+
+
+def test_ui_factory_builds_headless_hud() -> None:
+    assert isinstance(UiFactory().build(HudConfig(ui="headless")), HeadlessHud)
+
+
+def test_benchmark_renders_every_game_second(tmp_path: Path) -> None:
+    hud = HeadlessHud(virtual_clock=True)
+    report = run_benchmark(
+        _config(tmp_path, "general:\n  loop_mode: event\n"),
+        synthetic_states(120),
+        hud=hud,
+    )
+
+    assert report.inputs == 120
+    assert report.frames == 120
+    assert hud.last("set_timer").args == ("1:59",)
+
+
+def test_headless_apply_records_only_changed_blocks() -> None:
+    from dataclasses import replace
+
+    from dota_hud.application.models import HudState, WarningState
+
+    hud = HeadlessHud()
+    state = HudState("0:01", "now", None, "next", None, "MACRO", None, (), WarningState(None, None))
+    hud.apply(state)
+    hud.apply(replace(state, timer_text="0:02"))
+    hud.apply(replace(state, timer_text="0:02"))
+
+    assert hud.frames == 3
+    names = [call.name for call in hud.calls]
+    assert names.count("set_now") == 1
+    assert names.count("set_timer") == 2
@@ -0,0 +1,103 @@
+"""Tests for HudWindowBase: window behaviour shared by HudQt and HudCanvas."""
+
+from __future__ import annotations
+
+import importlib
+
+import pytest
+
+
+def _style():
+    from dota_hud.ui.hud_style import HudStyle
+
+    return HudStyle(
+        title="test",
+        width=300,
+        height=100,
+        x=0,
+        y=0,
+        alpha=1.0,
+        font_family="sans-serif",
+        font_size=12,
+        font_weight="normal",
+        margin_horizontal=4,
+        margin_vertical=4,
+        spacing=2,
+        block_padding=4,
+        text_fade_duration_ms=0,
+        text_fade_start_opacity=1.0,
+        macro_line_spacing=2,
+        macro_bar_height=16,
+        macro_show_title=False,
+        animation_fps=0,
+    )
+
+
+def _make(module_name: str, class_name: str):
+    pytest.importorskip("PySide6")
+    try:
+        module = importlib.import_module(f"dota_hud.ui.qt.{module_name}")
+    except ImportError as exc:
+        pytest.skip(f"Qt deps not available: {exc}")
+    return getattr(module, class_name)(_style())
+
+
+WINDOWS = [("hud_window", "HudQt"), ("hud_canvas", "HudCanvas")]
+
+
+@pytest.mark.parametrize(("module_name", "class_name"), WINDOWS)
+def test_lock_makes_window_click_through(qapp, module_name: str, class_name: str) -> None:  # type: ignore[no-untyped-def]
+    from PySide6 import QtCore
+
+    from dota_hud.ui.qt.hud_base import HudWindowBase
+
+    hud = _make(module_name, class_name)
+    assert isinstance(hud, HudWindowBase)
+
+    hud.toggle_lock()
+    assert not hud._drag_enabled
+    assert hud.testAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+    hud.toggle_lock()
+    assert hud._drag_enabled
+    assert not hud.testAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+    hud.close()
+
+
+@pytest.mark.parametrize(("module_name", "class_name"), WINDOWS)
+def test_warning_levels_share_strengths(qapp, module_name: str, class_name: str) -> None:  # type: ignore[no-untyped-def]
+    hud = _make(module_name, class_name)
+
+    hud.set_warning("smoke", "danger")
+    assert hud._warning_base_strength == 0.8
+    assert hud._warning_block_strength == 0.8
+    hud.set_now("now", "info")
+    assert hud._block_strengths["now"] == 0.6
+    hud.set_warning("", None)
+    assert hud._warning_block_strength == 0.0
+
+
+@pytest.mark.parametrize(("module_name", "class_name"), WINDOWS)
+def test_close_request_is_forwarded(qapp, module_name: str, class_name: str) -> None:  # type: ignore[no-untyped-def]
+    from PySide6 import QtGui
+
+    hud = _make(module_name, class_name)
+    closed: list[bool] = []
+    hud.set_on_close(lambda: closed.append(True))
+
+    event = QtGui.QCloseEvent()
+    hud.closeEvent(event)
+
+    assert closed == [True]
+    assert not event.isAccepted()
+
+
+def test_subclass_without_setters_cannot_be_created(qapp) -> None:  # type: ignore[no-untyped-def]
+    pytest.importorskip("PySide6")
+    from dota_hud.ui.qt.hud_base import HudWindowBase
+
+    class Partial(HudWindowBase):
+        def set_timer(self, text: str) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="set_macro"):
+        Partial(_style())  # type: ignore[abstract]
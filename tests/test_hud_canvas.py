@@ -0,0 +1,166 @@
+"""Tests for HudCanvas: single-widget HUD renderer selected by hud.ui: canvas."""
+
+from __future__ import annotations
+
+import importlib
+from unittest.mock import patch
+
+import pytest
+
+
+def _style():
+    from dota_hud.ui.hud_style import HudStyle
+
+    return HudStyle(
+        title="test",
+        width=300,
+        height=100,
+        x=0,
+        y=0,
+        alpha=1.0,
+        font_family="sans-serif",
+        font_size=12,
+        font_weight="normal",
+        margin_horizontal=4,
+        margin_vertical=4,
+        spacing=2,
+        block_padding=4,
+        text_fade_duration_ms=0,
+        text_fade_start_opacity=1.0,
+        macro_line_spacing=2,
+        macro_bar_height=16,
+        macro_show_title=False,
+    )
+
+
+def _make_canvas():
+    pytest.importorskip("PySide6")
+    try:
+        module = importlib.import_module("dota_hud.ui.qt.hud_canvas")
+    except ImportError as exc:
+        pytest.skip(f"Qt deps not available: {exc}")
+    return module.HudCanvas(_style())
+
+
+def _state(timer: str = "1:00", now: str = "now", lines: int = 2, warning=None):
+    from dota_hud.application.models import HudState, MacroLine, WarningState
+
+    return HudState(
+        timer_text=timer,
+        now_text=now,
+        now_level="info",
+        next_text="next",
+        next_level=None,
+        macro_text="MACRO",
+        macro_level=None,
+        macro_lines=tuple(
+            MacroLine(text=f"line {i}", progress=0.5, color="#3b82f6") for i in range(lines)
+        ),
+        warning=WarningState(text=warning, level="warn" if warning else None),
+    )
+
+
+def test_equal_state_touches_nothing() -> None:
+    hud = _make_canvas()
+    hud.apply(_state())
+    with patch.object(hud, "_relayout") as relayout, patch.object(hud, "update") as update:
+        hud.apply(_state())
+    relayout.assert_not_called()
+    update.assert_not_called()
+
+
+def test_timer_change_repaints_only_timer_without_layout() -> None:
+    hud = _make_canvas()
+    hud.apply(_state())
+    now_static = hud.now.static
+    with patch.object(hud, "_relayout") as relayout, patch.object(hud, "update") as update:
+        hud.apply(_state(timer="1:01"))
+    relayout.assert_not_called()
+    update.assert_called_once_with(hud._rects["timer"])
+    assert hud.timer.text == "1:01"
+    assert hud.now.static is now_static
+
+
+def test_full_change_does_one_layout_pass() -> None:
+    hud = _make_canvas()
+    hud.apply(_state())
+    relayout = hud._relayout
+    with patch.object(hud, "_relayout", side_effect=relayout) as counted:
+        hud.apply(_state(timer="1:01", now="other", lines=3, warning="smoke"))
+    assert counted.call_count == 1
+    assert len(hud._bar_rects) == 3
+    assert "warning" in hud._rects
+
+
+def test_progress_change_repaints_bars_without_layout() -> None:
+    hud = _make_canvas()
+    hud.apply(_state())
+    state = _state()
+    from dataclasses import replace
+
+    moved = tuple(replace(line, progress=0.75) for line in state.macro_lines)
+    with patch.object(hud, "_relayout") as relayout:
+        hud.apply(replace(state, macro_lines=moved))
+    relayout.assert_not_called()
+    assert hud._macro_lines == moved
+
+
+def test_line_breaks_grow_block_and_window() -> None:
+    hud = _make_canvas()
+    hud.set_now("one")
+    single = hud._rects["now"].height()
+    hud.set_now("one\ntwo\nthree\nfour\nfive\nsix")
+    assert hud._rects["now"].height() > 2 * single - 2 * hud._style.block_padding
+    assert hud.height() >= hud._rects["now"].bottom()
+
+
+def test_level_animation_does_not_relayout(qapp) -> None:  # type: ignore[no-untyped-def]
+    hud = _make_canvas()
+    hud.set_now("now", None)
+    with patch.object(hud, "_relayout") as relayout, patch.object(hud, "update") as update:
+        hud.set_now("now", "danger")
+        hud._clock.values["now"] = 0.5
+        hud._on_animation_frame({"now"})
+    relayout.assert_not_called()
+    update.assert_called_once()
+    assert hud._block_fill("now", 140) != hud._block_fill("next", 140)
+
+
+def test_paint_probe_fires_after_text_change(qapp) -> None:  # type: ignore[no-untyped-def]
+    hud = _make_canvas()
+    painted: list[float] = []
+    hud.set_paint_probe(painted.append)
+    hud.show()
+    hud.set_timer("2:00")
+    hud.grab()
+    assert len(painted) == 1
+    hud.close()
+
+
+def test_ui_factory_builds_canvas(qapp) -> None:  # type: ignore[no-untyped-def]
+    pytest.importorskip("PySide6")
+    from dota_hud.config.models import HudConfig
+    from dota_hud.ui.factory import UiFactory
+    from dota_hud.ui.qt.hud_canvas import HudCanvas
+
+    hud = UiFactory().build(HudConfig(ui="canvas"), lazy=True)
+    hud.set_timer("3:00")
+    window = hud.materialize()
+    assert isinstance(window, HudCanvas)
+    assert window.timer.text == "3:00"
+    window.close()
+
+
+def test_sub_pixel_progress_does_not_repaint_bars() -> None:
+    from dataclasses import replace
+
+    hud = _make_canvas()
+    state = _state()
+    hud.apply(state)
+    width = hud._bar_rects[0].width()
+    nudged = tuple(
+        replace(line, progress=line.progress + 0.2 / width) for line in state.macro_lines
+    )
+    with patch.object(hud, "update") as update:
+        hud.apply(replace(state, macro_lines=nudged))
+    update.assert_not_called()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from dota_hud.application.latency import LatencyHistogram, LatencyRecorder
+
+
+def test_histogram_percentiles_within_bucket_precision() -> None:
+    histogram = LatencyHistogram()
+    for value_us in range(1, 1001):
+        histogram.record(value_us / 1_000_000)
+
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(500e-6, rel=0.04)
+    assert histogram.percentile(99) == pytest.approx(990e-6, rel=0.04)
+    assert histogram.max() == pytest.approx(1000e-6)
+    assert histogram.mean() == pytest.approx(500.5e-6)
+
+
+def test_histogram_clamps_and_resets() -> None:
+    histogram = LatencyHistogram(max_seconds=1.0)
+    histogram.record(-1.0)
+    histogram.record(5.0)
+
+    assert histogram.percentile(100) == pytest.approx(1.0)
+    histogram.reset()
+    assert histogram.count == 0
+    assert histogram.percentile(50) == 0.0
+
+
+def test_recorder_report_lists_only_recorded_stages() -> None:
+    recorder = LatencyRecorder()
+    assert "нет данных" in recorder.report()
+
+    recorder.record("pickup", 0.150)
+    report = recorder.report()
+
+    assert "pickup" in report
+    assert "parse" not in report
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from dota_hud.infrastructure.file_watch import PollingWaiter, build_change_waiter
+from dota_hud.infrastructure.log_watcher import LogWatcher
+
+
+def _append(path: Path, text: str) -> None:
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def _watch(path: Path, backend: str, patterns: list[str]):
+    started = threading.Event()
+    watcher = LogWatcher(
+        path=str(path),
+        start_patterns=patterns,
+        on_start=started.set,
+        poll_interval=0.02,
+        debounce_seconds=0.0,
+        watch_backend=backend,
+    )
+    return watcher, started
+
+
+def test_match_pattern_uses_one_combined_regex() -> None:
+    watcher = LogWatcher("console.log", ["GAME_IN_PROGRESS", r"^state=(\d+)$"], lambda: None)
+    assert watcher._combined is not None
+    text = "noise\nDOTA_GAMERULES_STATE_GAME_IN_PROGRESS\n"
+    assert watcher._match_pattern(text) == "GAME_IN_PROGRESS"
+    assert watcher._match_pattern("x\nstate=5\ny\n") == r"^state=(\d+)$"
+    assert watcher._match_pattern("state=5 trailing\n") is None
+
+
+def test_match_pattern_does_not_match_across_lines() -> None:
+    watcher = LogWatcher("console.log", [r"GAME\sSTART", r"a[^x]b", "READY"], lambda: None)
+    assert watcher._combined is not None
+    assert watcher._match_pattern("GAME\nSTART\n") is None
+    assert watcher._match_pattern("a\nb\nnoise READY\n") == "READY"
+    assert watcher._match_pattern("x\nGAME START\n") == r"GAME\sSTART"
+
+
+def test_match_pattern_falls_back_when_patterns_cannot_combine() -> None:
+    watcher = LogWatcher("console.log", ["plain", "(?i)START"], lambda: None)
+    assert watcher._combined is None
+    assert watcher._match_pattern("a\nxstart\n") == "(?i)START"
+
+
+@pytest.mark.parametrize("backend", ["poll", "auto"])
+def test_watcher_detects_appended_line(tmp_path: Path, backend: str) -> None:
+    log = tmp_path / "console.log"
+    log.write_text("old GAME_IN_PROGRESS line\n", encoding="utf-8")
+    watcher, started = _watch(log, backend, ["GAME_IN_PROGRESS"])
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        assert not started.is_set()
+        _append(log, "noise\n" * 1000 + "DOTA_GAMERULES_STATE_GAME_IN_PROGRESS\n")
+        assert started.wait(2.0)
+    finally:
+        watcher.stop()
+
+
+def test_watcher_joins_line_split_across_writes(tmp_path: Path) -> None:
+    log = tmp_path / "console.log"
+    log.write_text("", encoding="utf-8")
+    watcher, started = _watch(log, "poll", ["GAME_IN_PROGRESS"])
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        _append(log, "GAME_IN_")
+        time.sleep(0.1)
+        assert not started.is_set()
+        _append(log, "PROGRESS\n")
+        assert started.wait(2.0)
+    finally:
+        watcher.stop()
+
+
+def test_watcher_reopens_truncated_file(tmp_path: Path) -> None:
+    log = tmp_path / "console.log"
+    log.write_text("x" * 4096 + "\n", encoding="utf-8")
+    watcher, started = _watch(log, "auto", ["GAME_IN_PROGRESS"])
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        log.write_text("", encoding="utf-8")
+        time.sleep(0.2)
+        _append(log, "GAME_IN_PROGRESS\n")
+        assert started.wait(2.0)
+    finally:
+        watcher.stop()
+
+
+def test_stop_wakes_blocked_watcher(tmp_path: Path) -> None:
+    log = tmp_path / "console.log"
+    log.write_text("", encoding="utf-8")
+    watcher = LogWatcher(str(log), ["X"], lambda: None, poll_interval=60.0)
+    watcher.start()
+    time.sleep(0.05)
+    began = time.perf_counter()
+    watcher.stop()
+    assert time.perf_counter() - began < 0.5
+    assert not watcher._thread.is_alive()
+
+
+def test_inotify_waiter_ignores_other_files(tmp_path: Path) -> None:
+    import sys
+
+    if not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+    log = tmp_path / "console.log"
+    log.write_text("", encoding="utf-8")
+    waiter = build_change_waiter(log, 0.01)
+    assert not isinstance(waiter, PollingWaiter)
+    waiter._idle_timeout = 0.1
+    try:
+        (tmp_path / "other.txt").write_text("data", encoding="utf-8")
+        assert waiter.wait() is False
+        _append(log, "line\n")
+        assert waiter.wait() is True
+    finally:
+        waiter.close()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+
+from dota_hud.domain import macro_info
+from dota_hud.domain.macro_info import (
+    DEFAULT_MACRO_TIMINGS,
+    MACRO_UP,
+    MacroTiming,
+    evaluate_macro_batch,
+)
+
+TIMINGS = (
+    *DEFAULT_MACRO_TIMINGS,
+    MacroTiming(name="Always", first_spawn=0, interval=0, up_window=0),
+    MacroTiming(name="Late", first_spawn=1200, interval=600, up_window=60),
+)
+ELAPSED = list(range(-5, 2000, 7))
+
+
+def _assert_batch_matches_scalar(batch) -> None:
+    for row, timing in enumerate(TIMINGS):
+        for column, elapsed in enumerate(ELAPSED):
+            assert batch.status(row, column) == timing.status(elapsed)
+            assert float(batch.progress[row][column]) == pytest.approx(timing.progress(elapsed))
+
+
+def test_batch_matches_scalar_api_without_numpy(monkeypatch) -> None:
+    monkeypatch.setattr(macro_info, "_np", None)
+    _assert_batch_matches_scalar(evaluate_macro_batch(ELAPSED, TIMINGS))
+
+
+def test_batch_matches_scalar_api_with_numpy(monkeypatch) -> None:
+    numpy = pytest.importorskip("numpy")
+    monkeypatch.setattr(macro_info, "_np", numpy)
+    batch = evaluate_macro_batch(ELAPSED, TIMINGS)
+    assert batch.codes.shape == (len(TIMINGS), len(ELAPSED))
+    _assert_batch_matches_scalar(batch)
+
+
+def test_status_wrapper_keeps_format() -> None:
+    timing = MacroTiming(name="Wisdom", first_spawn=420, interval=420, up_window=30)
+    assert timing.status(0) == "7:00"
+    assert timing.status(430) == "UP"
+    assert timing.status(500) == "5:40"
+    assert evaluate_macro_batch([430], [timing]).codes[0][0] == MACRO_UP
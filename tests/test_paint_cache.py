@@ -0,0 +1,95 @@
+"""Tests for cached HUD background and macro bar pixmaps."""
+
+from __future__ import annotations
+
+import importlib
+from unittest.mock import patch
+
+import pytest
+
+
+def _paint_cache():
+    pytest.importorskip("PySide6")
+    try:
+        module = importlib.import_module("dota_hud.ui.qt.paint_cache")
+    except ImportError as exc:
+        pytest.skip(f"Qt deps not available: {exc}")
+    module.clear_caches()
+    return module
+
+
+def test_bar_fill_width_is_pixel_quantized() -> None:
+    cache = _paint_cache()
+    assert cache.bar_fill_width(200, 0.5) == 100
+    assert cache.bar_fill_width(200, 0.502) == 100
+    assert cache.bar_fill_width(200, 0.505) == 101
+    assert cache.bar_fill_width(200, None) == 0
+    assert cache.bar_fill_width(200, 1.5) == 200
+
+
+def test_bar_fill_pixmap_is_reused_per_width_and_color(qapp) -> None:  # type: ignore[no-untyped-def]
+    cache = _paint_cache()
+    from PySide6 import QtGui
+
+    blue = QtGui.QColor("#3b82f6")
+    first = cache.bar_fill_pixmap(100, 16, blue)
+    assert cache.bar_fill_pixmap(100, 16, QtGui.QColor("#3b82f6")) is first
+    assert cache.bar_fill_pixmap(101, 16, blue) is not first
+    assert cache.bar_fill_pixmap(100, 16, QtGui.QColor("#f59e0b")) is not first
+    assert first.width() == 100 and first.height() == 16
+
+
+def test_background_pixmap_keyed_by_size_alpha_and_color(qapp) -> None:  # type: ignore[no-untyped-def]
+    cache = _paint_cache()
+    from PySide6 import QtCore, QtGui
+
+    base = QtGui.QColor(22, 34, 40)
+    first = cache.background_pixmap(QtCore.QSize(300, 100), base, 0.6)
+    assert cache.background_pixmap(QtCore.QSize(300, 100), base, 0.6) is first
+    # alpha ниже 0.75 дают тот же фон
+    assert cache.background_pixmap(QtCore.QSize(300, 100), base, 0.5) is first
+    assert cache.background_pixmap(QtCore.QSize(300, 120), base, 0.6) is not first
+    assert cache.background_pixmap(QtCore.QSize(300, 100), base, 0.9) is not first
+
+
+def test_pixmap_cache_evicts_least_recently_used(qapp) -> None:  # type: ignore[no-untyped-def]
+    cache = _paint_cache()
+    from PySide6 import QtGui
+
+    lru = cache.PixmapCache(2)
+    rendered: list[str] = []
+
+    def render(name: str):
+        def build() -> QtGui.QPixmap:
+            rendered.append(name)
+            return QtGui.QPixmap(1, 1)
+
+        return build
+
+    lru.get("a", render("a"))
+    lru.get("b", render("b"))
+    lru.get("a", render("a"))
+    lru.get("c", render("c"))
+    lru.get("a", render("a"))
+    lru.get("b", render("b"))
+    assert rendered == ["a", "b", "c", "b"]
+    assert len(lru) == 2
+
+
+def test_macro_bar_skips_repaint_below_one_pixel(qapp) -> None:  # type: ignore[no-untyped-def]
+    pytest.importorskip("PySide6")
+    from PySide6 import QtGui
+
+    from dota_hud.ui.qt.hud_window import MacroProgressBar
+
+    bar = MacroProgressBar(16, QtGui.QColor("white"))
+    bar.resize(200, 16)
+    color = QtGui.QColor("#3b82f6")
+    bar.set_data("Power", 0.5, color)
+    with patch.object(bar, "update") as update:
+        bar.set_data("Power", 0.502, QtGui.QColor("#3b82f6"))
+        update.assert_not_called()
+        bar.set_data("Power", 0.51, color)
+        update.assert_called_once()
+        bar.set_data("Bounty", 0.51, color)
+        assert update.call_count == 2
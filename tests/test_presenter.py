@@ -20,3 +20,47 @@ def test_macro_hints_and_limit() -> None:
     assert view_model.macro_text.startswith("MACRO:")
     assert "Tip 1" in view_model.macro_text
     assert "+1 ещё" in view_model.macro_text
+
+
+def _presenter() -> HudPresenter:
+    return HudPresenter(PresenterConfig(max_lines=2, macro_hints=("Tip",)))
+
+
+def test_same_tick_returns_identical_state() -> None:
+    presenter = _presenter()
+    now = Bucket(t=60, items=["Stack", "Pull", "Ward"])
+    next_event = Bucket(t=90, items=["Rune"])
+    tick = TickState(elapsed=61, now=now, next_event=next_event, after_event=None)
+
+    first = presenter.build_view_model(tick, "smoke", "warn")
+    second = presenter.build_view_model(
+        TickState(elapsed=61, now=now, next_event=next_event, after_event=None), "smoke", "warn"
+    )
+    assert second is first
+    assert presenter.build_view_model(tick, None, None) is not first
+
+    later = presenter.build_view_model(
+        TickState(elapsed=62, now=now, next_event=next_event, after_event=None)
+    )
+    assert later is not first
+    assert later.now_text is first.now_text
+    assert later.now_text == "СЕЙЧАС 1:00\n• Stack\n• Pull\n• +1 ещё"
+    assert later.next_text == "ДАЛЕЕ 1:30 (28с)\n• Rune"
+    assert later.timer_text == "1:02"
+
+
+def test_block_cache_is_keyed_by_bucket_identity() -> None:
+    presenter = _presenter()
+    tick = TickState(elapsed=5, now=Bucket(t=5, items=["A"]), next_event=None, after_event=None)
+    other = TickState(elapsed=5, now=Bucket(t=5, items=["B"]), next_event=None, after_event=None)
+
+    assert presenter.build_view_model(tick).now_text.endswith("• A")
+    assert presenter.build_view_model(other).now_text.endswith("• B")
+
+
+def test_timer_text_outside_precomputed_table() -> None:
+    presenter = _presenter()
+    state = presenter.build_view_model(
+        TickState(elapsed=3 * 60 * 60 + 5, now=None, next_event=None, after_event=None)
+    )
+    assert state.timer_text == "180:05"
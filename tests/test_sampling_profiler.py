@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from dota_hud.infrastructure.sampling_profiler import SamplingProfiler
+
+
+def _busy_worker(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(200))
+
+
+def _profile_busy_thread(profiler: SamplingProfiler) -> Path | None:
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="BusyWorker")
+    worker.start()
+    try:
+        profiler.start()
+        deadline = time.monotonic() + 2.0
+        while profiler.samples < 20 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return profiler.stop()
+    finally:
+        stop.set()
+        worker.join()
+
+
+def test_speedscope_profile_names_threads(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(hz=500, output_dir=tmp_path)
+
+    path = _profile_busy_thread(profiler)
+
+    assert path is not None and path.name.endswith(".speedscope.json")
+    data = json.loads(path.read_text(encoding="utf-8"))
+    names = {profile["name"] for profile in data["profiles"]}
+    assert "BusyWorker" in names
+    assert "SamplingProfiler" not in names
+    frame_names = {frame["name"] for frame in data["shared"]["frames"]}
+    assert "_busy_worker" in frame_names
+    assert not profiler.is_running
+
+
+def test_collapsed_profile_and_depth_limit(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(
+        hz=500, output_dir=tmp_path, output_format="collapsed", max_depth=2
+    )
+
+    path = _profile_busy_thread(profiler)
+
+    assert path is not None and path.name.endswith(".collapsed.txt")
+    lines = path.read_text(encoding="utf-8").splitlines()
+    worker_lines = [line for line in lines if line.startswith("BusyWorker;")]
+    assert worker_lines
+    for line in worker_lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert len(stack.split(";")) <= 3
+
+
+def test_stop_without_start_and_unknown_format(tmp_path: Path) -> None:
+    assert SamplingProfiler(output_dir=tmp_path).stop() is None
+    with pytest.raises(ValueError):
+        SamplingProfiler(output_format="pstats")
+
+
+def test_max_duration_saves_profile_and_reports_it(tmp_path: Path) -> None:
+    saved: list[Path | None] = []
+    done = threading.Event()
+
+    def on_auto_stop(path: Path | None) -> None:
+        saved.append(path)
+        done.set()
+
+    profiler = SamplingProfiler(
+        hz=500, output_dir=tmp_path, max_seconds=0.1, on_auto_stop=on_auto_stop
+    )
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="BusyWorker")
+    worker.start()
+    try:
+        profiler.start()
+        assert done.wait(2.0)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert saved[0] is not None and saved[0].exists()
+    assert not profiler.is_running
+    assert profiler.stop() is None
+    assert profiler.toggle() is None
+    assert profiler.is_running
+    profiler.stop()
+    assert saved[0].exists()
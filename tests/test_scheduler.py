@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dota_hud.domain.events import Bucket
+from dota_hud.domain.events import Bucket, RecurringRule
 from dota_hud.domain.scheduler import Scheduler
 
 
@@ -33,3 +33,116 @@ def test_scheduler_no_role_shows_all():
     sched.set_external_elapsed(0)
     tick = sched.tick()  # no role = show all
     assert tick.now is not None
+
+
+def test_scheduler_rewind_restores_current_bucket():
+    buckets = [Bucket(t=t, items=[f"tip {t}"]) for t in range(0, 600, 30)]
+    sched = Scheduler(buckets)
+    sched.set_external_elapsed(400)
+    assert sched.tick().now.t == 390
+
+    sched.set_external_elapsed(95)
+    tick = sched.tick()
+    assert tick.now.t == 90
+    assert tick.next_event.t == 120
+    assert tick.after_event.t == 150
+
+
+def test_scheduler_seek_past_last_bucket():
+    buckets = [Bucket(t=0, items=["a"]), Bucket(t=60, items=["b"])]
+    sched = Scheduler(buckets)
+    sched.set_external_elapsed(5000)
+    tick = sched.tick()
+    assert tick.now.t == 60
+    assert tick.next_event is None
+    assert tick.after_event is None
+
+
+def test_scheduler_next_event_skips_other_roles():
+    buckets = [
+        Bucket(t=0, items=["all roles tip"]),
+        Bucket(t=30, items=["support tip"], roles=["hard_support"]),
+        Bucket(t=60, items=["carry tip"], roles=["carry"]),
+        Bucket(t=90, items=["late tip"]),
+    ]
+    sched = Scheduler(buckets)
+    sched.set_external_elapsed(10)
+
+    tick = sched.tick(role="carry")
+    assert tick.now.items == ["all roles tip"]
+    assert tick.next_event.items == ["carry tip"]
+    assert tick.after_event.items == ["late tip"]
+
+    tick = sched.tick(role="hard_support")
+    assert tick.next_event.items == ["support tip"]
+    assert tick.after_event.items == ["late tip"]
+
+
+def test_scheduler_unknown_role_sees_shared_buckets():
+    buckets = [
+        Bucket(t=0, items=["shared"]),
+        Bucket(t=30, items=["carry tip"], roles=["carry"]),
+    ]
+    sched = Scheduler(buckets)
+    sched.set_external_elapsed(40)
+    tick = sched.tick(role="coach")
+    assert tick.now.items == ["shared"]
+    assert tick.next_event is None
+
+
+def _expanded(buckets: list[Bucket], rules: list[RecurringRule], horizon: int) -> list[Bucket]:
+    """Прежнее представление: каждое вхождение правила — отдельный bucket."""
+    items: dict[int, list[str]] = {}
+    roles: dict[int, list[str]] = {}
+    for bucket in buckets:
+        items.setdefault(bucket.t, []).extend(bucket.items)
+        roles.setdefault(bucket.t, []).extend(bucket.roles)
+    for rule in rules:
+        t = rule.start
+        while t <= (horizon if rule.until is None else rule.until):
+            items.setdefault(t, []).extend(rule.items)
+            t += rule.every
+    return [Bucket(t=t, items=items[t], roles=roles.get(t, [])) for t in sorted(items)]
+
+
+def test_rules_match_expanded_buckets() -> None:
+    buckets = [Bucket(t=0, items=["start"]), Bucket(t=90, items=["stack"])]
+    rules = [
+        RecurringRule(start=0, every=30, items=("minimap",), until=300),
+        RecurringRule(start=45, every=60, items=("wards",)),
+    ]
+    lazy = Scheduler(buckets, rules)
+    eager = Scheduler(_expanded(buckets, rules, horizon=1000))
+
+    for second in [*range(400), 350, 10, 0]:
+        lazy.set_external_elapsed(second)
+        eager.set_external_elapsed(second)
+        assert lazy.tick() == eager.tick(), second
+
+
+def test_rule_roles_filter_occurrences() -> None:
+    rules = [
+        RecurringRule(start=0, every=60, items=("stack",), roles=("hard_support",)),
+        RecurringRule(start=0, every=120, items=("rune",)),
+    ]
+    sched = Scheduler([], rules)
+    sched.set_external_elapsed(130)
+
+    carry = sched.tick(role="carry")
+    support = sched.tick(role="hard_support")
+
+    assert carry.now == Bucket(t=120, items=["rune"])
+    assert carry.next_event == Bucket(t=240, items=["rune"])
+    assert support.now == Bucket(t=120, items=["stack", "rune"])
+    assert support.next_event == Bucket(t=180, items=["stack"])
+
+
+def test_open_ended_rule_covers_long_games() -> None:
+    sched = Scheduler([], [RecurringRule(start=0, every=30, items=("check",))])
+    sched.set_external_elapsed(10 * 3600 + 5)
+
+    tick = sched.tick()
+
+    assert tick.now is not None and tick.now.t == 36000
+    assert tick.next_event is not None and tick.next_event.t == 36030
+    assert tick.after_event is not None and tick.after_event.t == 36060
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import sys
+from typing import Callable
+
+import pytest
+
+from dota_hud.config.models import HudConfig
+from dota_hud.startup_profile import ImportTimer, StartupProfile, resident_memory
+from dota_hud.ui.deferred import DeferredHud
+
+
+class RecordingHud:
+    """HUD, записывающий все вызовы."""
+
+    def __init__(self) -> None:
+        """Создаёт пустой журнал вызовов."""
+        self.calls: list[tuple] = []
+        self.visible = False
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        return lambda *args: self.calls.append((name, *args))
+
+    def show(self) -> None:
+        """Показывает окно."""
+        self.visible = True
+
+    def isVisible(self) -> bool:
+        """Возвращает видимость окна."""
+        return self.visible
+
+
+class ImmediateScheduler:
+    """Планировщик, копящий отложенные вызовы."""
+
+    def __init__(self) -> None:
+        """Создаёт пустую очередь."""
+        self.scheduled: list[tuple[int, Callable[[], None]]] = []
+
+    def every(self, ms: int, fn: Callable[[], None]) -> None:
+        """Запоминает таймер."""
+        self.scheduled.append((ms, fn))
+
+    def post(self, fn: Callable[[], None]) -> None:
+        """Запоминает вызов с нулевой задержкой."""
+        self.scheduled.append((0, fn))
+
+
+def test_deferred_hud_builds_window_on_first_show() -> None:
+    built: list[RecordingHud] = []
+
+    def factory() -> RecordingHud:
+        built.append(RecordingHud())
+        return built[-1]
+
+    scheduler = ImmediateScheduler()
+    hud = DeferredHud(factory, scheduler)
+    hud.set_timer("0:01")
+    hud.set_timer("0:02")
+    hud.set_now("Stack", "info")
+    hud.toggle_lock()
+    hud.every(200, lambda: None)
+    hud.hide()
+    assert not built
+    assert not hud.isVisible()
+    assert len(scheduler.scheduled) == 1
+
+    hud.show()
+    assert len(built) == 1
+    window = built[0]
+    assert ("set_timer", "0:02") in window.calls
+    assert ("set_timer", "0:01") not in window.calls
+    assert ("set_now", "Stack", "info") in window.calls
+    assert window.calls.count(("toggle_lock",)) == 1
+    assert hud.isVisible()
+
+    hud.set_next("Rune", None)
+    hud.show()
+    assert len(built) == 1
+    assert window.calls[-1] == ("set_next", "Rune", None)
+
+
+def test_deferred_hud_drops_even_lock_toggles_and_keeps_callbacks() -> None:
+    window = RecordingHud()
+    hud = DeferredHud(lambda: window, ImmediateScheduler())
+    on_close = lambda: None  # noqa: E731
+    probe = lambda at: None  # noqa: E731
+    hud.set_on_close(on_close)
+    hud.set_paint_probe(probe)
+    hud.toggle_lock()
+    hud.toggle_lock()
+    hud.close()
+    assert hud.materialize() is window
+    assert ("toggle_lock",) not in window.calls
+    assert ("set_on_close", on_close) in window.calls
+    assert ("set_paint_probe", probe) in window.calls
+
+
+def test_deferred_hud_apply_supersedes_block_setters() -> None:
+    window = RecordingHud()
+    hud = DeferredHud(lambda: window, ImmediateScheduler())
+    state = object()
+    hud.set_timer("0:01")
+    hud.set_build("build")
+    hud.apply(state)  # type: ignore[arg-type]
+    hud.set_now("paused", None)
+    hud.show()
+    assert window.calls == [("set_build", "build"), ("apply", state), ("set_now", "paused", None)]
+
+
+def test_ui_factory_lazy_qt_defers_window(qapp) -> None:  # type: ignore[no-untyped-def]
+    pytest.importorskip("PySide6")
+    from dota_hud.ui.factory import UiFactory
+
+    hud = UiFactory().build(HudConfig(), lazy=True)
+    assert isinstance(hud, DeferredHud)
+    assert not hud.materialized
+    hud.set_timer("1:00")
+    hud.close()
+    assert not hud.materialized
+
+
+def test_import_timer_records_nested_imports(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    package = tmp_path / "startup_probe_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("from . import child\n", encoding="utf-8")
+    (package / "child.py").write_text("VALUE = sum(range(1000))\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    timer = ImportTimer()
+    timer.install()
+    try:
+        import startup_probe_pkg
+    finally:
+        timer.uninstall()
+        sys.modules.pop("startup_probe_pkg.child", None)
+        sys.modules.pop("startup_probe_pkg", None)
+
+    assert timer not in sys.meta_path
+    assert startup_probe_pkg.child.VALUE == 499500
+    assert type(startup_probe_pkg.__loader__).__name__ != "_TimedLoader"
+    parent = timer.timings["startup_probe_pkg"]
+    child = timer.timings["startup_probe_pkg.child"]
+    assert parent.inclusive >= child.inclusive
+    assert parent.self_time <= parent.inclusive - child.inclusive + 1e-6
+
+
+def test_startup_profile_report_lists_phases() -> None:
+    profile = StartupProfile()
+    profile.mark("config")
+    report = profile.report()
+    assert profile.imports not in sys.meta_path
+    assert "config" in report
+    assert "Imports:" in report
+
+
+def test_resident_memory_is_positive() -> None:
+    rss = resident_memory()
+    assert rss is None or rss > 0
@@ -193,3 +193,72 @@ class TestMacroLineWidgetPool:
 
         hud._apply_macro_lines(_make_macro_lines(2))
         assert len(hud._macro_line_widgets) == 2
+
+
+# ---- apply(HudState) tests --------------------------------------------------
+
+def _state(timer: str = "1:00", now: str = "now", lines: int = 2, warning=None):
+    from dota_hud.application.models import HudState, WarningState
+
+    return HudState(
+        timer_text=timer,
+        now_text=now,
+        now_level="info",
+        next_text="next",
+        next_level=None,
+        macro_text="MACRO",
+        macro_level=None,
+        macro_lines=tuple(_make_macro_lines(lines)),
+        warning=WarningState(text=warning, level="warn" if warning else None),
+    )
+
+
+class TestApplyDiff:
+    def test_equal_state_touches_nothing(self) -> None:
+        hud = _make_hud()
+        hud.apply(_state())
+        with patch.object(hud.timer, "setText") as timer_set, patch.object(
+            hud, "_apply_macro_lines"
+        ) as macro_set, patch.object(hud, "update") as update:
+            hud.apply(_state())
+            timer_set.assert_not_called()
+            macro_set.assert_not_called()
+            update.assert_not_called()
+
+    def test_timer_change_skips_other_blocks(self) -> None:
+        hud = _make_hud()
+        hud.apply(_state())
+        with patch.object(hud.now, "setText") as now_set, patch.object(
+            hud, "_apply_macro_lines"
+        ) as macro_set, patch.object(hud.warning, "setText") as warning_set:
+            hud.apply(_state(timer="1:01"))
+            now_set.assert_not_called()
+            macro_set.assert_not_called()
+            warning_set.assert_not_called()
+        assert hud.timer.text() == "1:01"
+
+    def test_full_change_does_one_layout_pass_and_one_repaint(self) -> None:
+        hud = _make_hud()
+        hud.apply(_state())
+        resize = hud._resize_to_content
+        passes = []
+
+        def counting_resize() -> None:
+            if not hud._batching:
+                passes.append(1)
+            resize()
+
+        with patch.object(hud, "_resize_to_content", side_effect=counting_resize), patch.object(
+            hud, "update"
+        ) as update:
+            hud.apply(_state(timer="1:01", now="other", lines=3, warning="smoke"))
+        assert len(passes) == 1
+        update.assert_called_once()
+        assert len(hud._macro_line_widgets) == 3
+
+    def test_direct_set_call_invalidates_applied_state(self) -> None:
+        hud = _make_hud()
+        hud.apply(_state())
+        hud.set_now("HUD error")
+        hud.apply(_state())
+        assert hud.now.text() == "now"
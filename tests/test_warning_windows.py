@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import random
+
+from dota_hud.domain.warning_windows import WarningWindow, WarningWindowService
+
+
+def test_index_matches_linear_scan() -> None:
+    rng = random.Random(7)
+    windows = []
+    for _ in range(200):
+        start = rng.randint(0, 3000)
+        windows.append(
+            WarningWindow(
+                from_t=start,
+                to_t=start + rng.randint(0, 300),
+                text=f"w{start}",
+                level=rng.choice(["info", "warn", "danger"]),
+                priority=rng.randint(0, 5),
+            )
+        )
+    service = WarningWindowService()
+    index = service.build_index(windows)
+
+    for elapsed in range(-5, 3400, 7):
+        assert list(index.active(elapsed)) == service.active_windows(elapsed, windows)
+
+
+def test_index_returns_cached_result_inside_segment() -> None:
+    windows = [WarningWindow(from_t=10, to_t=20, text="a", level="warn")]
+    index = WarningWindowService().build_index(windows)
+
+    first = index.active(12)
+    assert [w.text for w in first] == ["a"]
+    assert index.active(19) is first
+    assert index.active(20) is first
+    assert index.active(21) == ()
+    assert index.active(5) == ()
+
+
+def test_index_empty() -> None:
+    index = WarningWindowService().build_index([])
+    assert index.active(100) == ()